@@ -19,6 +19,12 @@ def get_crontab_schedule():
     return CrontabSchedule
 
 
+def get_interval_schedule():
+    from django_async_manager.models import IntervalSchedule
+
+    return IntervalSchedule
+
+
 def get_periodic_task():
     from django_async_manager.models import PeriodicTask
 
@@ -0,0 +1,122 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import psutil
+from django.db.models import Count, Min, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.timezone import now
+
+from django_async_manager.models import Task
+
+
+@dataclass
+class LoadSample:
+    """Snapshot of queue and host load used for a scaling decision."""
+
+    queue_depth: int
+    oldest_wait: float
+    cpu_percent: float
+    memory_percent: float
+
+
+class Autoscaler:
+    """
+    Decides how many TaskWorkers a WorkerManager should run for its queue.
+
+    Scaling up is driven by the number of ready tasks per worker and by the age
+    of the oldest ready task. Scaling down happens one worker at a time once the
+    queue has been idle for several consecutive samples. Host CPU and memory
+    usage veto scaling up, and memory pressure forces scaling down. Decisions
+    only take effect after `scale_up_samples` / `scale_down_samples` consecutive
+    samples agree, which keeps the pool from flapping around a threshold.
+    """
+
+    def __init__(
+        self,
+        queue: str,
+        min_workers: int,
+        max_workers: int,
+        backlog_per_worker: int = 10,
+        max_wait: float = 30.0,
+        max_cpu_percent: float = 90.0,
+        max_memory_percent: float = 90.0,
+        scale_up_samples: int = 1,
+        scale_down_samples: int = 3,
+    ):
+        if min_workers < 0 or max_workers < max(min_workers, 1):
+            raise ValueError(
+                f"Invalid autoscale range: min_workers={min_workers}, max_workers={max_workers}"
+            )
+        self.queue = queue
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.backlog_per_worker = backlog_per_worker
+        self.max_wait = max_wait
+        self.max_cpu_percent = max_cpu_percent
+        self.max_memory_percent = max_memory_percent
+        self.scale_up_samples = scale_up_samples
+        self.scale_down_samples = scale_down_samples
+        self._up_streak = 0
+        self._down_streak = 0
+
+    def sample(self) -> LoadSample:
+        """Measure ready-queue depth, oldest wait and host load with one query."""
+        current_time = now()
+        ready = Q(scheduled_at__isnull=True) | Q(scheduled_at__lte=current_time)
+        stats = Task.objects.filter(status="pending", queue=self.queue).aggregate(
+            depth=Count("id", filter=ready),
+            # Waiting since the task became ready, as in the worker's
+            # queue_wait, so retries and debounced tasks don't look old.
+            oldest=Min(
+                Greatest("created_at", Coalesce("scheduled_at", "created_at")),
+                filter=ready,
+            ),
+        )
+        oldest_wait = 0.0
+        if stats["oldest"] is not None:
+            oldest_wait = max(0.0, (current_time - stats["oldest"]).total_seconds())
+        return LoadSample(
+            queue_depth=stats["depth"] or 0,
+            oldest_wait=oldest_wait,
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=psutil.virtual_memory().percent,
+        )
+
+    def decide(self, current: int, sample: LoadSample) -> int:
+        """Return the number of workers to run given the current count and a sample."""
+        clamped = max(self.min_workers, min(current, self.max_workers))
+        if (
+            sample.memory_percent >= self.max_memory_percent
+            and current > self.min_workers
+        ):
+            self._up_streak = self._down_streak = 0
+            return current - 1
+
+        wanted: Optional[int] = None
+        backlog_target = math.ceil(sample.queue_depth / self.backlog_per_worker)
+        if backlog_target > current or (
+            sample.queue_depth and sample.oldest_wait >= self.max_wait
+        ):
+            if sample.cpu_percent < self.max_cpu_percent:
+                wanted = min(self.max_workers, max(current + 1, backlog_target))
+        elif sample.queue_depth == 0 and current > self.min_workers:
+            wanted = current - 1
+
+        if wanted is None or wanted == current:
+            self._up_streak = self._down_streak = 0
+            return clamped
+
+        if wanted > current:
+            self._up_streak += 1
+            self._down_streak = 0
+            if self._up_streak >= self.scale_up_samples:
+                self._up_streak = 0
+                return wanted
+        else:
+            self._down_streak += 1
+            self._up_streak = 0
+            if self._down_streak >= self.scale_down_samples:
+                self._down_streak = 0
+                return wanted
+        return clamped
@@ -0,0 +1,373 @@
+import logging
+import os
+import platform
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils.timezone import now
+
+from django_async_manager import metrics
+from django_async_manager.decorators import background_task
+from django_async_manager.models import (
+    CrontabSchedule,
+    PeriodicTask,
+    Task,
+    TaskProfile,
+)
+from django_async_manager.scheduler import BeatScheduler
+from django_async_manager.worker import TaskWorker
+
+BENCH_QUEUE = "__bench__"
+BENCH_PREFIX = "__bench__"
+BENCHMARKS = ("enqueue", "claim", "tick", "end_to_end")
+INSERT_BATCH_SIZE = 5000
+
+
+@background_task(queue=BENCH_QUEUE, autoretry=False)
+def bench_noop():
+    """No-op task used by the benchmarks."""
+    return None
+
+
+BENCH_TASK_NAME = f"{bench_noop.__module__}.{bench_noop.__name__}"
+
+
+def latency_summary(durations: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds of durations given in seconds."""
+    ms = sorted(duration * 1000 for duration in durations)
+    if len(ms) > 1:
+        percentiles = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = ms[0]
+    return {
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "max_ms": ms[-1],
+    }
+
+
+def _result(benchmark: str, params: Dict[str, Any], **values) -> Dict[str, Any]:
+    return {"benchmark": benchmark, "params": params, **values}
+
+
+def environment() -> Dict[str, Any]:
+    """Describe where the benchmarks ran, stored next to the results."""
+    return {
+        "timestamp": now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "database": connection.vendor,
+        "database_version": ".".join(map(str, connection.get_database_version())),
+        "debug": settings.DEBUG,
+    }
+
+
+def purge() -> None:
+    """Delete everything created by the benchmarks."""
+    bench_tasks = Task.objects.filter(queue=BENCH_QUEUE)
+    Task.dependencies.through.objects.filter(from_task__in=bench_tasks).delete()
+    Task.dependencies.through.objects.filter(to_task__in=bench_tasks).delete()
+    TaskProfile.objects.filter(task__in=bench_tasks).update(task=None)
+    # Task rows have reverse relations, so a regular delete() would load them
+    # in batches first; a single DELETE keeps cleanup of 1M rows fast.
+    bench_tasks._raw_delete(bench_tasks.db)
+    PeriodicTask.objects.filter(name__startswith=BENCH_PREFIX).delete()
+
+
+def fill_queue(size: int, dependencies: bool = False) -> None:
+    """
+    Insert `size` ready tasks into the benchmark queue. With dependencies,
+    every task depends on one completed task, so the claim query has to
+    evaluate the dependency join for each candidate.
+    """
+    parent = None
+    if dependencies:
+        parent = Task.objects.create(
+            name=BENCH_TASK_NAME,
+            queue=BENCH_QUEUE,
+            status="completed",
+            arguments={"args": [], "kwargs": {}},
+        )
+    through = Task.dependencies.through
+    created = 0
+    while created < size:
+        batch = min(INSERT_BATCH_SIZE, size - created)
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=BENCH_TASK_NAME,
+                queue=BENCH_QUEUE,
+                status="pending",
+                arguments={"args": [], "kwargs": {}},
+            )
+            for _ in range(batch)
+        )
+        if parent is not None:
+            through.objects.bulk_create(
+                through(from_task_id=task.pk, to_task_id=parent.pk) for task in tasks
+            )
+        created += batch
+
+
+def bench_enqueue(count: int) -> Dict[str, Any]:
+    """Enqueue `count` tasks with run_async()."""
+    durations = []
+    started = time.perf_counter()
+    for _ in range(count):
+        call_started = time.perf_counter()
+        bench_noop.run_async()
+        durations.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return _result(
+        "enqueue",
+        {"count": count},
+        ops_per_sec=count / elapsed,
+        **latency_summary(durations),
+    )
+
+
+def bench_claim(
+    queue_size: int, dependencies: bool = False, samples: int = 200
+) -> Dict[str, Any]:
+    """
+    Measure how long TaskWorker.process_task() spends acquiring a task from a
+    queue holding `queue_size` ready tasks. Only the acquisition transaction
+    is timed; the no-op tasks are then executed as usual.
+    """
+    fill_queue(queue_size, dependencies=dependencies)
+    worker = TaskWorker(worker_id="bench-claim", queue=BENCH_QUEUE)
+    durations = []
+    try:
+        for _ in range(min(samples, queue_size)):
+            _, before = metrics.ACQUISITION_TIME.get(queue=BENCH_QUEUE)
+            worker.process_task()
+            _, after = metrics.ACQUISITION_TIME.get(queue=BENCH_QUEUE)
+            durations.append(after - before)
+    finally:
+        worker.shutdown()
+    return _result(
+        "claim",
+        {"queue_size": queue_size, "dependencies": dependencies},
+        ops_per_sec=len(durations) / sum(durations),
+        **latency_summary(durations),
+    )
+
+
+def bench_tick(periodic_tasks: int, rounds: int = 20) -> Dict[str, Any]:
+    """Measure loading the schedule and BeatScheduler.tick() for many entries."""
+    crontabs = [
+        CrontabSchedule.objects.create(minute=f"*/{step}") for step in (1, 5, 15, 30)
+    ]
+    try:
+        PeriodicTask.objects.bulk_create(
+            (
+                PeriodicTask(
+                    name=f"{BENCH_PREFIX}{i}",
+                    task_name=BENCH_TASK_NAME,
+                    crontab=crontabs[i % len(crontabs)],
+                )
+                for i in range(periodic_tasks)
+            ),
+            batch_size=INSERT_BATCH_SIZE,
+        )
+        load_started = time.perf_counter()
+        # Only the benchmark's own periodic tasks, and no catch-up pass that
+        # would enqueue the user's missed runs
+        scheduler = BeatScheduler(
+            check_missed=False, task_filter=Q(name__startswith=BENCH_PREFIX)
+        )
+        load_time = time.perf_counter() - load_started
+
+        durations = []
+        for _ in range(rounds):
+            tick_started = time.perf_counter()
+            scheduler.tick()
+            durations.append(time.perf_counter() - tick_started)
+    finally:
+        # Deleting the crontabs cascades to the benchmark's periodic tasks
+        CrontabSchedule.objects.filter(pk__in=[c.pk for c in crontabs]).delete()
+    return _result(
+        "tick",
+        {"periodic_tasks": periodic_tasks},
+        ops_per_sec=rounds / sum(durations),
+        load_ms=load_time * 1000,
+        **latency_summary(durations),
+    )
+
+
+def bench_end_to_end(count: int, mode: str = "threads", workers: int = 1):
+    """
+    Enqueue `count` tasks and process them with `workers` TaskWorkers running
+    their tasks in threads or processes. Reports completed tasks per second.
+    """
+    fill_queue(count)
+    remaining = [count]
+    lock = threading.Lock()
+
+    def _run(index):
+        worker = TaskWorker(
+            worker_id=f"bench-{mode}-{index}",
+            queue=BENCH_QUEUE,
+            use_threads=mode == "threads",
+        )
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                worker.process_task()
+        finally:
+            worker.shutdown()
+            if workers > 1:
+                close_old_connections()
+                connection.close()
+
+    started = time.perf_counter()
+    if workers == 1:
+        _run(0)
+    else:
+        threads = [threading.Thread(target=_run, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    completed = Task.objects.filter(queue=BENCH_QUEUE, status="completed").count()
+    return _result(
+        "end_to_end",
+        {"count": count, "mode": mode, "workers": workers},
+        ops_per_sec=completed / elapsed,
+        completed=completed,
+        elapsed_s=elapsed,
+    )
+
+
+@contextmanager
+def quiet_loggers(level: int = logging.WARNING) -> Iterator[None]:
+    """Silence per-task log lines that would dominate the measurements."""
+    loggers = [
+        logging.getLogger(name)
+        for name in (
+            "django_async_manager.worker",
+            "django_async_manager.scheduler",
+            "django_async_manager.utils",
+        )
+    ]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(level)
+    try:
+        yield
+    finally:
+        for logger, previous in zip(loggers, levels):
+            logger.setLevel(previous)
+
+
+def run_benchmarks(
+    benchmarks: Sequence[str] = BENCHMARKS,
+    enqueue_count: int = 1000,
+    queue_sizes: Sequence[int] = (1000, 100_000, 1_000_000),
+    claim_samples: int = 200,
+    periodic_tasks: int = 5000,
+    e2e_count: int = 500,
+    modes: Sequence[str] = ("threads", "processes"),
+    workers: int = 1,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks against the default database and return
+    {"environment": {...}, "results": [...]}. Each benchmark starts from an
+    empty benchmark queue and cleans up after itself.
+    """
+    plan: List[tuple] = []
+    if "enqueue" in benchmarks:
+        plan.append((bench_enqueue, {"count": enqueue_count}))
+    if "claim" in benchmarks:
+        for size in queue_sizes:
+            for dependencies in (False, True):
+                plan.append(
+                    (
+                        bench_claim,
+                        {
+                            "queue_size": size,
+                            "dependencies": dependencies,
+                            "samples": claim_samples,
+                        },
+                    )
+                )
+    if "tick" in benchmarks:
+        plan.append((bench_tick, {"periodic_tasks": periodic_tasks}))
+    if "end_to_end" in benchmarks:
+        for mode in modes:
+            plan.append(
+                (
+                    bench_end_to_end,
+                    {"count": e2e_count, "mode": mode, "workers": workers},
+                )
+            )
+
+    results = []
+    with quiet_loggers():
+        for bench, kwargs in plan:
+            purge()
+            try:
+                result = bench(**kwargs)
+            finally:
+                purge()
+            results.append(result)
+            if progress is not None:
+                progress(format_result(result))
+    return {"environment": environment(), "results": results}
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+    line = f"{result['benchmark']}({params}): {result['ops_per_sec']:.1f} ops/s"
+    if "p50_ms" in result:
+        line += f", p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms"
+    return line
+
+
+def _key(result: Dict[str, Any]) -> tuple:
+    return result["benchmark"], tuple(sorted(result["params"].items()))
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Compare throughput of matching benchmarks. Returns one entry per result
+    found in both runs with the relative change in ops_per_sec and whether it
+    dropped by more than max_regression (a fraction).
+    """
+    previous = {_key(result): result for result in baseline.get("results", [])}
+    changes = []
+    for result in current.get("results", []):
+        before = previous.get(_key(result))
+        if before is None or not before["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        changes.append(
+            {
+                "benchmark": result["benchmark"],
+                "params": result["params"],
+                "baseline_ops_per_sec": before["ops_per_sec"],
+                "ops_per_sec": result["ops_per_sec"],
+                "change": change,
+                "regression": change < -max_regression,
+            }
+        )
+    return changes
@@ -0,0 +1,54 @@
+import datetime
+import threading
+from functools import lru_cache
+from typing import List, Tuple
+
+from croniter import croniter
+
+# Distinct cron expressions kept parsed; periodic tasks usually share a few
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compiled(expression: str) -> Tuple[croniter, threading.Lock]:
+    """
+    Parse a cron expression once. croniter instances carry the current
+    position, so each one comes with a lock serializing its users.
+    """
+    return croniter(expression), threading.Lock()
+
+
+def next_fire_time(expression: str, base_time: datetime.datetime) -> datetime.datetime:
+    """Return the first time after base_time matching the cron expression."""
+    compiled, lock = _compiled(expression)
+    with lock:
+        compiled.set_current(base_time, force=True)
+        return compiled.get_next(datetime.datetime)
+
+
+def fire_times_between(
+    expression: str,
+    after: datetime.datetime,
+    until: datetime.datetime,
+    limit: int,
+) -> List[datetime.datetime]:
+    """
+    Return the latest `limit` times in (after, until) matching the cron
+    expression, oldest first. Walks backwards from until, so the cost depends
+    on limit rather than on how long ago `after` was.
+    """
+    compiled, lock = _compiled(expression)
+    times = []
+    with lock:
+        compiled.set_current(until, force=True)
+        while len(times) < limit:
+            fire_time = compiled.get_prev(datetime.datetime)
+            if fire_time <= after:
+                break
+            times.append(fire_time)
+    times.reverse()
+    return times
+
+
+def clear_cache() -> None:
+    _compiled.cache_clear()
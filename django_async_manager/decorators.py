@@ -1,7 +1,47 @@
 import inspect
+from datetime import timedelta
 from functools import wraps
-from typing import Optional, Callable, Union, List
+from typing import Any, Dict, Optional, Callable, Union, List
+
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from django_async_manager.limits import parse_rate
+from django_async_manager.middleware import run_hook
 from django_async_manager.models import Task, TASK_REGISTRY
+from django_async_manager.utils import make_task_key
+
+
+def _coalesce_debounced(
+    debounce_key: str,
+    arguments: Dict[str, Any],
+    debounce: float,
+    merge: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]],
+    max_wait: Optional[float],
+) -> Optional[Task]:
+    """
+    Fold an enqueue into the pending task holding debounce_key, if there is one.
+    Pushes its scheduled_at to the end of a new debounce window (but no later
+    than max_wait after it was created) and merges the arguments when a merge
+    function is given. Returns the updated task or None if nothing is pending.
+    """
+    with transaction.atomic():
+        pending = (
+            Task.objects.select_for_update()
+            .filter(debounce_key=debounce_key, status="pending")
+            .first()
+        )
+        if pending is None:
+            return None
+
+        run_at = now() + timedelta(seconds=debounce)
+        if max_wait is not None:
+            run_at = min(run_at, pending.created_at + timedelta(seconds=max_wait))
+        pending.scheduled_at = run_at
+        if merge is not None:
+            pending.arguments = merge(pending.arguments, arguments)
+        pending.save(update_fields=["scheduled_at", "arguments"])
+        return pending
 
 
 def background_task(
@@ -14,6 +54,15 @@ def background_task(
     max_retries: int = 1,
     timeout: int = 300,
     memory_limit: Optional[int] = None,
+    rate_limit: Optional[str] = None,
+    concurrency_limit: Optional[int] = None,
+    concurrency_key: Optional[Callable[..., Any]] = None,
+    idempotency_key: Optional[Union[bool, Callable[..., Any]]] = None,
+    debounce: Optional[float] = None,
+    debounce_merge: Optional[Callable[..., Dict[str, Any]]] = None,
+    debounce_max_wait: Optional[float] = None,
+    cache_ttl: Optional[int] = None,
+    profile_sample_rate: Optional[float] = None,
 ) -> Callable:
     """
     Decorator for marking a function as a background task.
@@ -28,18 +77,114 @@ def background_task(
         max_retries: Maximum number of retry attempts
         timeout: Maximum execution time in seconds
         memory_limit: Maximum memory usage in MB (None for no limit)
+        rate_limit: Max start rate across all workers, e.g. "50/s" (None for no limit)
+        concurrency_limit: Max number of these tasks running at once across all workers
+        concurrency_key: Callable receiving the task arguments and returning the key
+            the concurrency limit is counted per (None for a single global limit)
+        idempotency_key: Deduplicate enqueues of this task while a previous one is
+            pending or in progress. True derives the key from the task name and
+            arguments; a callable receives the task arguments and returns the key.
+            A key passed to run_async(..., idempotency_key=...) takes precedence.
+        debounce: Delay in seconds. Repeated enqueues with the same arguments within
+            this window update one pending task instead of creating new ones.
+        debounce_merge: Function (old_arguments, new_arguments) -> arguments used to
+            coalesce enqueues with different arguments into the pending task, where
+            arguments are {"args": [...], "kwargs": {...}} dicts
+        debounce_max_wait: Upper bound in seconds on how long repeated enqueues may
+            postpone a debounced task after it was first enqueued
+        cache_ttl: Seconds to reuse the result of an identical invocation. Only for
+            tasks whose result depends solely on their arguments (None disables)
+        profile_sample_rate: Fraction of executions (0.0-1.0) to run under the
+            profiler and store as a TaskProfile (None disables)
     """
     valid_priorities = list(Task.PRIORITY_MAPPING.keys())
     if priority not in valid_priorities:
         raise ValueError(
             f"Invalid priority: '{priority}'. Must be one of: {', '.join(valid_priorities)}"
         )
+    if rate_limit is not None:
+        parse_rate(rate_limit)
+    if concurrency_limit is not None and concurrency_limit < 1:
+        raise ValueError(
+            f"Invalid concurrency_limit: {concurrency_limit}. Must be at least 1."
+        )
+    if concurrency_key is not None and concurrency_limit is None:
+        raise ValueError("concurrency_key requires concurrency_limit to be set.")
+    if debounce is None and (debounce_merge or debounce_max_wait is not None):
+        raise ValueError("debounce_merge and debounce_max_wait require debounce.")
+    if profile_sample_rate is not None and not 0.0 <= profile_sample_rate <= 1.0:
+        raise ValueError(
+            f"Invalid profile_sample_rate: {profile_sample_rate}. Must be between 0 and 1."
+        )
 
     def decorator(func: Callable) -> Callable:
         TASK_REGISTRY[func.__name__] = f"{func.__module__}.{func.__name__}"
+        # A task with its own idempotency_key parameter receives that argument;
+        # only the decorator option sets its key then.
+        takes_key_argument = "idempotency_key" in inspect.signature(func).parameters
+
+        def _new_task(args, kwargs, key=None, scheduled_at=None, debounce_key=None):
+            slot_key = None
+            if concurrency_key is not None:
+                slot_key = str(concurrency_key(*args, **kwargs))
+
+            return Task(
+                name=func.__name__,
+                arguments={"args": list(args), "kwargs": kwargs},
+                status="pending",
+                scheduled_at=scheduled_at,
+                priority=Task.PRIORITY_MAPPING.get(
+                    priority, Task.PRIORITY_MAPPING["medium"]
+                ),
+                queue=queue,
+                autoretry=autoretry,
+                retry_delay=retry_delay,
+                retry_backoff=retry_backoff,
+                max_retries=max_retries,
+                timeout=timeout,
+                memory_limit=memory_limit,
+                rate_limit=rate_limit,
+                concurrency_limit=concurrency_limit,
+                concurrency_key=slot_key,
+                idempotency_key=key,
+                debounce_key=debounce_key,
+                cache_ttl=cache_ttl,
+                profile_sample_rate=profile_sample_rate,
+            )
 
         @wraps(func)
         def wrapper(*args, **kwargs) -> Task:
+            key = None if takes_key_argument else kwargs.pop("idempotency_key", None)
+            if key is None and idempotency_key is not None:
+                if callable(idempotency_key):
+                    key = idempotency_key(*args, **kwargs)
+                elif idempotency_key:
+                    key = make_task_key(func.__name__, args, kwargs)
+            if key is not None:
+                key = str(key)
+                if len(key) > 255:
+                    key = make_task_key(func.__name__, [key], {})
+                existing = Task.objects.filter(
+                    idempotency_key=key, status__in=Task.ACTIVE_STATUSES
+                ).first()
+                if existing:
+                    return existing
+
+            arguments = {"args": list(args), "kwargs": kwargs}
+            scheduled_at = None
+            debounce_key = None
+            if debounce is not None:
+                if debounce_merge is not None:
+                    debounce_key = make_task_key(func.__name__, [], {})
+                else:
+                    debounce_key = make_task_key(func.__name__, args, kwargs)
+                debounced = _coalesce_debounced(
+                    debounce_key, arguments, debounce, debounce_merge, debounce_max_wait
+                )
+                if debounced:
+                    return debounced
+                scheduled_at = now() + timedelta(seconds=debounce)
+
             dep_list = []
             if dependencies:
                 raw = (
@@ -70,26 +215,53 @@ def background_task(
                     else:
                         raise ValueError(f"Unsupported dependency type: {type(dep)}")
 
-            task = Task.objects.create(
-                name=func.__name__,
-                arguments={"args": args, "kwargs": kwargs},
-                status="pending",
-                priority=Task.PRIORITY_MAPPING.get(
-                    priority, Task.PRIORITY_MAPPING["medium"]
-                ),
-                queue=queue,
-                autoretry=autoretry,
-                retry_delay=retry_delay,
-                retry_backoff=retry_backoff,
-                max_retries=max_retries,
-                timeout=timeout,
-                memory_limit=memory_limit,
-            )
+            task = _new_task(args, kwargs, key, scheduled_at, debounce_key)
+            run_hook("before_enqueue", task=task)
+            try:
+                with transaction.atomic():
+                    task.save(force_insert=True)
+            except IntegrityError:
+                existing = None
+                if debounce_key is not None:
+                    existing = _coalesce_debounced(
+                        debounce_key,
+                        arguments,
+                        debounce,
+                        debounce_merge,
+                        debounce_max_wait,
+                    )
+                if existing is None and key is not None:
+                    existing = Task.objects.filter(
+                        idempotency_key=key, status__in=Task.ACTIVE_STATUSES
+                    ).first()
+                if existing is None:
+                    raise
+                return existing
             if dep_list:
                 task.dependencies.set(dep_list)
             return task
 
+        def build_task(*args, **kwargs) -> Optional[Task]:
+            """
+            Return the unsaved Task run_async() would insert for these
+            arguments, with the before_enqueue hooks already run, so callers
+            can insert many at once with bulk_create(). Returns None when the
+            enqueue depends on existing tasks (idempotency keys, debouncing or
+            dependencies) and has to go through run_async().
+            """
+            if (
+                idempotency_key is not None
+                or ("idempotency_key" in kwargs and not takes_key_argument)
+                or debounce is not None
+                or dependencies
+            ):
+                return None
+            task = _new_task(args, kwargs)
+            run_hook("before_enqueue", task=task)
+            return task
+
         wrapper.run_async = wrapper
+        wrapper.build_task = build_task
         return wrapper
 
     return decorator
@@ -0,0 +1,136 @@
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from django_async_manager.metrics import SCHEDULER_LEASE_TAKEOVERS
+from django_async_manager.models import SchedulerLease
+
+logger = logging.getLogger("django_async_manager.scheduler")
+
+
+class LeaseLost(Exception):
+    """Raised by Lease.fence() once another scheduler has taken the lease over."""
+
+
+class Lease:
+    """
+    Leader election through a SchedulerLease row shared by all scheduler
+    replicas.
+
+    The holder of an unexpired lease is the leader and renews it every third
+    of its duration; the others keep trying and take it over once it has
+    expired or was released. Every takeover increments the row's fencing
+    token, and the leader runs its writes in transactions that first call
+    fence(), which only succeeds while the token it acquired is still the
+    current one. A leader that stalled past its lease (a long GC pause, a
+    frozen VM) therefore cannot enqueue anything after a standby took over.
+
+    Expiry is compared against each replica's wall clock, so the duration
+    must comfortably exceed the clock skew between hosts.
+    """
+
+    def __init__(
+        self,
+        name: str = "scheduler",
+        duration: float = 30.0,
+        holder: Optional[str] = None,
+    ):
+        if duration <= 0:
+            raise ValueError(f"Lease duration must be positive, got {duration}.")
+        self.name = name
+        self.duration = duration
+        self.holder = holder or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.token: Optional[int] = None
+        self._valid_until = 0.0
+
+    @property
+    def renew_interval(self) -> float:
+        return self.duration / 3
+
+    @property
+    def held(self) -> bool:
+        """Whether the lease is held, judged by the local monotonic clock."""
+        return self.token is not None and time.monotonic() < self._valid_until
+
+    def acquire(self) -> bool:
+        """Renew the lease if held, otherwise try to take it over. Returns held."""
+        started = time.monotonic()
+        current_time = now()
+        expires_at = current_time + timedelta(seconds=self.duration)
+        previous_token = self.token
+
+        with transaction.atomic():
+            SchedulerLease.objects.get_or_create(
+                name=self.name, defaults={"expires_at": current_time}
+            )
+            leases = SchedulerLease.objects.filter(name=self.name)
+            if previous_token is not None and leases.filter(
+                holder=self.holder, token=previous_token
+            ).update(expires_at=expires_at, renewed_at=current_time):
+                token = previous_token
+            elif leases.filter(Q(expires_at__lte=current_time) | Q(holder="")).update(
+                holder=self.holder,
+                token=F("token") + 1,
+                acquired_at=current_time,
+                renewed_at=current_time,
+                expires_at=expires_at,
+            ):
+                token = leases.values_list("token", flat=True).get()
+            else:
+                token = None
+
+        self.token = token
+        if token is None:
+            if previous_token is not None:
+                logger.warning(
+                    f"Lost scheduler lease '{self.name}' (token {previous_token}); "
+                    f"standing by."
+                )
+            return False
+
+        # Measured from before the request, so the local view never outlives
+        # the expiry other replicas see.
+        self._valid_until = started + self.duration
+        if token != previous_token:
+            SCHEDULER_LEASE_TAKEOVERS.inc()
+            logger.info(
+                f"Acquired scheduler lease '{self.name}' as {self.holder} "
+                f"with fencing token {token}."
+            )
+        return True
+
+    def fence(self) -> None:
+        """
+        Raise LeaseLost unless this holder's token is still current. Call it
+        inside the transaction whose writes must not outlive the lease: the
+        lease row stays locked until that transaction commits, so a takeover
+        waits for it.
+        """
+        if not self.held or not (
+            SchedulerLease.objects.select_for_update()
+            .filter(name=self.name, holder=self.holder, token=self.token)
+            .exists()
+        ):
+            raise LeaseLost(
+                f"Scheduler lease '{self.name}' is no longer held by {self.holder}."
+            )
+
+    def release(self) -> None:
+        """Give up the lease so a standby takes over without waiting for expiry."""
+        if self.token is None:
+            return
+        SchedulerLease.objects.filter(
+            name=self.name, holder=self.holder, token=self.token
+        ).update(holder="", expires_at=now())
+        logger.info(f"Released scheduler lease '{self.name}' (token {self.token}).")
+        self.token = None
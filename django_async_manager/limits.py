@@ -0,0 +1,111 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+RATE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_RATE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*/\s*(\d*)\s*([smhd])\s*$")
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """
+    Parse a rate limit string into (calls, period in seconds).
+
+    Accepted formats are "<calls>/<unit>" and "<calls>/<n><unit>" where unit
+    is one of s, m, h, d, e.g. "50/s", "100/m" or "10/30s".
+    """
+    match = _RATE_RE.match(rate or "")
+    if not match:
+        raise ValueError(
+            f"Invalid rate limit: '{rate}'. Expected format like '50/s', '100/m' or '10/30s'."
+        )
+    calls, multiplier, unit = match.groups()
+    calls = float(calls)
+    period = int(multiplier or 1) * RATE_UNITS[unit]
+    if calls <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: '{rate}'. Rate must be positive.")
+    return calls, period
+
+
+class BaseRateLimiter:
+    """
+    Interface for rate limiters shared by all workers.
+
+    acquire() is called inside the worker's task acquisition transaction and must
+    return True if a call for the given key may start now, consuming one unit of
+    quota, or False if the task should be left pending for now.
+    """
+
+    def acquire(self, key: str, rate: str) -> bool:
+        raise NotImplementedError
+
+
+class DatabaseRateLimiter(BaseRateLimiter):
+    """Token bucket stored in the RateLimitBucket table, one row per key."""
+
+    def acquire(self, key: str, rate: str) -> bool:
+        from django_async_manager.models import RateLimitBucket
+
+        capacity, period = parse_rate(rate)
+        refill_per_second = capacity / period
+        current_time = now()
+
+        with transaction.atomic():
+            bucket, _ = RateLimitBucket.objects.select_for_update().get_or_create(
+                key=key, defaults={"tokens": capacity, "updated_at": current_time}
+            )
+            elapsed = max(0.0, (current_time - bucket.updated_at).total_seconds())
+            tokens = min(capacity, bucket.tokens + elapsed * refill_per_second)
+            if tokens < 1:
+                return False
+
+            bucket.tokens = tokens - 1
+            bucket.updated_at = current_time
+            bucket.save(update_fields=["tokens", "updated_at"])
+            return True
+
+
+@lru_cache(maxsize=None)
+def _load_rate_limiter(path: str) -> BaseRateLimiter:
+    return import_string(path)()
+
+
+def get_rate_limiter() -> BaseRateLimiter:
+    """Return the rate limiter configured by ASYNC_MANAGER_RATE_LIMITER."""
+    path = getattr(
+        settings,
+        "ASYNC_MANAGER_RATE_LIMITER",
+        "django_async_manager.limits.DatabaseRateLimiter",
+    )
+    return _load_rate_limiter(path)
+
+
+def has_free_concurrency_slot(task) -> bool:
+    """
+    Check whether another task sharing this task's name and concurrency key may
+    start without exceeding its concurrency_limit.
+
+    Must be called inside the acquisition transaction. The ConcurrencyLock row
+    for the key stays locked until that transaction commits, so concurrent
+    workers admit tasks for the same key one at a time and always count the
+    claims committed before them.
+    """
+    from django_async_manager.models import ConcurrencyLock, Task
+
+    key = f"task:{task.name}:{task.concurrency_key or ''}"
+    if len(key) > 255:
+        key = f"task:{hashlib.sha256(key.encode()).hexdigest()}"
+    with transaction.atomic():
+        ConcurrencyLock.objects.select_for_update().get_or_create(key=key)
+        running = Task.objects.filter(
+            status="in_progress",
+            name=task.name,
+            concurrency_key=task.concurrency_key,
+        ).count()
+    return running < task.concurrency_limit
@@ -0,0 +1,425 @@
+import json
+import random
+import statistics
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+from django.db.models import Count
+from django.utils.timezone import now
+
+from django_async_manager.benchmark import latency_summary
+from django_async_manager.decorators import background_task
+from django_async_manager.models import Task
+from django_async_manager.worker import WorkerManager
+
+
+LOADTEST_QUEUE = "__loadtest__"
+
+
+class LoadTestFailure(RuntimeError):
+    """Failure injected by a workload profile."""
+
+
+@background_task(queue=LOADTEST_QUEUE, autoretry=False)
+def loadtest_job(duration=0.0, memory_mb=0.0, fail=False):
+    """Task executed by load tests: holds memory_mb MB for duration seconds."""
+    ballast = bytearray(int(memory_mb * 1024 * 1024)) if memory_mb else None
+    if ballast is not None:
+        # Touch every page so the memory is actually resident
+        for offset in range(0, len(ballast), 4096):
+            ballast[offset] = 1
+    time.sleep(duration)
+    if fail:
+        raise LoadTestFailure("Injected load test failure")
+    return len(ballast) if ballast is not None else 0
+
+
+LOADTEST_JOB_NAME = f"{loadtest_job.__module__}.{loadtest_job.__name__}"
+
+
+def _from_dict(cls, data: Dict[str, Any], context: str):
+    known = {f.name for f in fields(cls)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown {context} keys: {', '.join(sorted(unknown))}")
+    return cls(**data)
+
+
+@dataclass
+class TaskMix:
+    """
+    One kind of task in a workload. Each enqueue picks a TaskMix with a
+    probability proportional to its weight. With dag_width and dag_depth, an
+    enqueue creates dag_depth layers of dag_width tasks, each depending on
+    every task of the previous layer.
+    """
+
+    name: str
+    weight: float = 1.0
+    duration: Tuple[float, float] = (0.0, 0.0)
+    failure_rate: float = 0.0
+    memory_mb: float = 0.0
+    priority: str = "medium"
+    max_retries: int = 0
+    retry_delay: int = 1
+    timeout: int = 300
+    memory_limit: Optional[int] = None
+    dag_width: int = 0
+    dag_depth: int = 0
+
+    def __post_init__(self):
+        self.duration = tuple(self.duration)
+        if len(self.duration) != 2 or not 0 <= self.duration[0] <= self.duration[1]:
+            raise ValueError(
+                f"Task mix '{self.name}': duration must be [min, max] seconds"
+            )
+        if not 0.0 <= self.failure_rate <= 1.0:
+            raise ValueError(
+                f"Task mix '{self.name}': failure_rate must be between 0 and 1"
+            )
+        if self.priority not in Task.PRIORITY_MAPPING:
+            raise ValueError(
+                f"Task mix '{self.name}': invalid priority '{self.priority}'"
+            )
+        if self.weight <= 0:
+            raise ValueError(f"Task mix '{self.name}': weight must be positive")
+        if bool(self.dag_width) != bool(self.dag_depth):
+            raise ValueError(
+                f"Task mix '{self.name}': set both dag_width and dag_depth"
+            )
+
+
+@dataclass
+class Workload:
+    """
+    Declarative load test profile: how many task groups to enqueue per second
+    (arrivals follow a Poisson process), the task mix, and the WorkerManager
+    configuration that has to keep up with it.
+    """
+
+    name: str
+    mix: List[TaskMix]
+    duration: float = 600.0
+    rate: float = 5.0
+    queue: str = LOADTEST_QUEUE
+    workers: int = 4
+    use_processes: bool = False
+    max_workers_per_task: int = 1
+    max_tasks_per_child: Optional[int] = None
+    max_memory_per_child: Optional[int] = None
+    sample_interval: float = 10.0
+    drain_timeout: float = 120.0
+    stuck_after: float = 600.0
+
+    def __post_init__(self):
+        if not self.mix:
+            raise ValueError(f"Workload '{self.name}' has no task mix")
+        self.mix = [
+            item if isinstance(item, TaskMix) else _from_dict(TaskMix, item, "mix")
+            for item in self.mix
+        ]
+        if self.rate <= 0 or self.duration <= 0 or self.sample_interval <= 0:
+            raise ValueError(
+                f"Workload '{self.name}': rate, duration and sample_interval must be positive"
+            )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Workload":
+        return _from_dict(cls, dict(data), "workload")
+
+    @classmethod
+    def load(cls, profile: str) -> "Workload":
+        """Return a built-in profile by name, or load a JSON profile from a path."""
+        if profile in PROFILES:
+            return cls.from_dict(PROFILES[profile])
+        with open(profile) as f:
+            return cls.from_dict(json.load(f))
+
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "smoke": {
+        "name": "smoke",
+        "duration": 60,
+        "rate": 2,
+        "workers": 2,
+        "sample_interval": 5,
+        "drain_timeout": 30,
+        "mix": [{"name": "quick", "duration": [0.0, 0.05]}],
+    },
+    "mixed": {
+        "name": "mixed",
+        "duration": 3600,
+        "rate": 5,
+        "workers": 8,
+        "mix": [
+            {"name": "quick", "weight": 70, "duration": [0.0, 0.1]},
+            {
+                "name": "flaky",
+                "weight": 10,
+                "duration": [0.05, 0.5],
+                "failure_rate": 0.2,
+                "max_retries": 2,
+            },
+            {
+                "name": "urgent",
+                "weight": 10,
+                "duration": [0.0, 0.05],
+                "priority": "critical",
+            },
+            {
+                "name": "pipeline",
+                "weight": 5,
+                "duration": [0.05, 0.2],
+                "dag_width": 3,
+                "dag_depth": 3,
+            },
+            {
+                "name": "memory_heavy",
+                "weight": 5,
+                "duration": [1.0, 5.0],
+                "memory_mb": 200,
+                "priority": "low",
+            },
+        ],
+    },
+}
+PROFILES["soak"] = dict(PROFILES["mixed"], name="soak", duration=8 * 3600)
+
+
+def _process_rss_mb() -> float:
+    """Resident memory of this process and all its children, in MB."""
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+class LoadTest:
+    """
+    Runs a Workload against a WorkerManager in this process and samples
+    throughput, latency, stuck tasks and worker memory every sample_interval.
+    """
+
+    def __init__(
+        self,
+        workload: Workload,
+        seed: Optional[int] = None,
+        on_sample: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.workload = workload
+        self.rng = random.Random(seed)
+        self.on_sample = on_sample
+        self.samples: List[Dict[str, Any]] = []
+        self.enqueued = 0
+        self.injected_failures = 0
+        self._latencies: List[float] = []
+        self._weights = [item.weight for item in workload.mix]
+        self._stop = threading.Event()
+        self._started_at = None
+        self._last_sample_at = None
+
+    def stop(self) -> None:
+        """End the load phase early; the run still drains and reports."""
+        self._stop.set()
+
+    def _tasks(self):
+        """The load test's own tasks; a profile's queue may hold other work."""
+        return Task.objects.filter(queue=self.workload.queue, name=LOADTEST_JOB_NAME)
+
+    def purge(self) -> None:
+        self._tasks().delete()
+
+    def _new_task(self, item: TaskMix) -> Task:
+        fail = self.rng.random() < item.failure_rate
+        self.injected_failures += fail
+        return Task(
+            name=LOADTEST_JOB_NAME,
+            arguments={
+                "args": [],
+                "kwargs": {
+                    "duration": self.rng.uniform(*item.duration),
+                    "memory_mb": item.memory_mb,
+                    "fail": fail,
+                },
+            },
+            status="pending",
+            priority=Task.PRIORITY_MAPPING[item.priority],
+            queue=self.workload.queue,
+            max_retries=item.max_retries,
+            autoretry=item.max_retries > 0,
+            retry_delay=item.retry_delay,
+            timeout=item.timeout,
+            memory_limit=item.memory_limit,
+        )
+
+    def enqueue(self) -> int:
+        """Enqueue one task group picked from the mix; returns the tasks created."""
+        item = self.rng.choices(self.workload.mix, weights=self._weights)[0]
+        if not item.dag_width:
+            self._new_task(item).save(force_insert=True)
+            self.enqueued += 1
+            return 1
+
+        previous: List[Task] = []
+        for _ in range(item.dag_depth):
+            layer = Task.objects.bulk_create(
+                [self._new_task(item) for _ in range(item.dag_width)]
+            )
+            if previous:
+                through = Task.dependencies.through
+                through.objects.bulk_create(
+                    through(from_task_id=task.pk, to_task_id=dependency.pk)
+                    for task in layer
+                    for dependency in previous
+                )
+            previous = layer
+        created = item.dag_width * item.dag_depth
+        self.enqueued += created
+        return created
+
+    def sample(self) -> Dict[str, Any]:
+        """Record queue state, throughput and latency since the previous sample."""
+        current = now()
+        window_start = self._last_sample_at or self._started_at
+        self._last_sample_at = current
+        queue_tasks = self._tasks()
+
+        counts = dict(
+            queue_tasks.values_list("status").annotate(count=Count("id")).order_by()
+        )
+        finished = list(
+            queue_tasks.filter(
+                status="completed",
+                completed_at__gt=window_start,
+                completed_at__lte=current,
+            ).values_list("created_at", "completed_at", "queue_wait_ms", "exec_ms")
+        )
+        latencies = [
+            (completed_at - created_at).total_seconds()
+            for created_at, completed_at, _, _ in finished
+        ]
+        self._latencies.extend(latencies)
+        interval = max((current - window_start).total_seconds(), 1e-9)
+        stuck = queue_tasks.filter(
+            status="in_progress",
+            started_at__lt=current - timedelta(seconds=self.workload.stuck_after),
+        ).count()
+
+        sample = {
+            "elapsed_s": (current - self._started_at).total_seconds(),
+            "enqueued": self.enqueued,
+            "pending": counts.get("pending", 0),
+            "in_progress": counts.get("in_progress", 0),
+            "completed": counts.get("completed", 0),
+            "failed": counts.get("failed", 0),
+            "throughput": len(finished) / interval,
+            "stuck": stuck,
+            "rss_mb": _process_rss_mb(),
+        }
+        if latencies:
+            sample["latency"] = latency_summary(latencies)
+            exec_ms = [row[3] for row in finished if row[3] is not None]
+            if exec_ms:
+                sample["exec_p95_ms"] = latency_summary(
+                    [value / 1000 for value in exec_ms]
+                )["p95_ms"]
+        self.samples.append(sample)
+        if self.on_sample is not None:
+            self.on_sample(sample)
+        return sample
+
+    def _drained(self) -> bool:
+        return not self._tasks().filter(status__in=Task.ACTIVE_STATUSES).exists()
+
+    def run(self, cleanup: bool = True) -> Dict[str, Any]:
+        """Run the load phase, drain the queue and return the summary report."""
+        workload = self.workload
+        self.purge()
+        manager = WorkerManager(
+            num_workers=workload.workers,
+            queue=workload.queue,
+            use_processes=workload.use_processes,
+            max_workers_per_task=workload.max_workers_per_task,
+            max_tasks_per_child=workload.max_tasks_per_child,
+            max_memory_per_child=workload.max_memory_per_child,
+        )
+        exit_code = []
+        manager_thread = threading.Thread(
+            target=lambda: exit_code.append(manager.join_workers()),
+            name="loadtest-manager",
+            daemon=True,
+        )
+
+        self._started_at = now()
+        started = time.monotonic()
+        manager.start_workers()
+        manager_thread.start()
+        try:
+            next_enqueue = started
+            next_sample = started + workload.sample_interval
+            deadline = started + workload.duration
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                current = time.monotonic()
+                if current >= next_enqueue:
+                    self.enqueue()
+                    next_enqueue += self.rng.expovariate(workload.rate)
+                if current >= next_sample:
+                    self.sample()
+                    next_sample += workload.sample_interval
+                self._stop.wait(
+                    max(
+                        0.0, min(next_enqueue, next_sample, deadline) - time.monotonic()
+                    )
+                )
+            load_time = time.monotonic() - started
+
+            drain_deadline = time.monotonic() + workload.drain_timeout
+            while not self._drained() and time.monotonic() < drain_deadline:
+                time.sleep(min(1.0, workload.sample_interval))
+            self.sample()
+        finally:
+            manager.stop()
+            manager_thread.join()
+
+        report = self.report(load_time, exit_code[0] if exit_code else None)
+        if cleanup:
+            self.purge()
+        return report
+
+    def report(self, load_time: float, exit_code: Optional[int] = None):
+        """Summarize the samples of a run."""
+        last = self.samples[-1] if self.samples else {}
+        leaked = self._tasks().filter(status__in=Task.ACTIVE_STATUSES).count()
+        rss = [sample["rss_mb"] for sample in self.samples]
+        rss_slope = None
+        if len(rss) >= 3:
+            elapsed_hours = [sample["elapsed_s"] / 3600 for sample in self.samples]
+            rss_slope = statistics.linear_regression(elapsed_hours, rss).slope
+        return {
+            "workload": self.workload.name,
+            "load_time_s": load_time,
+            "enqueued": self.enqueued,
+            "completed": last.get("completed", 0),
+            "failed": last.get("failed", 0),
+            "injected_failures": self.injected_failures,
+            "throughput": (
+                last["completed"] / last["elapsed_s"] if last.get("elapsed_s") else 0.0
+            ),
+            "latency": latency_summary(self._latencies) if self._latencies else None,
+            "max_stuck": max((sample["stuck"] for sample in self.samples), default=0),
+            "leaked": leaked,
+            "rss_start_mb": rss[0] if rss else None,
+            "rss_peak_mb": max(rss) if rss else None,
+            "rss_end_mb": rss[-1] if rss else None,
+            "rss_slope_mb_per_hour": rss_slope,
+            "worker_exit_code": exit_code,
+            "samples": self.samples,
+        }
@@ -0,0 +1,139 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_async_manager.benchmark import BENCHMARKS, compare, run_benchmarks
+
+
+def _int_list(value):
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise CommandError(f"Expected comma-separated integers, got '{value}'.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark enqueue rate, claim latency, scheduler ticks and end-to-end "
+        "throughput against the configured database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--benchmarks",
+            type=str,
+            default=",".join(BENCHMARKS),
+            help=f"Comma-separated benchmarks to run (default: {','.join(BENCHMARKS)}).",
+        )
+        parser.add_argument(
+            "--enqueue-count",
+            type=int,
+            default=1000,
+            help="Tasks enqueued with run_async() (default: 1000).",
+        )
+        parser.add_argument(
+            "--queue-sizes",
+            type=str,
+            default="1000,100000,1000000",
+            help="Ready tasks in the queue while claim latency is measured (default: 1000,100000,1000000).",
+        )
+        parser.add_argument(
+            "--claim-samples",
+            type=int,
+            default=200,
+            help="Claims measured per queue size (default: 200).",
+        )
+        parser.add_argument(
+            "--periodic-tasks",
+            type=int,
+            default=5000,
+            help="PeriodicTasks in the schedule for the tick benchmark (default: 5000).",
+        )
+        parser.add_argument(
+            "--e2e-count",
+            type=int,
+            default=500,
+            help="Tasks processed per end-to-end run (default: 500).",
+        )
+        parser.add_argument(
+            "--modes",
+            type=str,
+            default="threads,processes",
+            help="Execution modes for the end-to-end benchmark (default: threads,processes).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Concurrent TaskWorkers in the end-to-end benchmark (default: 1).",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Write the results as JSON to this file.",
+        )
+        parser.add_argument(
+            "--compare",
+            type=str,
+            default=None,
+            help="JSON results of an earlier run to compare throughput against.",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.1,
+            help="With --compare, exit with status 1 if any throughput drops by more than this fraction (default: 0.1).",
+        )
+
+    def handle(self, *args, **options):
+        benchmarks = [b.strip() for b in options["benchmarks"].split(",") if b.strip()]
+        unknown = set(benchmarks) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(
+                f"Unknown benchmarks: {', '.join(sorted(unknown))}. Choose from: {', '.join(BENCHMARKS)}"
+            )
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        if set(modes) - {"threads", "processes"}:
+            raise CommandError("--modes accepts 'threads' and 'processes'.")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        report = run_benchmarks(
+            benchmarks=benchmarks,
+            enqueue_count=options["enqueue_count"],
+            queue_sizes=_int_list(options["queue_sizes"]),
+            claim_samples=options["claim_samples"],
+            periodic_tasks=options["periodic_tasks"],
+            e2e_count=options["e2e_count"],
+            modes=modes,
+            workers=options["workers"],
+            progress=self.stdout.write,
+        )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"Results written to {options['output']}")
+            )
+
+        if baseline is not None:
+            changes = compare(baseline, report, options["max_regression"])
+            for change in changes:
+                params = ", ".join(f"{k}={v}" for k, v in change["params"].items())
+                line = (
+                    f"{change['benchmark']}({params}): "
+                    f"{change['baseline_ops_per_sec']:.1f} -> {change['ops_per_sec']:.1f} ops/s "
+                    f"({change['change']:+.1%})"
+                )
+                if change["regression"]:
+                    self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+                else:
+                    self.stdout.write(line)
+            if any(change["regression"] for change in changes):
+                sys.exit(1)
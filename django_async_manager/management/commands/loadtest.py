@@ -0,0 +1,139 @@
+import json
+import logging
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_async_manager.benchmark import quiet_loggers
+from django_async_manager.loadtest import PROFILES, LoadTest, Workload
+from django_async_manager.utils import handle_shutdown_signals
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a workload profile against a WorkerManager and report throughput, "
+        "latency, stuck and leaked tasks and worker memory over time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            type=str,
+            default="smoke",
+            help=f"Built-in profile ({', '.join(PROFILES)}) or path to a JSON workload profile (default: smoke).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=None,
+            help="Override the profile's load duration in seconds.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=None,
+            help="Override the profile's task groups enqueued per second.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Override the profile's number of workers.",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Run the workers as processes instead of threads.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Seed for arrivals, task mix and injected failures.",
+        )
+        parser.add_argument(
+            "--timeline",
+            type=str,
+            default=None,
+            help="Append every sample as a JSON line to this file while the test runs.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Write the summary report with all samples as JSON to this file.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the load test's tasks in the database for inspection.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            workload = Workload.load(options["profile"])
+        except (OSError, ValueError, TypeError) as e:
+            raise CommandError(f"Invalid workload profile '{options['profile']}': {e}")
+        for option in ("duration", "rate", "workers"):
+            if options[option] is not None:
+                setattr(workload, option, options[option])
+        if options["processes"]:
+            workload.use_processes = True
+
+        timeline = open(options["timeline"], "a") if options["timeline"] else None
+
+        def on_sample(sample):
+            latency = sample.get("latency") or {}
+            self.stdout.write(
+                f"[{sample['elapsed_s']:>8.0f}s] {sample['throughput']:.1f} tasks/s, "
+                f"p95 {latency.get('p95_ms', 0):.0f} ms, pending {sample['pending']}, "
+                f"in progress {sample['in_progress']}, failed {sample['failed']}, "
+                f"stuck {sample['stuck']}, rss {sample['rss_mb']:.0f} MB"
+            )
+            if timeline is not None:
+                timeline.write(json.dumps(sample) + "\n")
+                timeline.flush()
+
+        self.stdout.write(
+            f"Running workload '{workload.name}' for {workload.duration:.0f}s at "
+            f"{workload.rate} groups/s with {workload.workers} "
+            f"{'process' if workload.use_processes else 'thread'} workers..."
+        )
+        load_test = LoadTest(workload, seed=options["seed"], on_sample=on_sample)
+        try:
+            # Injected failures would otherwise log a traceback each; they are
+            # counted in the report instead.
+            with (
+                quiet_loggers(logging.CRITICAL),
+                handle_shutdown_signals(load_test.stop),
+            ):
+                report = load_test.run(cleanup=not options["keep"])
+        finally:
+            if timeline is not None:
+                timeline.close()
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+
+        latency = report["latency"] or {}
+        self.stdout.write(
+            f"Enqueued {report['enqueued']}, completed {report['completed']}, "
+            f"failed {report['failed']} ({report['injected_failures']} failures injected); "
+            f"{report['throughput']:.1f} tasks/s, latency p50 {latency.get('p50_ms', 0):.0f} ms, "
+            f"p99 {latency.get('p99_ms', 0):.0f} ms"
+        )
+        if report["rss_slope_mb_per_hour"] is not None:
+            self.stdout.write(
+                f"Worker RSS {report['rss_start_mb']:.0f} -> {report['rss_end_mb']:.0f} MB "
+                f"(peak {report['rss_peak_mb']:.0f} MB, {report['rss_slope_mb_per_hour']:+.1f} MB/hour)"
+            )
+        problems = []
+        if report["leaked"]:
+            problems.append(f"{report['leaked']} tasks never finished")
+        if report["max_stuck"]:
+            problems.append(f"up to {report['max_stuck']} tasks stuck in progress")
+        if problems:
+            self.stdout.write(self.style.ERROR("; ".join(problems)))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS("No stuck or leaked tasks."))
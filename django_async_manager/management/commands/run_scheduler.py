@@ -1,7 +1,14 @@
 import logging
 import sys
+import threading
 from django.core.management.base import BaseCommand
+from django_async_manager.metrics import (
+    start_http_server,
+    start_textfile_writer,
+    write_textfile,
+)
 from django_async_manager.scheduler import run_scheduler_loop
+from django_async_manager.utils import handle_shutdown_signals
 from django_async_manager.worker import WorkerManager
 
 logger = logging.getLogger("django_async_manager.scheduler")
@@ -25,6 +32,36 @@ class Command(BaseCommand):
             default=30,
             help="Default interval in seconds between scheduler ticks (default: 30)",
         )
+        parser.add_argument(
+            "--shutdown-grace",
+            type=float,
+            default=30.0,
+            help="Seconds in-flight tasks may run after SIGTERM/SIGINT before they are returned to the queue (default: 30).",
+        )
+        parser.add_argument(
+            "--lease-time",
+            type=float,
+            default=None,
+            help="Seconds a standby scheduler waits for an unresponsive leader before taking over; 0 disables leader election (default: ASYNC_MANAGER_SCHEDULER_LEASE_TIME or 30).",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="Expose Prometheus metrics on http://<metrics-addr>:<port>/metrics.",
+        )
+        parser.add_argument(
+            "--metrics-addr",
+            type=str,
+            default="127.0.0.1",
+            help="Address the metrics endpoint binds to (default: 127.0.0.1).",
+        )
+        parser.add_argument(
+            "--metrics-textfile",
+            type=str,
+            default=None,
+            help="Periodically write Prometheus metrics to this file, e.g. for the node_exporter textfile collector.",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(
@@ -32,12 +69,40 @@ class Command(BaseCommand):
         )
         logger.info("Starting scheduler and workers for periodic tasks")
 
+        metrics_textfile = options.get("metrics_textfile")
+        if options.get("metrics_port") is not None:
+            start_http_server(options["metrics_port"], addr=options["metrics_addr"])
+            logger.info(
+                f"Serving metrics on http://{options['metrics_addr']}:{options['metrics_port']}/metrics"
+            )
+        if metrics_textfile:
+            start_textfile_writer(metrics_textfile)
+
         worker_manager = WorkerManager(
             num_workers=1,
             queue="default",
             use_processes=False,
+            shutdown_grace=options.get("shutdown_grace", 30.0),
         )
-        worker_manager.start_workers()
+        stop_event = threading.Event()
+
+        def _shutdown():
+            stop_event.set()
+            worker_manager.stop()
 
         default_interval = options.get("default_interval", 30)
-        run_scheduler_loop(default_interval=default_interval)
+        with handle_shutdown_signals(_shutdown, logger_name=logger.name):
+            worker_manager.start_workers()
+            try:
+                run_scheduler_loop(
+                    default_interval=default_interval,
+                    stop_event=stop_event,
+                    lease_time=options.get("lease_time"),
+                )
+            finally:
+                worker_manager.stop()
+                exit_code = worker_manager.join_workers()
+        if metrics_textfile:
+            write_textfile(metrics_textfile)
+        if exit_code:
+            sys.exit(exit_code)
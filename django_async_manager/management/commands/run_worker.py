@@ -1,6 +1,12 @@
 import logging
 import sys
 from django.core.management.base import BaseCommand
+from django_async_manager.metrics import (
+    start_http_server,
+    start_textfile_writer,
+    write_textfile,
+)
+from django_async_manager.utils import handle_shutdown_signals
 from django_async_manager.worker import WorkerManager
 
 logger = logging.getLogger("django_async_manager.worker")
@@ -35,6 +41,60 @@ class Command(BaseCommand):
             default="default",
             help="Name of the queue that this worker listens to (default: 'default').",
         )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=None,
+            help="Enable autoscaling up to this many workers based on queue depth and host load.",
+        )
+        parser.add_argument(
+            "--min-workers",
+            type=int,
+            default=None,
+            help="Minimum number of workers kept when autoscaling (default: 1).",
+        )
+        parser.add_argument(
+            "--autoscale-interval",
+            type=float,
+            default=10.0,
+            help="Seconds between autoscaling decisions (default: 10).",
+        )
+        parser.add_argument(
+            "--shutdown-grace",
+            type=float,
+            default=30.0,
+            help="Seconds in-flight tasks may run after SIGTERM/SIGINT before they are returned to the queue (default: 30).",
+        )
+        parser.add_argument(
+            "--max-tasks-per-child",
+            type=int,
+            default=None,
+            help="Replace a child process after it has run this many tasks.",
+        )
+        parser.add_argument(
+            "--max-memory-per-child",
+            type=int,
+            default=None,
+            help="Replace a child process once its resident memory exceeds this many MB.",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="Expose Prometheus metrics on http://<metrics-addr>:<port>/metrics.",
+        )
+        parser.add_argument(
+            "--metrics-addr",
+            type=str,
+            default="127.0.0.1",
+            help="Address the metrics endpoint binds to (default: 127.0.0.1).",
+        )
+        parser.add_argument(
+            "--metrics-textfile",
+            type=str,
+            default=None,
+            help="Periodically write Prometheus metrics to this file, e.g. for the node_exporter textfile collector.",
+        )
 
     def handle(self, *args, **options):
         num_workers = options["num_workers"]
@@ -45,8 +105,41 @@ class Command(BaseCommand):
             f"Starting {num_workers} {'thread' if not use_processes else 'process'} workers on queue '{queue}'..."
         )
 
+        manager_options = {}
+        if options["max_workers"] is not None:
+            manager_options = {
+                "min_workers": options["min_workers"],
+                "max_workers": options["max_workers"],
+                "autoscale_interval": options["autoscale_interval"],
+            }
+            logger.info(
+                f"Autoscaling between {options['min_workers'] or 1} and {options['max_workers']} workers."
+            )
+
+        for option in ("max_tasks_per_child", "max_memory_per_child"):
+            if options[option] is not None:
+                manager_options[option] = options[option]
+
+        metrics_textfile = options.get("metrics_textfile")
+        if options.get("metrics_port") is not None:
+            start_http_server(options["metrics_port"], addr=options["metrics_addr"])
+            logger.info(
+                f"Serving metrics on http://{options['metrics_addr']}:{options['metrics_port']}/metrics"
+            )
+        if metrics_textfile:
+            start_textfile_writer(metrics_textfile)
+
         manager = WorkerManager(
-            num_workers=num_workers, queue=queue, use_processes=use_processes
+            num_workers=num_workers,
+            queue=queue,
+            use_processes=use_processes,
+            shutdown_grace=options["shutdown_grace"],
+            **manager_options,
         )
-        manager.start_workers()
-        manager.join_workers()
+        with handle_shutdown_signals(manager.stop, logger_name=logger.name):
+            manager.start_workers()
+            exit_code = manager.join_workers()
+        if metrics_textfile:
+            write_textfile(metrics_textfile)
+        if exit_code:
+            sys.exit(exit_code)
@@ -0,0 +1,146 @@
+import marshal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+
+from django_async_manager.models import ProfilingRule, TaskProfile
+from django_async_manager.profiling import parse_modes
+
+
+class Command(BaseCommand):
+    help = "List and inspect task profiles, and toggle profiling at runtime"
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="action", required=True)
+
+        list_parser = subparsers.add_parser("list", help="List stored profiles.")
+        list_parser.add_argument("--name", help="Only show profiles of this task.")
+        list_parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of profiles to show (default: 20).",
+        )
+
+        show_parser = subparsers.add_parser(
+            "show", help="Print the hottest functions and top allocations."
+        )
+        show_parser.add_argument("profile_id", type=int)
+        show_parser.add_argument(
+            "--sort",
+            default="cumulative",
+            help="pstats sort key, e.g. cumulative, tottime, calls (default: cumulative).",
+        )
+        show_parser.add_argument(
+            "--limit",
+            type=int,
+            default=30,
+            help="Number of functions to print (default: 30).",
+        )
+
+        dump_parser = subparsers.add_parser(
+            "dump",
+            help="Write the cProfile stats to a .prof file for snakeviz, pstats etc.",
+        )
+        dump_parser.add_argument("profile_id", type=int)
+        dump_parser.add_argument("path")
+
+        enable_parser = subparsers.add_parser(
+            "enable", help="Profile a task (or '*' for all tasks) on running workers."
+        )
+        enable_parser.add_argument("task_name")
+        enable_parser.add_argument(
+            "--rate",
+            type=float,
+            default=0.01,
+            help="Fraction of executions to profile (default: 0.01).",
+        )
+        enable_parser.add_argument(
+            "--modes",
+            default="cprofile",
+            help="Comma-separated profilers: cprofile, tracemalloc (default: cprofile).",
+        )
+        enable_parser.add_argument(
+            "--minutes",
+            type=float,
+            default=None,
+            help="Disable the rule again after this many minutes.",
+        )
+
+        disable_parser = subparsers.add_parser(
+            "disable", help="Remove the runtime profiling rule of a task."
+        )
+        disable_parser.add_argument("task_name")
+
+    def handle(self, *args, **options):
+        getattr(self, f"handle_{options['action']}")(**options)
+
+    def _get_profile(self, profile_id):
+        try:
+            return TaskProfile.objects.get(pk=profile_id)
+        except TaskProfile.DoesNotExist:
+            raise CommandError(f"Profile {profile_id} does not exist.")
+
+    def handle_list(self, name=None, limit=20, **options):
+        profiles = TaskProfile.objects.defer("pstats", "allocations")
+        if name:
+            profiles = profiles.filter(task_name=name)
+        for profile in profiles[:limit]:
+            self.stdout.write(
+                f"{profile.id:>6}  {profile.created_at:%Y-%m-%d %H:%M:%S}  "
+                f"{profile.task_name}  {profile.status}  "
+                f"{profile.duration_ms:.1f} ms  [{profile.modes}]"
+            )
+
+    def handle_show(self, profile_id, sort="cumulative", limit=30, **options):
+        profile = self._get_profile(profile_id)
+        self.stdout.write(
+            f"{profile.task_name} ({profile.status}, {profile.duration_ms:.1f} ms)"
+        )
+        stats = profile.get_stats(stream=self.stdout)
+        if stats is not None:
+            stats.sort_stats(sort).print_stats(limit)
+        allocations = profile.get_allocations()
+        if allocations:
+            self.stdout.write("Top allocations:")
+            for allocation in allocations:
+                self.stdout.write(
+                    f"  {allocation['file']}:{allocation['line']}  "
+                    f"{allocation['size_kb']:.1f} KiB in {allocation['count']} blocks"
+                )
+
+    def handle_dump(self, profile_id, path, **options):
+        profile = self._get_profile(profile_id)
+        stats = profile.get_stats()
+        if stats is None:
+            raise CommandError(f"Profile {profile_id} has no cProfile data.")
+        with open(path, "wb") as f:
+            marshal.dump(stats.stats, f)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
+
+    def handle_enable(
+        self, task_name, rate=0.01, modes="cprofile", minutes=None, **options
+    ):
+        if not 0.0 < rate <= 1.0:
+            raise CommandError(f"Invalid rate: {rate}. Must be in (0, 1].")
+        try:
+            modes = ",".join(parse_modes(modes))
+        except ValueError as e:
+            raise CommandError(str(e))
+        expires_at = now() + timedelta(minutes=minutes) if minutes else None
+        ProfilingRule.objects.update_or_create(
+            task_name=task_name,
+            defaults={"sample_rate": rate, "modes": modes, "expires_at": expires_at},
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Profiling {rate:.2%} of '{task_name}' executions with {modes}."
+            )
+        )
+
+    def handle_disable(self, task_name, **options):
+        deleted, _ = ProfilingRule.objects.filter(task_name=task_name).delete()
+        if not deleted:
+            raise CommandError(f"No profiling rule for '{task_name}'.")
+        self.stdout.write(self.style.SUCCESS(f"Profiling of '{task_name}' disabled."))
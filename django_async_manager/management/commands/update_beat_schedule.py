@@ -1,8 +1,10 @@
 import logging
 import sys
-from django.core.management.base import BaseCommand
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from django_async_manager.models import CrontabSchedule, PeriodicTask
+from django.utils.dateparse import parse_datetime
+from django_async_manager.models import CrontabSchedule, IntervalSchedule, PeriodicTask
 
 logger = logging.getLogger("django_async_manager.scheduler")
 
@@ -26,15 +28,42 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("No BEAT_SCHEDULE found in settings."))
             return
 
+        catch_up_policies = [choice for choice, _ in PeriodicTask.CATCH_UP_CHOICES]
         for name, config in beat_schedule.items():
+            catch_up = config.get("catch_up", "run_once")
+            if catch_up not in catch_up_policies:
+                raise CommandError(
+                    f"Invalid catch_up '{catch_up}' for {name}. "
+                    f"Must be one of: {', '.join(catch_up_policies)}"
+                )
             schedule_config = config["schedule"]
-            crontab, _ = CrontabSchedule.objects.get_or_create(
-                hour=schedule_config.get("hour", "*"),
-                minute=schedule_config.get("minute", "*"),
-                day_of_week=schedule_config.get("day_of_week", "*"),
-                day_of_month=schedule_config.get("day_of_month", "*"),
-                month_of_year=schedule_config.get("month_of_year", "*"),
-            )
+            crontab = interval = None
+            if "every" in schedule_config:
+                anchor = schedule_config.get("anchor")
+                if isinstance(anchor, str):
+                    anchor = parse_datetime(anchor)
+                interval = IntervalSchedule(
+                    every=schedule_config["every"],
+                    period=schedule_config.get("period", "seconds"),
+                    anchor=anchor,
+                )
+                try:
+                    interval.full_clean()
+                except ValidationError as e:
+                    raise CommandError(
+                        f"Invalid schedule for {name}: {'; '.join(e.messages)}"
+                    )
+                interval, _ = IntervalSchedule.objects.get_or_create(
+                    every=interval.every, period=interval.period, anchor=interval.anchor
+                )
+            else:
+                crontab, _ = CrontabSchedule.objects.get_or_create(
+                    hour=schedule_config.get("hour", "*"),
+                    minute=schedule_config.get("minute", "*"),
+                    day_of_week=schedule_config.get("day_of_week", "*"),
+                    day_of_month=schedule_config.get("day_of_month", "*"),
+                    month_of_year=schedule_config.get("month_of_year", "*"),
+                )
             periodic_task, _ = PeriodicTask.objects.update_or_create(
                 name=name,
                 defaults={
@@ -42,8 +71,15 @@ class Command(BaseCommand):
                     "arguments": config.get("args", []),
                     "kwargs": config.get("kwargs", {}),
                     "crontab": crontab,
+                    "interval": interval,
                     "enabled": True,
+                    "catch_up": catch_up,
+                    "max_catch_up_runs": config.get("max_catch_up_runs", 100),
+                    "jitter": config.get("jitter", 0),
+                    "spread": config.get("spread", False),
                 },
             )
             self.stdout.write(self.style.SUCCESS(f"Updated periodic task: {name}"))
-            logger.info("Updated periodic task %s with schedule %s", name, crontab)
+            logger.info(
+                "Updated periodic task %s with schedule %s", name, crontab or interval
+            )
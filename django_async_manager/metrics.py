@@ -0,0 +1,388 @@
+import bisect
+import logging
+import math
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger("django_async_manager.utils")
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    math.inf,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def take(self) -> Dict[Tuple[str, ...], object]:
+        """Return the values recorded since the last call and reset them."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Tuple[str, ...], object]) -> None:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing value, e.g. a number of processed tasks."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def merge(self, values: Dict[Tuple[str, ...], float]) -> None:
+        with self._lock:
+            for key, amount in values.items():
+                self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values (usually durations in seconds) over buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        buckets = sorted(buckets)
+        if buckets[-1] != math.inf:
+            buckets.append(math.inf)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def get(self, **labels) -> Tuple[int, float]:
+        """Return (count, sum) of the observations for the given labels."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            if entry is None:
+                return 0, 0.0
+            return entry[2], entry[1]
+
+    def merge(self, values) -> None:
+        with self._lock:
+            for key, (counts, total, count) in values.items():
+                entry = self._values.get(key)
+                if entry is None:
+                    entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(
+                (key, (list(counts), total, count))
+                for key, (counts, total, count) in self._values.items()
+            )
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Collection of metrics that can be rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(
+                    name, documentation, labelnames, **kwargs
+                )
+            elif not isinstance(metric, metric_class):
+                raise ValueError(
+                    f"Metric {name} is already registered as {metric.kind}"
+                )
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def take_deltas(self) -> Dict[str, dict]:
+        """
+        Return everything recorded since the last call and reset it. Used by
+        worker processes to ship their metrics to the WorkerManager process.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        deltas = {}
+        for metric in metrics:
+            values = metric.take()
+            if values:
+                deltas[metric.name] = values
+        return deltas
+
+    def merge_deltas(self, deltas: Dict[str, dict]) -> None:
+        """Add values produced by take_deltas() in another process."""
+        for name, values in deltas.items():
+            with self._lock:
+                metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+    def reset(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+TASKS_CLAIMED = REGISTRY.counter(
+    "django_async_manager_tasks_claimed_total",
+    "Tasks claimed by workers.",
+    ("queue", "name"),
+)
+TASKS_COMPLETED = REGISTRY.counter(
+    "django_async_manager_tasks_completed_total",
+    "Tasks that completed successfully.",
+    ("queue", "name"),
+)
+TASKS_FAILED = REGISTRY.counter(
+    "django_async_manager_tasks_failed_total",
+    "Tasks that failed without further retries.",
+    ("queue", "name"),
+)
+TASKS_RETRIED = REGISTRY.counter(
+    "django_async_manager_tasks_retried_total",
+    "Failed task attempts that were scheduled for a retry.",
+    ("queue", "name"),
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "django_async_manager_task_queue_wait_seconds",
+    "Time between a task becoming ready and a worker claiming it.",
+    ("queue", "name"),
+)
+EXECUTION_TIME = REGISTRY.histogram(
+    "django_async_manager_task_execution_seconds",
+    "Time spent executing task functions.",
+    ("queue", "name"),
+)
+ACQUISITION_TIME = REGISTRY.histogram(
+    "django_async_manager_task_acquisition_seconds",
+    "Time spent in the task acquisition transaction, including lock retries.",
+    ("queue",),
+)
+DB_LOCK_RETRIES = REGISTRY.counter(
+    "django_async_manager_db_lock_retries_total",
+    "Operations retried because the database was locked.",
+    ("function",),
+)
+PERIODIC_TASKS_ENQUEUED = REGISTRY.counter(
+    "django_async_manager_periodic_tasks_enqueued_total",
+    "Periodic tasks enqueued by the scheduler.",
+    ("name",),
+)
+SCHEDULER_TICK_LAG = REGISTRY.histogram(
+    "django_async_manager_scheduler_tick_lag_seconds",
+    "Delay between a periodic task's due time and its enqueue.",
+)
+SCHEDULER_LEASE_TAKEOVERS = REGISTRY.counter(
+    "django_async_manager_scheduler_lease_takeovers_total",
+    "Times this scheduler acquired the leader lease.",
+)
+RESULT_CACHE_HITS = REGISTRY.counter(
+    "django_async_manager_result_cache_hits_total",
+    "Result cache lookups that found a stored result.",
+    ("backend",),
+)
+RESULT_CACHE_MISSES = REGISTRY.counter(
+    "django_async_manager_result_cache_misses_total",
+    "Result cache lookups that found no stored result.",
+    ("backend",),
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(
+    port: int, addr: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve the registry on http://addr:port/metrics from a daemon thread."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((addr, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    )
+    thread.start()
+    return server
+
+
+def write_textfile(path: str, registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Atomically write the registry to path, e.g. for the node_exporter
+    textfile collector.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.render())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def start_textfile_writer(
+    path: str,
+    interval: float = 15.0,
+    registry: MetricsRegistry = REGISTRY,
+    stop_event: Optional[threading.Event] = None,
+) -> threading.Thread:
+    """Rewrite the textfile every `interval` seconds from a daemon thread."""
+    stop_event = stop_event if stop_event is not None else threading.Event()
+
+    def _loop():
+        while not stop_event.wait(interval):
+            try:
+                write_textfile(path, registry)
+            except OSError as e:
+                logger.error(f"Could not write metrics to {path}: {e}")
+
+    write_textfile(path, registry)
+    thread = threading.Thread(target=_loop, name="metrics-textfile", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,116 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_async_manager import signals
+
+logger = logging.getLogger("django_async_manager.worker")
+
+HOOKS = (
+    "before_enqueue",
+    "after_claim",
+    "pre_execute",
+    "post_execute",
+    "on_retry",
+    "on_failure",
+)
+
+# Exceptions raised by these hooks propagate, so they can veto an enqueue or an
+# execution attempt. Errors in the other hooks are logged and ignored.
+VETO_HOOKS = frozenset({"before_enqueue", "pre_execute"})
+
+# Hooks that run after the work they observe call middleware in reverse order.
+REVERSED_HOOKS = frozenset({"post_execute", "on_retry", "on_failure"})
+
+
+class TaskMiddleware:
+    """
+    Base class for middleware listed in ASYNC_MANAGER_MIDDLEWARE.
+
+    Override only the hooks you need; hooks that are not overridden cost
+    nothing. Middleware is instantiated once per process without arguments.
+
+    - before_enqueue(task): unsaved Task about to be inserted
+    - after_claim(task, worker_id): task claimed by a worker
+    - pre_execute(task_info, args, kwargs): in the thread or process running
+      the function; task_info has the task's "id", "name" and "queue"
+    - post_execute(task_info, args, kwargs, result, exception, duration):
+      same process, after the function returned or raised
+    - on_retry(task, error) / on_failure(task, error): in the worker process
+    """
+
+    def before_enqueue(self, task):
+        pass
+
+    def after_claim(self, task, worker_id):
+        pass
+
+    def pre_execute(self, task_info, args, kwargs):
+        pass
+
+    def post_execute(self, task_info, args, kwargs, result, exception, duration):
+        pass
+
+    def on_retry(self, task, error):
+        pass
+
+    def on_failure(self, task, error):
+        pass
+
+
+@lru_cache(maxsize=None)
+def _load_handlers(paths: Tuple[str, ...]) -> Dict[str, tuple]:
+    handlers = {hook: [] for hook in HOOKS}
+    for path in paths:
+        middleware = import_string(path)()
+        for hook in HOOKS:
+            method = getattr(type(middleware), hook, None)
+            if method is None or method is getattr(TaskMiddleware, hook):
+                continue
+            handlers[hook].append(getattr(middleware, hook))
+    return {
+        hook: tuple(reversed(found) if hook in REVERSED_HOOKS else found)
+        for hook, found in handlers.items()
+    }
+
+
+def get_handlers(hook: str) -> tuple:
+    """Return the middleware methods implementing a hook, in call order."""
+    paths = tuple(getattr(settings, "ASYNC_MANAGER_MIDDLEWARE", ()))
+    return _load_handlers(paths)[hook]
+
+
+def run_hook(hook: str, **kwargs) -> None:
+    """
+    Call the middleware implementing a hook, then send the matching signal.
+    Returns immediately when there are neither middleware nor receivers.
+    """
+    handlers = get_handlers(hook)
+    signal = getattr(signals, hook)
+    if not handlers and not signal.receivers:
+        return
+
+    from django_async_manager.models import Task
+
+    if hook in VETO_HOOKS:
+        for handler in handlers:
+            handler(**kwargs)
+        if signal.receivers:
+            signal.send(sender=Task, **kwargs)
+        return
+
+    for handler in handlers:
+        try:
+            handler(**kwargs)
+        except Exception:
+            logger.exception(f"Error in {hook} hook of task middleware {handler}.")
+    if signal.receivers:
+        for receiver, response in signal.send_robust(sender=Task, **kwargs):
+            if isinstance(response, Exception):
+                logger.error(
+                    f"Error in {hook} signal receiver {receiver}: {response}",
+                    exc_info=response,
+                )
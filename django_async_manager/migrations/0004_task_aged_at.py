@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0003_task_memory_limit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="aged_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last time the priority was raised by priority aging",
+                null=True,
+            ),
+        ),
+    ]
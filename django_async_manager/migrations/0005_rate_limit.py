@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0004_task_aged_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, unique=True)),
+                (
+                    "tokens",
+                    models.FloatField(
+                        help_text="Tokens currently available in the bucket"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="Time the tokens were last refilled"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="rate_limit",
+            field=models.CharField(
+                blank=True,
+                help_text="Max start rate shared by all workers for this task name, e.g. '50/s'",
+                max_length=32,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-19 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0005_rate_limit"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConcurrencyLock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="concurrency_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Key the concurrency limit is counted per, e.g. a tenant ID",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="concurrency_limit",
+            field=models.IntegerField(
+                blank=True,
+                help_text="Max tasks with this name and concurrency key running at once",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["name", "status"], name="django_asyn_name_70e1e7_idx"
+            ),
+        ),
+    ]
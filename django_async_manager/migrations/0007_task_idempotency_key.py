@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-19 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0006_concurrency_limit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="idempotency_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Only one pending or in-progress task may hold a given key",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="task",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ["pending", "in_progress"])),
+                fields=("idempotency_key",),
+                name="unique_active_idempotency_key",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-19 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0007_task_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="debounce_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Repeated enqueues with this key are folded into one pending task",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="task",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "pending")),
+                fields=("debounce_key",),
+                name="unique_pending_debounce_key",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-19 01:14
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0008_task_debounce_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("value", models.JSONField(help_text="Cached task result")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="cache_ttl",
+            field=models.IntegerField(
+                blank=True,
+                help_text="Seconds to cache the result for identical invocations (None disables)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0009_task_result_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="cpu_time_ms",
+            field=models.FloatField(
+                blank=True, help_text="CPU time used by the task function", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="exec_ms",
+            field=models.FloatField(
+                blank=True, help_text="Run time of the task function", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="overhead_ms",
+            field=models.FloatField(
+                blank=True,
+                help_text="Worker time spent claiming the task and handing it to the executor",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="peak_rss_mb",
+            field=models.FloatField(
+                blank=True,
+                help_text="Highest resident memory observed while the function ran",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="queue_wait_ms",
+            field=models.FloatField(
+                blank=True,
+                help_text="Time between the task becoming ready and being claimed",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the last attempt finished, successfully or not",
+                null=True,
+            ),
+        ),
+    ]
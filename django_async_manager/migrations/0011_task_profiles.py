@@ -0,0 +1,119 @@
+# Generated by Django 4.2 on 2026-10-19 01:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0010_task_timings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfilingRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "task_name",
+                    models.CharField(
+                        help_text="Task name, or '*' for all tasks",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "sample_rate",
+                    models.FloatField(
+                        help_text="Fraction of executions to profile; overrides profile_sample_rate"
+                    ),
+                ),
+                ("modes", models.CharField(default="cprofile", max_length=64)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="profile_sample_rate",
+            field=models.FloatField(
+                blank=True,
+                help_text="Fraction of executions run under the profiler (None disables)",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="TaskProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(db_index=True, max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        help_text="Status of the task after the profiled attempt",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                (
+                    "duration_ms",
+                    models.FloatField(help_text="Run time of the profiled call"),
+                ),
+                (
+                    "modes",
+                    models.CharField(
+                        help_text="Profilers used, e.g. 'cprofile,tracemalloc'",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "pstats",
+                    models.BinaryField(
+                        help_text="zlib-compressed marshal dump of the cProfile stats",
+                        null=True,
+                    ),
+                ),
+                (
+                    "allocations",
+                    models.BinaryField(
+                        help_text="zlib-compressed JSON list of the top allocations",
+                        null=True,
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="profiles",
+                        to="django_async_manager.task",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-19 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0011_task_profiles"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="crontabschedule",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="periodictask",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                help_text="Last change made with save(); the scheduler syncs edits by it.",
+            ),
+        ),
+    ]
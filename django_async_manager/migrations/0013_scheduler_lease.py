@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-19 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0012_schedule_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchedulerLease",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                (
+                    "holder",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Scheduler holding the lease (host:pid:id), empty once released",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "token",
+                    models.PositiveBigIntegerField(
+                        default=0,
+                        help_text="Fencing token, incremented on every takeover",
+                    ),
+                ),
+                ("acquired_at", models.DateTimeField(blank=True, null=True)),
+                ("renewed_at", models.DateTimeField(blank=True, null=True)),
+                ("expires_at", models.DateTimeField()),
+            ],
+        ),
+    ]
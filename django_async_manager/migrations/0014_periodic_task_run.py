@@ -0,0 +1,66 @@
+# Generated by Django 4.2 on 2026-10-19 01:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0013_scheduler_lease"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PeriodicTaskRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scheduled_for",
+                    models.DateTimeField(
+                        help_text="Time the run was due according to the schedule"
+                    ),
+                ),
+                (
+                    "enqueued_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "periodic_task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="runs",
+                        to="django_async_manager.periodictask",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="periodic_runs",
+                        to="django_async_manager.task",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-scheduled_for"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="periodictaskrun",
+            constraint=models.UniqueConstraint(
+                fields=("periodic_task", "scheduled_for"),
+                name="unique_periodic_task_run",
+            ),
+        ),
+    ]
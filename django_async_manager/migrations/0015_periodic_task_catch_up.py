@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-19 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0014_periodic_task_run"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="periodictask",
+            name="catch_up",
+            field=models.CharField(
+                choices=[
+                    ("skip", "Skip missed runs"),
+                    ("run_once", "Run once for all missed runs"),
+                    ("run_all", "Run every missed run, up to max_catch_up_runs"),
+                ],
+                default="run_once",
+                help_text="What to do about runs missed while no scheduler was running.",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="periodictask",
+            name="max_catch_up_runs",
+            field=models.PositiveIntegerField(
+                default=100,
+                help_text="With run_all, the most recent missed runs enqueued at most.",
+            ),
+        ),
+    ]
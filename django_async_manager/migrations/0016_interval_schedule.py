@@ -0,0 +1,92 @@
+# Generated by Django 4.2 on 2026-10-19 02:02
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0015_periodic_task_catch_up"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IntervalSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "every",
+                    models.PositiveIntegerField(
+                        help_text="Number of periods between runs",
+                        validators=[django.core.validators.MinValueValidator(1)],
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[
+                            ("milliseconds", "Milliseconds"),
+                            ("seconds", "Seconds"),
+                            ("minutes", "Minutes"),
+                            ("hours", "Hours"),
+                            ("days", "Days"),
+                        ],
+                        default="seconds",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "anchor",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Runs fall on anchor + n * interval (default: the Unix epoch)",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="periodictask",
+            name="crontab",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="periodic_tasks",
+                to="django_async_manager.crontabschedule",
+            ),
+        ),
+        migrations.AddField(
+            model_name="periodictask",
+            name="interval",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Set instead of crontab for sub-minute or fixed-rate schedules.",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="periodic_tasks",
+                to="django_async_manager.intervalschedule",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="periodictask",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(("crontab__isnull", False), ("interval__isnull", True)),
+                    models.Q(("crontab__isnull", True), ("interval__isnull", False)),
+                    _connector="OR",
+                ),
+                name="periodic_task_has_one_schedule",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-19 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0016_interval_schedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="periodictask",
+            name="jitter",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Window in seconds within which every run is delayed by a fixed offset.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="periodictask",
+            name="spread",
+            field=models.BooleanField(
+                default=False,
+                help_text="Space tasks sharing this schedule and jitter evenly across the window.",
+            ),
+        ),
+    ]
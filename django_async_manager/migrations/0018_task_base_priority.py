@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_async_manager", "0017_periodic_task_jitter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="base_priority",
+            field=models.IntegerField(
+                blank=True,
+                help_text="Priority before aging raised it; restored when the task is claimed",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,13 +1,45 @@
 import datetime
 from datetime import timedelta
+import hashlib
 import uuid
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Optional
 
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils.timezone import now
 
 TASK_REGISTRY: Dict[str, Callable[..., Any]] = {}
 
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+TIMING_FIELDS = (
+    "queue_wait_ms",
+    "exec_ms",
+    "overhead_ms",
+    "peak_rss_mb",
+    "cpu_time_ms",
+)
+
+
+class TaskQuerySet(models.QuerySet):
+    def timing_rollup(self):
+        """
+        Aggregate the timing breakdown of the last attempt per task name:
+        one row per name with the number of timed tasks and the average and
+        maximum of every timing field.
+        """
+        aggregates = {"timed_tasks": models.Count("exec_ms")}
+        for field in TIMING_FIELDS:
+            aggregates[f"avg_{field}"] = models.Avg(field)
+            aggregates[f"max_{field}"] = models.Max(field)
+        return (
+            self.exclude(exec_ms__isnull=True, queue_wait_ms__isnull=True)
+            .values("name")
+            .annotate(**aggregates)
+            .order_by("name")
+        )
+
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -18,6 +50,8 @@ class Task(models.Model):
         ("canceled", "Canceled"),
     ]
 
+    ACTIVE_STATUSES = ("pending", "in_progress")
+
     PRIORITY_MAPPING = {
         "low": 1,
         "medium": 2,
@@ -37,7 +71,11 @@ class Task(models.Model):
         null=True, blank=True, help_text="Task will run at this time"
     )
     started_at = models.DateTimeField(null=True, blank=True)
-    completed_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the last attempt finished, successfully or not",
+    )
     timeout = models.IntegerField(
         default=300, help_text="Max execution time in seconds"
     )
@@ -86,6 +124,78 @@ class Task(models.Model):
         default=2.0,
         help_text="Multiplier for exponential increase in delay",
     )
+    aged_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last time the priority was raised by priority aging",
+    )
+    base_priority = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="Priority before aging raised it; restored when the task is claimed",
+    )
+    rate_limit = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        help_text="Max start rate shared by all workers for this task name, e.g. '50/s'",
+    )
+    concurrency_limit = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="Max tasks with this name and concurrency key running at once",
+    )
+    concurrency_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Key the concurrency limit is counted per, e.g. a tenant ID",
+    )
+    idempotency_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Only one pending or in-progress task may hold a given key",
+    )
+    debounce_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="Repeated enqueues with this key are folded into one pending task",
+    )
+    cache_ttl = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="Seconds to cache the result for identical invocations (None disables)",
+    )
+    queue_wait_ms = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Time between the task becoming ready and being claimed",
+    )
+    exec_ms = models.FloatField(
+        null=True, blank=True, help_text="Run time of the task function"
+    )
+    overhead_ms = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Worker time spent claiming the task and handing it to the executor",
+    )
+    peak_rss_mb = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Highest resident memory observed while the function ran",
+    )
+    cpu_time_ms = models.FloatField(
+        null=True, blank=True, help_text="CPU time used by the task function"
+    )
+    profile_sample_rate = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Fraction of executions run under the profiler (None disables)",
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         app_label = "django_async_manager"
@@ -94,6 +204,19 @@ class Task(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
             models.Index(fields=["queue"]),
+            models.Index(fields=["name", "status"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idempotency_key"],
+                condition=models.Q(status__in=["pending", "in_progress"]),
+                name="unique_active_idempotency_key",
+            ),
+            models.UniqueConstraint(
+                fields=["debounce_key"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_debounce_key",
+            ),
         ]
 
     def __str__(self):
@@ -106,12 +229,19 @@ class Task(models.Model):
             return not self.dependencies.exclude(status="completed").exists()
         return True
 
-    def mark_as_failed(self, error_message):
+    def _apply_timings(self, timings: Optional[Dict[str, float]]) -> None:
+        """Store the timing breakdown of the attempt that just finished."""
+        self.completed_at = now()
+        for field in TIMING_FIELDS:
+            setattr(self, field, (timings or {}).get(field))
+
+    def mark_as_failed(self, error_message, timings=None):
         """Mark error and increment attempt counter (without autoretry)"""
         from django_async_manager.utils import with_database_lock_handling
 
         @with_database_lock_handling(logger_name="django_async_manager.worker")
         def _mark_as_failed_inner():
+            self._apply_timings(timings)
             self.attempts += 1
             if len(self.last_errors) >= 5:
                 self.last_errors.pop(0)
@@ -121,14 +251,14 @@ class Task(models.Model):
 
         _mark_as_failed_inner()
 
-    def mark_as_completed(self):
+    def mark_as_completed(self, timings=None):
         """Mark a task as completed and update timestamps"""
         from django_async_manager.utils import with_database_lock_handling
 
         @with_database_lock_handling(logger_name="django_async_manager.worker")
         def _mark_as_completed_inner():
             self.status = "completed"
-            self.completed_at = now()
+            self._apply_timings(timings)
             self.save()
 
         _mark_as_completed_inner()
@@ -137,12 +267,13 @@ class Task(models.Model):
         """Check if task can be retried"""
         return self.attempts < self.max_retries
 
-    def schedule_retry(self, error_message: str) -> None:
+    def schedule_retry(self, error_message: str, timings=None) -> None:
         """Planning to retry a task using exponential backoff."""
         from django_async_manager.utils import with_database_lock_handling
 
         @with_database_lock_handling(logger_name="django_async_manager.worker")
         def _schedule_retry_inner():
+            self._apply_timings(timings)
             self.attempts += 1
             if len(self.last_errors) >= 5:
                 self.last_errors.pop(0)
@@ -159,6 +290,146 @@ class Task(models.Model):
 
         _schedule_retry_inner()
 
+    def return_to_queue(self) -> None:
+        """
+        Put a claimed task back to pending without using up an attempt,
+        e.g. when its worker shuts down before it could finish.
+        """
+        from django_async_manager.utils import with_database_lock_handling
+
+        @with_database_lock_handling(logger_name="django_async_manager.worker")
+        def _return_to_queue_inner():
+            Task.objects.filter(pk=self.pk, status="in_progress").update(
+                status="pending",
+                started_at=None,
+                attempts=models.F("attempts") - 1,
+            )
+
+        _return_to_queue_inner()
+        self.refresh_from_db()
+
+
+class RateLimitBucket(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField(help_text="Tokens currently available in the bucket")
+    updated_at = models.DateTimeField(help_text="Time the tokens were last refilled")
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return f"{self.key} ({self.tokens:.2f} tokens)"
+
+
+class ConcurrencyLock(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return self.key
+
+
+class TaskResult(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    value = models.JSONField(help_text="Cached task result")
+    created_at = models.DateTimeField(default=now, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return f"{self.key} (expires {self.expires_at})"
+
+
+class TaskProfile(models.Model):
+    task = models.ForeignKey(
+        Task,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="profiles",
+    )
+    task_name = models.CharField(max_length=255, db_index=True)
+    status = models.CharField(
+        max_length=20, help_text="Status of the task after the profiled attempt"
+    )
+    created_at = models.DateTimeField(default=now, db_index=True)
+    duration_ms = models.FloatField(help_text="Run time of the profiled call")
+    modes = models.CharField(
+        max_length=64, help_text="Profilers used, e.g. 'cprofile,tracemalloc'"
+    )
+    pstats = models.BinaryField(
+        null=True, help_text="zlib-compressed marshal dump of the cProfile stats"
+    )
+    allocations = models.BinaryField(
+        null=True, help_text="zlib-compressed JSON list of the top allocations"
+    )
+
+    class Meta:
+        app_label = "django_async_manager"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.task_name} profile ({self.created_at:%Y-%m-%d %H:%M:%S})"
+
+    def get_stats(self, stream=None):
+        """Return the cProfile data as a pstats.Stats object, or None."""
+        from django_async_manager.profiling import load_stats
+
+        if self.pstats is None:
+            return None
+        return load_stats(bytes(self.pstats), stream=stream)
+
+    def get_allocations(self):
+        """Return the top allocations as a list of dicts (file, line, size_kb, count)."""
+        from django_async_manager.profiling import load_allocations
+
+        if self.allocations is None:
+            return []
+        return load_allocations(bytes(self.allocations))
+
+
+class ProfilingRule(models.Model):
+    task_name = models.CharField(
+        max_length=255, unique=True, help_text="Task name, or '*' for all tasks"
+    )
+    sample_rate = models.FloatField(
+        help_text="Fraction of executions to profile; overrides profile_sample_rate"
+    )
+    modes = models.CharField(max_length=64, default="cprofile")
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return f"{self.task_name}: {self.sample_rate:.2%} ({self.modes})"
+
+
+class SchedulerLease(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    holder = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Scheduler holding the lease (host:pid:id), empty once released",
+    )
+    token = models.PositiveBigIntegerField(
+        default=0, help_text="Fencing token, incremented on every takeover"
+    )
+    acquired_at = models.DateTimeField(null=True, blank=True)
+    renewed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return f"{self.name}: {self.holder or 'released'} (token {self.token})"
+
 
 class CrontabSchedule(models.Model):
     minute = models.CharField(
@@ -178,24 +449,118 @@ class CrontabSchedule(models.Model):
         default="*",
         help_text="Month of year field, e.g. '*' or '1,6,12'",
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         app_label = "django_async_manager"
 
     def __str__(self):
+        return self.expression
+
+    @property
+    def expression(self) -> str:
         return f"{self.minute} {self.hour} {self.day_of_month} {self.month_of_year} {self.day_of_week}"
 
     def get_next_run_time(self, base_time=None):
         if base_time is None:
             base_time = now()
-        from croniter import croniter
+        from django_async_manager.cron import next_fire_time
+
+        return next_fire_time(self.expression, base_time)
+
+    def get_run_times_between(self, after, until, limit):
+        """The latest `limit` run times in (after, until), oldest first."""
+        from django_async_manager.cron import fire_times_between
+
+        return fire_times_between(self.expression, after, until, limit)
+
 
-        schedule = f"{self.minute} {self.hour} {self.day_of_month} {self.month_of_year} {self.day_of_week}"
-        iter = croniter(schedule, base_time)
-        return iter.get_next(datetime.datetime)
+# Shortest interval the scheduler can keep: it wakes up at most this often
+# and runs everything due within the same window in one tick.
+MIN_INTERVAL = timedelta(milliseconds=100)
+
+
+class IntervalSchedule(models.Model):
+    PERIOD_CHOICES = [
+        ("milliseconds", "Milliseconds"),
+        ("seconds", "Seconds"),
+        ("minutes", "Minutes"),
+        ("hours", "Hours"),
+        ("days", "Days"),
+    ]
+
+    every = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)], help_text="Number of periods between runs"
+    )
+    period = models.CharField(max_length=16, choices=PERIOD_CHOICES, default="seconds")
+    anchor = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Runs fall on anchor + n * interval (default: the Unix epoch)",
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        app_label = "django_async_manager"
+
+    def __str__(self):
+        return self.expression
+
+    @property
+    def expression(self) -> str:
+        expression = f"every {self.every} {self.period}"
+        if self.anchor is not None:
+            expression += f" from {self.anchor.isoformat()}"
+        return expression
+
+    @property
+    def interval(self) -> datetime.timedelta:
+        return datetime.timedelta(**{self.period: self.every})
+
+    def clean(self):
+        if self.every and self.interval < MIN_INTERVAL:
+            raise ValidationError(
+                f"Interval {self.expression} is shorter than the scheduler's "
+                f"minimum of {MIN_INTERVAL // timedelta(milliseconds=1)} milliseconds."
+            )
+
+    def _steps(self):
+        """Anchor and interval in whole microseconds."""
+        step = self.interval // datetime.timedelta(microseconds=1)
+        if step <= 0:
+            raise ValueError(f"Invalid interval: {self.expression}")
+        return self.anchor or EPOCH, step
+
+    def get_next_run_time(self, base_time=None):
+        """
+        First run after base_time. Runs are counted from the anchor rather
+        than from the previous run, so late ticks never shift later runs.
+        """
+        if base_time is None:
+            base_time = now()
+        anchor, step = self._steps()
+        elapsed = (base_time - anchor) // datetime.timedelta(microseconds=1)
+        return anchor + datetime.timedelta(microseconds=(elapsed // step + 1) * step)
+
+    def get_run_times_between(self, after, until, limit):
+        """The latest `limit` run times in (after, until), oldest first."""
+        anchor, step = self._steps()
+        microsecond = datetime.timedelta(microseconds=1)
+        first = (after - anchor) // microsecond // step + 1
+        last = ((until - anchor) // microsecond - 1) // step
+        return [
+            anchor + datetime.timedelta(microseconds=n * step)
+            for n in range(max(first, last - limit + 1), last + 1)
+        ]
 
 
 class PeriodicTask(models.Model):
+    CATCH_UP_CHOICES = [
+        ("skip", "Skip missed runs"),
+        ("run_once", "Run once for all missed runs"),
+        ("run_all", "Run every missed run, up to max_catch_up_runs"),
+    ]
+
     name = models.CharField(
         max_length=255, unique=True, help_text="Unique name for the periodic task."
     )
@@ -209,21 +574,111 @@ class PeriodicTask(models.Model):
         default=dict, help_text="Dictionary of keyword arguments for the task."
     )
     crontab = models.ForeignKey(
-        CrontabSchedule, on_delete=models.CASCADE, related_name="periodic_tasks"
+        CrontabSchedule,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="periodic_tasks",
+    )
+    interval = models.ForeignKey(
+        IntervalSchedule,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="periodic_tasks",
+        help_text="Set instead of crontab for sub-minute or fixed-rate schedules.",
     )
     enabled = models.BooleanField(default=True)
     last_run_at = models.DateTimeField(null=True, blank=True)
     total_run_count = models.PositiveIntegerField(default=0)
+    catch_up = models.CharField(
+        max_length=16,
+        choices=CATCH_UP_CHOICES,
+        default="run_once",
+        help_text="What to do about runs missed while no scheduler was running.",
+    )
+    max_catch_up_runs = models.PositiveIntegerField(
+        default=100,
+        help_text="With run_all, the most recent missed runs enqueued at most.",
+    )
+    jitter = models.PositiveIntegerField(
+        default=0,
+        help_text="Window in seconds within which every run is delayed by a fixed offset.",
+    )
+    spread = models.BooleanField(
+        default=False,
+        help_text="Space tasks sharing this schedule and jitter evenly across the window.",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="Last change made with save(); the scheduler syncs edits by it.",
+    )
 
     class Meta:
         app_label = "django_async_manager"
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(crontab__isnull=False, interval__isnull=True)
+                | models.Q(crontab__isnull=True, interval__isnull=False),
+                name="periodic_task_has_one_schedule",
+            ),
+        ]
+
+    @property
+    def schedule(self):
+        """The task's CrontabSchedule or IntervalSchedule."""
+        if self.crontab_id is not None:
+            return self.crontab
+        return self.interval
+
+    def jitter_offset(self) -> datetime.timedelta:
+        """
+        Delay in [0, jitter) seconds added to every run, derived from the
+        task's name so that it is the same on every scheduler replica.
+        """
+        if not self.jitter:
+            return timedelta(0)
+        digest = hashlib.sha256(self.name.encode()).digest()
+        milliseconds = int.from_bytes(digest[:8], "big") % (self.jitter * 1000)
+        return timedelta(milliseconds=milliseconds)
 
     def get_next_run_at(self):
         if self.last_run_at:
             base_time = self.last_run_at
         else:
             base_time = now() - datetime.timedelta(microseconds=1)
-        return self.crontab.get_next_run_time(base_time)
+        return self.schedule.get_next_run_time(base_time)
 
     def __str__(self):
         return self.name
+
+
+class PeriodicTaskRun(models.Model):
+    periodic_task = models.ForeignKey(
+        PeriodicTask, on_delete=models.CASCADE, related_name="runs"
+    )
+    scheduled_for = models.DateTimeField(
+        help_text="Time the run was due according to the schedule"
+    )
+    enqueued_at = models.DateTimeField(default=now)
+    task = models.ForeignKey(
+        Task,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="periodic_runs",
+    )
+
+    class Meta:
+        app_label = "django_async_manager"
+        ordering = ["-scheduled_for"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["periodic_task", "scheduled_for"],
+                name="unique_periodic_task_run",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.periodic_task_id} run for {self.scheduled_for}"
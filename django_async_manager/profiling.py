@@ -0,0 +1,188 @@
+import cProfile
+import json
+import logging
+import marshal
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.timezone import now
+
+logger = logging.getLogger("django_async_manager.worker")
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# Seconds a worker reuses the ProfilingRule rows it loaded
+RULES_REFRESH_INTERVAL = 30.0
+
+_rules_lock = threading.Lock()
+_rules: Dict[str, Tuple[float, Tuple[str, ...]]] = {}
+_rules_loaded_at: Optional[float] = None
+
+
+def parse_modes(modes) -> Tuple[str, ...]:
+    """Normalize "cprofile,tracemalloc" or a sequence of modes to a tuple."""
+    if isinstance(modes, str):
+        modes = modes.split(",")
+    parsed = tuple(mode.strip() for mode in modes if mode.strip())
+    invalid = [mode for mode in parsed if mode not in PROFILE_MODES]
+    if invalid or not parsed:
+        raise ValueError(
+            f"Invalid profile modes: {modes!r}. Use any of: {', '.join(PROFILE_MODES)}"
+        )
+    return parsed
+
+
+def _active_rules() -> Dict[str, Tuple[float, Tuple[str, ...]]]:
+    global _rules, _rules_loaded_at
+
+    current = time.monotonic()
+    with _rules_lock:
+        if (
+            _rules_loaded_at is not None
+            and current - _rules_loaded_at < RULES_REFRESH_INTERVAL
+        ):
+            return _rules
+
+    from django_async_manager.models import ProfilingRule
+
+    rules = {}
+    try:
+        active = list(
+            ProfilingRule.objects.filter(
+                Q(expires_at__isnull=True) | Q(expires_at__gt=now())
+            )
+        )
+    except Exception as e:
+        logger.error(f"Could not load profiling rules: {e}")
+        active = []
+    for rule in active:
+        try:
+            rules[rule.task_name] = (rule.sample_rate, parse_modes(rule.modes))
+        except ValueError as e:
+            logger.error(f"Ignoring profiling rule for {rule.task_name}: {e}")
+    with _rules_lock:
+        _rules, _rules_loaded_at = rules, current
+    return rules
+
+
+def clear_rules_cache() -> None:
+    """Make the next profile_modes_for() call reload the profiling rules."""
+    global _rules_loaded_at
+
+    with _rules_lock:
+        _rules_loaded_at = None
+
+
+def profile_modes_for(task) -> Optional[Tuple[str, ...]]:
+    """
+    Decide whether this execution of a task is profiled. ProfilingRule rows
+    (set with the task_profiles command) take precedence over the task's
+    profile_sample_rate. Returns the profilers to use, or None.
+    """
+    rules = _active_rules()
+    rule = rules.get(task.name) or rules.get("*")
+    if rule is not None:
+        sample_rate, modes = rule
+    else:
+        sample_rate = task.profile_sample_rate
+        modes = parse_modes(
+            getattr(settings, "ASYNC_MANAGER_PROFILE_MODES", ("cprofile",))
+        )
+    if not sample_rate or random.random() >= sample_rate:
+        return None
+    return modes
+
+
+class TaskProfiler:
+    """
+    Runs cProfile and/or tracemalloc around a single call in the process
+    executing the task. stop() returns a compressed, picklable payload.
+    """
+
+    def __init__(self, modes: Sequence[str], top_allocations: int = 25):
+        self.modes = tuple(modes)
+        self.top_allocations = top_allocations
+        self._profile = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        if "tracemalloc" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if "cprofile" in self.modes:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # Only one profiler can be active per interpreter, e.g. when
+                # several threads of a worker are sampled at the same time.
+                logger.warning(f"Skipping cProfile for this execution: {e}")
+            else:
+                self._profile = profile
+
+    def stop(self) -> Dict[str, Any]:
+        payload = {"modes": ",".join(self.modes), "pstats": None, "allocations": None}
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.create_stats()
+            payload["pstats"] = zlib.compress(marshal.dumps(self._profile.stats))
+        if "tracemalloc" in self.modes and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            allocations = [
+                {
+                    "file": stat.traceback[0].filename,
+                    "line": stat.traceback[0].lineno,
+                    "size_kb": stat.size / 1024,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[: self.top_allocations]
+            ]
+            payload["allocations"] = zlib.compress(json.dumps(allocations).encode())
+        return payload
+
+
+class _LoadedProfile:
+    """Adapter letting pstats.Stats load an unmarshalled stats dict."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def load_stats(data: bytes, stream=None) -> pstats.Stats:
+    return pstats.Stats(
+        _LoadedProfile(marshal.loads(zlib.decompress(data))), stream=stream
+    )
+
+
+def load_allocations(data: bytes) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(data).decode())
+
+
+def save_profile(task, payload: Dict[str, Any], duration_ms: Optional[float]) -> None:
+    """Store the profile of a task execution. Errors are logged, never raised."""
+    from django_async_manager.models import TaskProfile
+
+    try:
+        TaskProfile.objects.create(
+            task=task,
+            task_name=task.name,
+            status=task.status,
+            duration_ms=duration_ms or 0.0,
+            modes=payload["modes"],
+            pstats=payload["pstats"],
+            allocations=payload["allocations"],
+        )
+    except Exception as e:
+        logger.error(f"Could not store profile of task {task.id} ({task.name}): {e}")
@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from django_async_manager.metrics import RESULT_CACHE_HITS, RESULT_CACHE_MISSES
+
+DEFAULT_RESULT_CACHE = {
+    "BACKEND": "django_async_manager.result_cache.DatabaseResultCache",
+    "OPTIONS": {},
+}
+
+
+class BaseResultCache:
+    """
+    Store for results of tasks decorated with cache_ttl.
+
+    Subclasses implement _get() and set(); get() wraps _get() to keep the
+    hit/miss counters of this instance and the result cache metrics, which
+    are shared by all backends and workers, up to date.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (True, result) on a cache hit and (False, None) on a miss."""
+        hit, value = self._get(key)
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metric = RESULT_CACHE_HITS if hit else RESULT_CACHE_MISSES
+        metric.inc(backend=type(self).__name__)
+        return hit, value
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class LocMemResultCache(BaseResultCache):
+    """Per-process LRU cache. Cheapest, but not shared between workers."""
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__(max_entries=max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DjangoCacheResultCache(BaseResultCache):
+    """Stores results in a Django cache; eviction is left to the cache backend."""
+
+    def __init__(self, alias: str = "default", key_prefix: str = "task-result:"):
+        super().__init__(max_entries=0)
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        entry = self.cache.get(self.key_prefix + key)
+        if entry is None:
+            return False, None
+        return True, entry["value"]
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.cache.set(self.key_prefix + key, {"value": value}, timeout=ttl)
+
+
+class DatabaseResultCache(BaseResultCache):
+    """
+    Stores results in the TaskResult table, shared by all workers.
+    Results must be JSON serializable. Expired rows are purged, and the
+    oldest rows evicted past max_entries, every `cleanup_every` writes.
+    """
+
+    def __init__(self, max_entries: int = 10000, cleanup_every: int = 100):
+        super().__init__(max_entries=max_entries)
+        self.cleanup_every = cleanup_every
+        self._writes = 0
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        from django_async_manager.models import TaskResult
+
+        entry = (
+            TaskResult.objects.filter(key=key, expires_at__gt=now())
+            .values_list("value", flat=True)
+            .first()
+        )
+        if entry is None:
+            return False, None
+        return True, entry["value"]
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        from django_async_manager.models import TaskResult
+
+        json.dumps(value)
+        current_time = now()
+        TaskResult.objects.update_or_create(
+            key=key,
+            defaults={
+                "value": {"value": value},
+                "created_at": current_time,
+                "expires_at": current_time + timedelta(seconds=ttl),
+            },
+        )
+        self._writes += 1
+        if self._writes % self.cleanup_every == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete expired results and the oldest ones beyond max_entries."""
+        from django_async_manager.models import TaskResult
+
+        TaskResult.objects.filter(expires_at__lte=now()).delete()
+        stale = TaskResult.objects.order_by("-created_at").values_list(
+            "created_at", flat=True
+        )[self.max_entries : self.max_entries + 1]
+        for cutoff in stale:
+            TaskResult.objects.filter(created_at__lte=cutoff).delete()
+
+
+@lru_cache(maxsize=None)
+def _load_result_cache(config: str) -> BaseResultCache:
+    config = json.loads(config)
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def get_result_cache() -> BaseResultCache:
+    """Return the result cache configured by ASYNC_MANAGER_RESULT_CACHE."""
+    config = getattr(settings, "ASYNC_MANAGER_RESULT_CACHE", DEFAULT_RESULT_CACHE)
+    return _load_result_cache(json.dumps(config, sort_keys=True))
@@ -1,134 +1,433 @@
+import heapq
 import importlib
-import time
+import itertools
+import threading
 import logging
+import time
+from collections import Counter, defaultdict
 from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.timezone import now
-from django.db.models import F
-from django_async_manager.models import PeriodicTask, Task
+from django_async_manager.lease import Lease, LeaseLost
+from django_async_manager.metrics import PERIODIC_TASKS_ENQUEUED, SCHEDULER_TICK_LAG
+from django_async_manager.models import (
+    CrontabSchedule,
+    IntervalSchedule,
+    MIN_INTERVAL,
+    PeriodicTask,
+    PeriodicTaskRun,
+    Task,
+)
+from django_async_manager.utils import with_database_lock_handling
 
 logger = logging.getLogger("django_async_manager.scheduler")
 
+# Everything the scheduler reads from a PeriodicTask and its schedule; loading
+# any other field would cost one extra query per task.
+SCHEDULE_FIELDS = (
+    "id",
+    "name",
+    "task_name",
+    "arguments",
+    "kwargs",
+    "enabled",
+    "last_run_at",
+    "catch_up",
+    "max_catch_up_runs",
+    "jitter",
+    "spread",
+    "updated_at",
+    "crontab__id",
+    "crontab__updated_at",
+    "crontab__minute",
+    "crontab__hour",
+    "crontab__day_of_week",
+    "crontab__day_of_month",
+    "crontab__month_of_year",
+    "interval__id",
+    "interval__updated_at",
+    "interval__every",
+    "interval__period",
+    "interval__anchor",
+)
+
+
+# Changes are fetched from slightly before the newest updated_at already seen,
+# so rows committed late by a long transaction or written by a host with a
+# skewed clock are not missed. Rows fetched again only because of the overlap
+# are recognized by their updated_at and not applied twice.
+SYNC_OVERLAP = timedelta(seconds=10)
+
+# A run due less than this long ago is not treated as missed; the next tick
+# runs it as usual.
+MISSED_RUN_GRACE = timedelta(seconds=60)
+
+# Shortest sleep of the scheduler loop. Entries due within it are run by the
+# current tick rather than after the next wakeup, so interval schedules can't
+# be shorter than it.
+MIN_SLEEP = MIN_INTERVAL.total_seconds()
+DUE_GRACE = MIN_INTERVAL
+
+# How often a sleeping scheduler checks whether a schedule change woke it
+WAKE_POLL_INTERVAL = 0.5
+
+# Set when a PeriodicTask or its schedule is saved or deleted in this
+# process, so run_scheduler_loop() syncs without waiting for its next poll.
+schedule_changed = threading.Event()
+
+
+@receiver(post_save, sender=PeriodicTask)
+@receiver(post_delete, sender=PeriodicTask)
+@receiver(post_save, sender=CrontabSchedule)
+@receiver(post_delete, sender=CrontabSchedule)
+@receiver(post_save, sender=IntervalSchedule)
+@receiver(post_delete, sender=IntervalSchedule)
+def _wake_scheduler(sender, **kwargs):
+    schedule_changed.set()
+
+
+def scheduled_periodic_tasks():
+    """Periodic tasks with their schedules, loaded in a single query."""
+    return PeriodicTask.objects.select_related("crontab", "interval").only(
+        *SCHEDULE_FIELDS
+    )
+
+
+def _version(pt):
+    """What changes whenever a periodic task or its schedule is saved."""
+    return pt.updated_at, pt.schedule.pk, pt.schedule.updated_at
+
+
+def _memoized_next_run(memo, schedule, base_time):
+    """
+    Next run of a crontab or interval schedule after base_time. Periodic tasks
+    often share a schedule and base time (e.g. every task due in the same
+    tick), so the result is computed once per distinct pair within one pass
+    over the schedule.
+    """
+    key = (schedule.expression, base_time)
+    if key not in memo:
+        memo[key] = schedule.get_next_run_time(base_time)
+    return memo[key]
+
 
 class BeatScheduler:
-    def __init__(self, default_interval=30):
+    """
+    Keeps the next run time of every enabled PeriodicTask in memory.
+
+    Entries live in _schedule (pk -> {"task", "next_run", "version"}) and in a
+    min-heap of (next_run, version, pk), so a tick only touches the tasks that
+    are due. Rescheduling or removing an entry does not search the heap: the
+    old heap item is left behind and skipped once its version no longer
+    matches the entry (lazy deletion).
+
+    Each entry fires at its next_run plus a fixed offset from _offsets (see
+    _assign_offsets()), so tasks sharing a schedule do not all become due in
+    the same instant. next_run itself stays the time the schedule names; it is
+    what runs are recorded and counted by.
+
+    task_filter, a Q object, limits the periodic tasks that are scheduled,
+    e.g. to a benchmark's own fixtures.
+    """
+
+    # Rebuild the heap once stale items outnumber live entries by this factor
+    heap_compaction_ratio = 2
+
+    def __init__(self, default_interval=30, check_missed=True, task_filter=None):
+        self.task_filter = task_filter
         self._schedule = {}
+        self._heap = []
+        self._offsets = {}
+        # pk -> _version() of the row last applied to the schedule
+        self._applied = {}
+        self._versions = itertools.count()
+        self._synced_until = None
         self.default_interval = default_interval
         self.update_schedule()
-        self.check_missed_tasks()
+        if check_missed:
+            self.check_missed_tasks()
+
+    def _periodic_tasks(self):
+        periodic_tasks = scheduled_periodic_tasks()
+        if self.task_filter is not None:
+            periodic_tasks = periodic_tasks.filter(self.task_filter)
+        return periodic_tasks
 
     def update_schedule(self):
         """Refresh the schedule from the database with active periodic tasks."""
         logger.debug("Updating schedule from database...")
+        current_time = now()
+        synced_until = current_time
+        applied_versions = {}
+        periodic_tasks = list(self._periodic_tasks().filter(enabled=True))
+        for pt in periodic_tasks:
+            synced_until = max(synced_until, pt.updated_at, pt.schedule.updated_at)
+            applied_versions[pt.id] = _version(pt)
+
+        self._assign_offsets(periodic_tasks)
         active_tasks = {}
-        periodic_tasks = PeriodicTask.objects.filter(enabled=True)
+        memo = {}
         for pt in periodic_tasks:
-            try:
-                pt.refresh_from_db(fields=["last_run_at"])
-                next_run = pt.get_next_run_at()
-                active_tasks[pt.id] = {"task": pt, "next_run": next_run}
-                logger.debug(
-                    "Scheduled task %s (ID: %s), next run at %s (based on last_run_at: %s)",
-                    pt.name,
-                    pt.id,
-                    next_run,
-                    pt.last_run_at,
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to calculate next run time for task {pt.name} (ID: {pt.id}): {e}",
-                    exc_info=True,
-                )
+            next_run = self._next_run(memo, pt, current_time)
+            if next_run is None:
+                continue
+            active_tasks[pt.id] = {"task": pt, "next_run": next_run}
+            logger.debug(
+                "Scheduled task %s (ID: %s), next run at %s (based on last_run_at: %s)",
+                pt.name,
+                pt.id,
+                next_run,
+                pt.last_run_at,
+            )
 
         self._schedule = active_tasks
+        self._applied = applied_versions
+        self._synced_until = synced_until
+        self._rebuild_heap()
         logger.debug("Schedule update complete.")
 
-    def check_missed_tasks(self):
+    def sync_changes(self) -> int:
         """
-        Check for tasks that were scheduled to run in the past but were missed.
-        This can happen if the scheduler was down when the task was due.
+        Apply periodic tasks and schedules changed since the last sync to the
+        in-memory schedule, instead of reloading it. Disabled tasks are removed;
+        deleted ones are found by comparing the number of enabled tasks, which
+        only loads their ids when it differs. Returns the number of changes.
         """
-        logger.info("Checking for missed tasks...")
+        if self._synced_until is None:
+            self.update_schedule()
+            return len(self._schedule)
+
+        since = self._synced_until - SYNC_OVERLAP
+        changed = self._periodic_tasks().filter(
+            Q(updated_at__gte=since)
+            | Q(crontab__updated_at__gte=since)
+            | Q(interval__updated_at__gte=since)
+        )
         current_time = now()
+        updated = {}
+        applied = 0
+        for pt in changed:
+            self._synced_until = max(
+                self._synced_until, pt.updated_at, pt.schedule.updated_at
+            )
+            version = _version(pt)
+            if self._applied.get(pt.id) == version:
+                # Applied by an earlier sync, fetched again for the overlap.
+                # Re-applying it would move a task that never ran to the run
+                # after now.
+                continue
+            self._applied[pt.id] = version
+            applied += 1
+            if pt.enabled:
+                updated[pt.id] = pt
+            else:
+                self.remove(pt.id)
+
+        enabled = PeriodicTask.objects.filter(enabled=True)
+        if self.task_filter is not None:
+            enabled = enabled.filter(self.task_filter)
+        if enabled.count() != len(self._schedule.keys() | updated.keys()):
+            existing = set(enabled.values_list("id", flat=True))
+            for pk in [pk for pk in self._schedule if pk not in existing]:
+                self.remove(pk)
+                self._applied.pop(pk, None)
+                applied += 1
+
+        if not applied:
+            return 0
+
+        # A change can move every other task of a spread group, and the next
+        # runs of the changed tasks depend on their offsets.
+        tasks = {pk: entry["task"] for pk, entry in self._schedule.items()}
+        tasks.update(updated)
+        self._assign_offsets(tasks.values())
+        memo = {}
+        for pt in updated.values():
+            next_run = self._next_run(memo, pt, current_time)
+            if next_run is None:
+                self.remove(pt.id)
+            else:
+                self._schedule[pt.id] = {"task": pt, "next_run": next_run}
+        self._rebuild_heap()
+        logger.debug(f"Applied {applied} schedule changes.")
+        return applied
 
+    def _next_run(self, memo, pt, current_time):
+        """
+        Next scheduled time of pt after its last run, or after current_time
+        for a task that never ran. Returns None, logging the error, if it
+        cannot be computed.
+
+        last_run_at is when a run was enqueued, which is its scheduled time
+        plus the task's offset (and up to DUE_GRACE less, as runs are popped
+        that much early), so the offset is taken off to continue the schedule
+        from the run it belonged to. A task that never ran keeps a run whose
+        jittered time has not come yet.
+        """
+        offset = self._offset(pt.id)
+        if pt.last_run_at is None:
+            base_time = current_time - offset - timedelta(microseconds=1)
+        else:
+            base_time = pt.last_run_at - offset + DUE_GRACE
         try:
-            periodic_tasks = PeriodicTask.objects.filter(enabled=True)
-            missed_count = 0
-
-            for pt in periodic_tasks:
-                if pt.last_run_at:
-                    next_run_after_last = pt.crontab.get_next_run_time(pt.last_run_at)
-
-                    if next_run_after_last < current_time - timedelta(seconds=60):
-                        logger.info(
-                            f"Found missed task: {pt.name} (ID: {pt.id}). "
-                            f"Should have run at {next_run_after_last}, current time is {current_time}."
-                        )
-                        missed_count += 1
-
-                        try:
-                            if "." in pt.task_name:
-                                module_path, func_name = pt.task_name.rsplit(".", 1)
-                                module = importlib.import_module(module_path)
-                                func = getattr(module, func_name)
-                            else:
-                                from django_async_manager.models import TASK_REGISTRY
-
-                                if pt.task_name in TASK_REGISTRY:
-                                    full_path = TASK_REGISTRY[pt.task_name]
-                                    module_path, func_name = full_path.rsplit(".", 1)
-                                    module = importlib.import_module(module_path)
-                                    func = getattr(module, func_name)
-                                else:
-                                    logger.error(
-                                        f"Task {pt.task_name} not found in registry"
-                                    )
-                                    continue
-                            if hasattr(func, "run_async") and callable(func.run_async):
-                                func.run_async(*pt.arguments, **pt.kwargs)
-                            else:
-                                func(*pt.arguments, **pt.kwargs)
-                                Task.objects.create(
-                                    name=pt.task_name,
-                                    arguments={
-                                        "args": pt.arguments,
-                                        "kwargs": pt.kwargs,
-                                    },
-                                    status="pending",
-                                )
-                            logger.info(
-                                f"Enqueued missed task: {pt.name} (ID: {pt.id})"
-                            )
-
-                            from django_async_manager.utils import (
-                                with_database_lock_handling,
-                            )
-
-                            @with_database_lock_handling(
-                                logger_name="django_async_manager.scheduler"
-                            )
-                            def _update_last_run():
-                                PeriodicTask.objects.filter(pk=pt.pk).update(
-                                    last_run_at=current_time,
-                                    total_run_count=F("total_run_count") + 1,
-                                )
-
-                            _update_last_run()
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to enqueue missed task {pt.name} (ID: {pt.id}): {e}",
-                                exc_info=True,
-                            )
+            return _memoized_next_run(memo, pt.schedule, base_time)
+        except Exception as e:
+            logger.error(
+                f"Failed to calculate next run time for task {pt.name} (ID: {pt.id}): {e}",
+                exc_info=True,
+            )
+            return None
 
-            if missed_count > 0:
-                logger.info(f"Found and processed {missed_count} missed tasks.")
+    def _assign_offsets(self, periodic_tasks) -> None:
+        """
+        Compute the offset every task fires at after its next_run. Tasks with
+        spread share their jitter window evenly with the other spread tasks of
+        the same schedule and window, in order of name; all others get the
+        hash-based PeriodicTask.jitter_offset(). Both only depend on the
+        periodic tasks, so every scheduler replica fires at the same times.
+        """
+        offsets = {}
+        groups = defaultdict(list)
+        for pt in periodic_tasks:
+            if pt.spread and pt.jitter:
+                groups[(pt.schedule.expression, pt.jitter)].append(pt)
             else:
-                logger.info("No missed tasks found.")
+                offsets[pt.id] = pt.jitter_offset()
+        for (_, window), members in groups.items():
+            members.sort(key=lambda pt: pt.name)
+            step = timedelta(seconds=window) / len(members)
+            for position, pt in enumerate(members):
+                offsets[pt.id] = step * position
+        self._offsets = offsets
+
+    def _offset(self, pk) -> timedelta:
+        return self._offsets.get(pk, timedelta(0))
+
+    def _rebuild_heap(self) -> None:
+        self._heap = []
+        for pk, entry in self._schedule.items():
+            entry["version"] = next(self._versions)
+            self._heap.append(
+                (entry["next_run"] + self._offset(pk), entry["version"], pk)
+            )
+        heapq.heapify(self._heap)
+
+    def set_next_run(self, pk, next_run, task=None) -> None:
+        """Add or reschedule an entry; task defaults to the one already scheduled."""
+        if task is None:
+            task = self._schedule[pk]["task"]
+        version = next(self._versions)
+        self._schedule[pk] = {"task": task, "next_run": next_run, "version": version}
+        heapq.heappush(self._heap, (next_run + self._offset(pk), version, pk))
+        if len(self._heap) > self.heap_compaction_ratio * len(self._schedule) + 64:
+            self._rebuild_heap()
+
+    def remove(self, pk) -> None:
+        """Drop an entry from the schedule; its heap item is discarded lazily."""
+        self._schedule.pop(pk, None)
+
+    def _peek(self):
+        """Return the live heap item that fires first, or None."""
+        while self._heap:
+            next_run, version, pk = self._heap[0]
+            entry = self._schedule.get(pk)
+            if entry is not None and entry["version"] == version:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def check_missed_tasks(self, lease=None):
+        """
+        Catch up on runs missed while no scheduler was running, following each
+        task's catch_up policy:
+
+        - skip: enqueue nothing and continue with the next scheduled run.
+        - run_once: enqueue a single run for the latest missed time.
+        - run_all: enqueue every missed run, at most max_catch_up_runs of the
+          most recent ones.
+
+        The missed runs of all tasks are enqueued together by
+        enqueue_due_tasks(), never executed here. Skipped tasks have their
+        last_run_at moved forward without counting a run, so later syncs do
+        not schedule the skipped runs again. Handled tasks are rescheduled
+        from now in the in-memory schedule.
+        """
+        logger.info("Checking for missed tasks...")
+        current_time = now()
+        memo = {}
+        due_tasks_info = []
+        skipped = []
+        caught_up = []
 
+        try:
+            for pt in self._periodic_tasks().filter(
+                enabled=True, last_run_at__isnull=False
+            ):
+                # Offsets are taken off as in _next_run(); runs whose jittered
+                # time has not come yet are left to tick().
+                offset = self._offset(pt.id)
+                since = pt.last_run_at - offset + DUE_GRACE
+                until = current_time - offset
+                first_missed = _memoized_next_run(memo, pt.schedule, since)
+                if first_missed >= until - MISSED_RUN_GRACE:
+                    continue
+                caught_up.append(pt)
+                if pt.catch_up == "skip":
+                    skipped.append(pt.pk)
+                    logger.info(
+                        f"Skipping missed runs of {pt.name} (ID: {pt.id}) since {first_missed}."
+                    )
+                    continue
+                limit = pt.max_catch_up_runs if pt.catch_up == "run_all" else 1
+                missed = pt.schedule.get_run_times_between(since, until, limit)
+                logger.info(
+                    f"Found missed task: {pt.name} (ID: {pt.id}), missed since "
+                    f"{first_missed}; enqueuing {len(missed)} run(s) ({pt.catch_up})."
+                )
+                due_tasks_info.extend(
+                    {"task": pt, "run_time": current_time, "due_at": due_at}
+                    for due_at in missed
+                )
+
+            enqueued = enqueue_due_tasks(due_tasks_info, lease=lease)
+            if skipped:
+                PeriodicTask.objects.filter(pk__in=skipped).update(
+                    last_run_at=current_time, updated_at=now()
+                )
+        except LeaseLost:
+            raise
         except Exception as e:
             logger.error(f"Error checking for missed tasks: {e}", exc_info=True)
+            return
+
+        for pt in caught_up:
+            if pt.id in self._schedule:
+                until = current_time - self._offset(pt.id)
+                self.set_next_run(pt.id, _memoized_next_run(memo, pt.schedule, until))
+        if caught_up:
+            logger.info(
+                f"Caught up on {len(caught_up)} tasks with missed runs; "
+                f"enqueued {len(enqueued)} run(s)."
+            )
+        else:
+            logger.info("No missed tasks found.")
+
+    def restore(self, due_tasks_info) -> None:
+        """
+        Put runs returned by tick() back into the schedule after enqueuing
+        them failed, so that the next tick returns them again.
+        """
+        for task_info in due_tasks_info:
+            pk = task_info["task"].pk
+            if pk in self._schedule and "due_at" in task_info:
+                self.set_next_run(pk, task_info["due_at"])
 
     def sync_schedule(self):
-        """Synchronize the schedule – update schedule entries."""
+        """Synchronize the schedule – reload every entry from the database."""
         self.update_schedule()
 
     def tick(self):
@@ -137,82 +436,58 @@ class BeatScheduler:
         Returns the time of the next scheduled event and a list of tasks due now.
         IMPORTANT: This method DOES NOT save changes to PeriodicTask back to the DB.
                    It only updates the internal _schedule's next_run time.
+
+        Only due entries are popped from the heap, so a tick costs
+        O(k log n) for k due tasks rather than a scan of the whole schedule.
         """
         current_time = now()
         due_tasks_info = []
-        next_times = []
-
-        logger.debug(f"Tick started at {current_time.isoformat()}")
-
-        schedule_items = list(self._schedule.items())
-
-        for pk, sched in schedule_items:
-            if pk not in self._schedule:
-                logger.warning(
-                    f"Task ID {pk} vanished from schedule during tick. Skipping."
+        rescheduled = []
+        memo = {}
+        horizon = current_time + DUE_GRACE
+
+        while True:
+            item = self._peek()
+            if item is None or item[0] > horizon:
+                break
+            _, _, pk = heapq.heappop(self._heap)
+            pt = self._schedule[pk]["task"]
+            next_run = self._schedule[pk]["next_run"]
+            logger.info(
+                f"  Task {pt.id} ({pt.name}) is DUE (next_run: {next_run}, current_time: {current_time})."
+            )
+            due_tasks_info.append(
+                {
+                    "task": pt,
+                    "run_time": current_time,
+                    "due_at": next_run,
+                    "fires_at": next_run + self._offset(pk),
+                }
+            )
+            try:
+                # Counted from the due time unless the tick is late, so runs
+                # neither drift nor repeat when popped ahead of time.
+                base_time = max(current_time - self._offset(pk), next_run)
+                rescheduled.append(
+                    (pk, pt, _memoized_next_run(memo, pt.schedule, base_time))
                 )
-                try:
-                    pt = PeriodicTask.objects.filter(pk=pk).first()
-                    if pt and pt.enabled:
-                        logger.info(
-                            f"Recovered task {pk} ({pt.name}) after it vanished from schedule."
-                        )
-                        next_run = pt.get_next_run_at()
-                        self._schedule[pk] = {"task": pt, "next_run": next_run}
-                    else:
-                        logger.info(
-                            f"Task {pk} not found in database or is disabled. Permanently removing from schedule."
-                        )
-                        continue
-                except Exception as e:
-                    logger.error(f"Error recovering task {pk}: {e}")
-                    continue
-
-            pt = sched["task"]
-            next_run = sched["next_run"]
-
-            logger.debug(f"Checking task {pt.id} ({pt.name})...")
-            logger.debug(f"current_time: {current_time.isoformat()}")
-            logger.debug(f"next_run: {next_run.isoformat()}")
-
-            grace_period = timedelta(seconds=1)
-            if next_run <= (current_time + grace_period):
-                logger.info(
-                    f"  Task {pt.id} ({pt.name}) is DUE (next_run: {next_run}, current_time: {current_time})."
+            except Exception as e:
+                # Without a next run time the entry would be due on every tick;
+                # it comes back with the next schedule sync.
+                logger.error(
+                    f"    Error calculating next run time for {pt.name}: {e}",
+                    exc_info=True,
                 )
-                due_tasks_info.append({"task": pt, "run_time": current_time})
+                self.remove(pk)
 
-                try:
-                    base_time_for_next_calc = current_time
-                    new_next_run = pt.crontab.get_next_run_time(
-                        base_time=base_time_for_next_calc
-                    )
+        # Pushed only after popping so that an entry whose next run falls
+        # within the grace period is not enqueued twice in one tick.
+        for pk, pt, new_next_run in rescheduled:
+            self.set_next_run(pk, new_next_run, task=pt)
 
-                    if pk in self._schedule:
-                        self._schedule[pk]["next_run"] = new_next_run
-                        logger.debug(
-                            f"    Calculated new next run for {pt.name}: {new_next_run}"
-                        )
-                        next_times.append(new_next_run)
-                    else:
-                        logger.warning(
-                            f"Task ID {pk} vanished before its next run could be updated in memory."
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"    Error calculating next run time for {pt.name}: {e}",
-                        exc_info=True,
-                    )
-                    if pk in self._schedule:
-                        next_times.append(self._schedule[pk]["next_run"])
-
-            else:
-                logger.debug(f"  Task {pt.id} ({pt.name}) is NOT due yet.")
-                next_times.append(next_run)
-
-        if next_times:
-            next_due = min(next_times)
+        item = self._peek()
+        if item is not None:
+            next_due = item[0]
         else:
             next_due = current_time + timedelta(seconds=self.default_interval)
 
@@ -222,67 +497,275 @@ class BeatScheduler:
         return next_due, due_tasks_info
 
 
-def run_scheduler_loop(default_interval=30):
-    """Main loop for the scheduler process."""
-    logger.info("Starting scheduler loop...")
-    scheduler = BeatScheduler(default_interval=default_interval)
-    while True:
-        try:
-            next_due, due_tasks_info = scheduler.tick()
-
+def _sleep(stop_event, seconds: float) -> None:
+    """Sleep until seconds pass, stop_event is set or the schedule changes."""
+    deadline = time.monotonic() + seconds
+    while not stop_event.is_set() and not schedule_changed.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        stop_event.wait(min(remaining, WAKE_POLL_INTERVAL))
+
+
+def _resolve_task_function(task_name):
+    if "." not in task_name:
+        from django_async_manager.models import TASK_REGISTRY
+
+        if task_name not in TASK_REGISTRY:
+            raise LookupError(f"Task {task_name} not found in registry")
+        task_name = TASK_REGISTRY[task_name]
+    module_path, func_name = task_name.rsplit(".", 1)
+    module = importlib.import_module(module_path)
+    return getattr(module, func_name)
+
+
+def _scheduled_for(task_info):
+    """The due time identifying a run, falling back to when it was picked up."""
+    return task_info.get("due_at") or task_info["run_time"]
+
+
+def enqueue_due_tasks(due_tasks_info, lease=None):
+    """
+    Enqueue the periodic tasks due in one tick and record the runs, in a
+    single transaction. With a lease, it only commits while this scheduler
+    still holds it (LeaseLost is raised otherwise).
+
+    Every run is recorded as a PeriodicTaskRun keyed by (periodic task, due
+    time) and inserted together with its task. Runs that are already recorded
+    are skipped, and a run recorded concurrently by another scheduler makes
+    the insert fail and the batch retry without it, so each due time is
+    enqueued at most once.
+
+    Tasks are inserted with one bulk_create() and last_run_at/total_run_count
+    are updated with one UPDATE per distinct run time (one per tick), so the
+    cost barely grows with the number of tasks due at a minute boundary.
+    Decorated tasks whose enqueue depends on existing tasks (idempotency keys,
+    debouncing, dependencies) still go through run_async(). A task that
+    cannot be resolved or is vetoed by a before_enqueue hook is logged and
+    skipped without affecting the others.
+
+    updated_at is bumped along with last_run_at so that standby schedulers
+    follow the runs through sync_changes() and don't repeat them on takeover.
+
+    Returns the task_info dicts of the periodic tasks that were enqueued.
+    Raises OperationalError, having enqueued nothing, if the database stays
+    locked through all retries.
+    """
+
+    if not due_tasks_info:
+        return []
+
+    @with_database_lock_handling(logger_name="django_async_manager.scheduler")
+    def _enqueue():
+        enqueued = []
+        with transaction.atomic():
+            if lease is not None:
+                lease.fence()
+            recorded = set(
+                PeriodicTaskRun.objects.filter(
+                    periodic_task_id__in={info["task"].pk for info in due_tasks_info},
+                    scheduled_for__in={_scheduled_for(info) for info in due_tasks_info},
+                )
+                .order_by()
+                .values_list("periodic_task_id", "scheduled_for")
+            )
+            functions = {}
+            new_tasks = []
+            runs = []
             for task_info in due_tasks_info:
                 pt = task_info["task"]
-                run_time = task_info["run_time"]
+                scheduled_for = _scheduled_for(task_info)
+                if (pt.pk, scheduled_for) in recorded:
+                    logger.info(
+                        f"Skipping periodic task {pt.name} (ID: {pt.id}): its run "
+                        f"for {scheduled_for} was already enqueued."
+                    )
+                    continue
                 try:
-                    module_path, func_name = pt.task_name.rsplit(".", 1)
-                    module = importlib.import_module(module_path)
-                    func = getattr(module, func_name)
-                    if hasattr(func, "run_async"):
-                        func.run_async(*pt.arguments, **pt.kwargs)
-                    else:
-                        Task.objects.create(
+                    if pt.task_name not in functions:
+                        functions[pt.task_name] = _resolve_task_function(pt.task_name)
+                    func = functions[pt.task_name]
+                    task = None
+                    if hasattr(func, "build_task"):
+                        task = func.build_task(*pt.arguments, **pt.kwargs)
+                    elif not hasattr(func, "run_async"):
+                        task = Task(
                             name=pt.task_name,
                             arguments={"args": pt.arguments, "kwargs": pt.kwargs},
                             status="pending",
                         )
-                    logger.info("Enqueued periodic task: %s (ID: %s)", pt.name, pt.id)
-
-                    from django_async_manager.utils import with_database_lock_handling
-
-                    @with_database_lock_handling(
-                        logger_name="django_async_manager.scheduler"
-                    )
-                    def _update_periodic_task():
-                        PeriodicTask.objects.filter(pk=pt.pk).update(
-                            last_run_at=run_time,
-                            total_run_count=F("total_run_count") + 1,
-                        )
-
-                    _update_periodic_task()
-                    logger.debug(
-                        f"Successfully updated last_run_at for PeriodicTask {pt.name} (ID: {pt.id})"
-                    )
+                    if task is not None:
+                        new_tasks.append(task)
+                    else:
+                        with transaction.atomic():
+                            task = func.run_async(*pt.arguments, **pt.kwargs)
                 except Exception as e:
                     logger.error(
-                        f"Failed to enqueue or update task {pt.name} (ID: {pt.id}): {e}",
+                        f"Failed to enqueue periodic task {pt.name} (ID: {pt.id}): {e}",
                         exc_info=True,
                     )
-
-            current_time = now()
-            sleep_secs = max(
-                0.1,
-                min(default_interval, (next_due - current_time).total_seconds()),
+                    continue
+                runs.append(
+                    PeriodicTaskRun(
+                        periodic_task_id=pt.pk,
+                        scheduled_for=scheduled_for,
+                        task=task if isinstance(task, Task) else None,
+                    )
+                )
+                enqueued.append(task_info)
+
+            Task.objects.bulk_create(new_tasks)
+            PeriodicTaskRun.objects.bulk_create(runs)
+            # Grouped by run time and number of runs (catch-up may enqueue
+            # several per task); a tick produces a single group.
+            run_counts = Counter(
+                (task_info["run_time"], task_info["task"].pk) for task_info in enqueued
             )
-            logger.debug(
-                f"Scheduler sleeping for {sleep_secs:.2f} seconds (next check around {next_due})..."
+            groups = {}
+            for (run_time, pk), count in run_counts.items():
+                groups.setdefault((run_time, count), []).append(pk)
+            for (run_time, count), pks in groups.items():
+                PeriodicTask.objects.filter(pk__in=pks).update(
+                    last_run_at=run_time,
+                    total_run_count=F("total_run_count") + count,
+                    updated_at=now(),
+                )
+        return enqueued
+
+    def _enqueue_or_raise():
+        enqueued = _enqueue()
+        if enqueued is None:
+            # with_database_lock_handling() gives up by returning None
+            raise OperationalError(
+                "Database stayed locked while enqueuing periodic tasks."
             )
-            time.sleep(sleep_secs)
+        return enqueued
+
+    try:
+        return _enqueue_or_raise()
+    except IntegrityError:
+        # Another scheduler recorded one of the runs after we looked; the
+        # retry sees it and skips it.
+        logger.warning("Periodic task runs were enqueued concurrently; retrying.")
+        return _enqueue_or_raise()
+
+
+def run_scheduler_loop(default_interval=30, stop_event=None, lease_time=None):
+    """
+    Main loop for the scheduler process. Runs until stop_event is set; the
+    event also interrupts the sleep between ticks.
+
+    Schedule edits are picked up every ASYNC_MANAGER_SCHEDULE_SYNC_INTERVAL
+    seconds (default 5) by BeatScheduler.sync_changes(), and right away when
+    they are saved in this process.
+
+    Any number of schedulers may run: only the one holding the lease (see
+    Lease) enqueues periodic tasks. The others stay warm, keeping their
+    schedule in sync, and take over within lease_time seconds (default
+    ASYNC_MANAGER_SCHEDULER_LEASE_TIME, 30) of the leader stopping to renew.
+    A lease_time of 0 disables leader election.
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    if lease_time is None:
+        lease_time = getattr(settings, "ASYNC_MANAGER_SCHEDULER_LEASE_TIME", 30.0)
+    sync_interval = getattr(settings, "ASYNC_MANAGER_SCHEDULE_SYNC_INTERVAL", 5.0)
+    lease = Lease(duration=lease_time) if lease_time else None
+    logger.info("Starting scheduler loop...")
+    # With a lease, missed runs are caught up on by whichever scheduler
+    # acquires it.
+    scheduler = BeatScheduler(
+        default_interval=default_interval, check_missed=lease is None
+    )
+    last_sync = time.monotonic()
+    last_renewal = None
+    try:
+        while not stop_event.is_set():
+            try:
+                if lease is not None and (
+                    not lease.held
+                    or time.monotonic() - last_renewal >= lease.renew_interval
+                ):
+                    previous_token = lease.token
+                    last_renewal = time.monotonic()
+                    if lease.acquire() and lease.token != previous_token:
+                        # Catch up with the runs the previous leader recorded
+                        # since the last sync, then with the ones nobody ran.
+                        schedule_changed.clear()
+                        last_sync = time.monotonic()
+                        scheduler.sync_changes()
+                        scheduler.check_missed_tasks(lease=lease)
+
+                if (
+                    schedule_changed.is_set()
+                    or time.monotonic() - last_sync >= sync_interval
+                ):
+                    schedule_changed.clear()
+                    last_sync = time.monotonic()
+                    scheduler.sync_changes()
+
+                if lease is not None and not lease.held:
+                    _sleep(stop_event, min(sync_interval, lease.renew_interval))
+                    continue
 
-        except KeyboardInterrupt:
-            logger.info("Scheduler loop interrupted by user. Exiting.")
-            raise
-        except Exception as loop_err:
-            logger.exception(
-                f"Critical error in scheduler loop: {loop_err}. Restarting loop after 10 seconds."
-            )
-            time.sleep(10)
+                next_due, due_tasks_info = scheduler.tick()
+
+                if due_tasks_info:
+                    try:
+                        enqueued = enqueue_due_tasks(due_tasks_info, lease=lease)
+                    except LeaseLost as e:
+                        # The new leader runs the tasks that were due
+                        logger.warning(
+                            f"Not enqueuing {len(due_tasks_info)} periodic tasks: {e}"
+                        )
+                        enqueued = []
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to enqueue {len(due_tasks_info)} periodic tasks: {e}",
+                            exc_info=True,
+                        )
+                        scheduler.restore(due_tasks_info)
+                        enqueued = []
+                    enqueued_at = now()
+                    for task_info in enqueued:
+                        pt = task_info["task"]
+                        logger.info(
+                            "Enqueued periodic task: %s (ID: %s)", pt.name, pt.id
+                        )
+                        PERIODIC_TASKS_ENQUEUED.inc(name=pt.name)
+                        if "due_at" in task_info:
+                            # Jitter is intended delay, not lag
+                            fires_at = task_info.get("fires_at", task_info["due_at"])
+                            SCHEDULER_TICK_LAG.observe(
+                                max(0.0, (enqueued_at - fires_at).total_seconds())
+                            )
+
+                current_time = now()
+                sleep_secs = min(
+                    default_interval,
+                    sync_interval,
+                    (next_due - current_time).total_seconds(),
+                )
+                if lease is not None:
+                    sleep_secs = min(sleep_secs, lease.renew_interval)
+                sleep_secs = max(MIN_SLEEP, sleep_secs)
+                logger.debug(
+                    f"Scheduler sleeping for {sleep_secs:.2f} seconds (next check around {next_due})..."
+                )
+                _sleep(stop_event, sleep_secs)
+
+            except KeyboardInterrupt:
+                logger.info("Scheduler loop interrupted by user. Exiting.")
+                raise
+            except Exception as loop_err:
+                logger.exception(
+                    f"Critical error in scheduler loop: {loop_err}. Restarting loop after 10 seconds."
+                )
+                stop_event.wait(10)
+    finally:
+        if lease is not None:
+            try:
+                lease.release()
+            except Exception as e:
+                logger.error(f"Failed to release scheduler lease: {e}", exc_info=True)
+    logger.info("Scheduler loop stopped.")
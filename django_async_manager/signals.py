@@ -0,0 +1,25 @@
+from django.dispatch import Signal
+
+# Sent with sender=Task. See django_async_manager.middleware for the arguments
+# of each hook; receivers get the same keyword arguments as middleware methods.
+
+# An unsaved Task is about to be inserted; receivers may modify it or raise to
+# prevent the enqueue.
+before_enqueue = Signal()
+
+# A worker claimed the task (status is in_progress). Sent in the worker process.
+after_claim = Signal()
+
+# The task function is about to run. Sent in the executor thread or pool
+# process running it; raising fails the attempt.
+pre_execute = Signal()
+
+# The task function returned or raised. Sent in the executor thread or pool
+# process that ran it.
+post_execute = Signal()
+
+# A failed attempt was scheduled for a retry. Sent in the worker process.
+on_retry = Signal()
+
+# The task failed without further retries. Sent in the worker process.
+on_failure = Signal()
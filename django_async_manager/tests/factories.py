@@ -3,7 +3,12 @@ import uuid
 from django.utils.timezone import now, timedelta
 from faker import Faker
 
-from django_async_manager.models import Task, CrontabSchedule, PeriodicTask
+from django_async_manager.models import (
+    Task,
+    CrontabSchedule,
+    IntervalSchedule,
+    PeriodicTask,
+)
 
 faker = Faker()
 
@@ -70,6 +75,17 @@ class CrontabScheduleFactory(factory.django.DjangoModelFactory):
     month_of_year = "*"
 
 
+class IntervalScheduleFactory(factory.django.DjangoModelFactory):
+    """Factory to create IntervalSchedule instances for testing."""
+
+    class Meta:
+        model = IntervalSchedule
+
+    every = 5
+    period = "seconds"
+    anchor = None
+
+
 class PeriodicTaskFactory(factory.django.DjangoModelFactory):
     """Factory to create PeriodicTask instances for testing."""
 
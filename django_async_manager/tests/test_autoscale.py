@@ -0,0 +1,208 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from django_async_manager.autoscale import Autoscaler, LoadSample
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.worker import WorkerManager
+
+
+def load(depth=0, oldest_wait=0.0, cpu=10.0, memory=10.0):
+    return LoadSample(
+        queue_depth=depth,
+        oldest_wait=oldest_wait,
+        cpu_percent=cpu,
+        memory_percent=memory,
+    )
+
+
+class TestAutoscaler(TestCase):
+    def setUp(self):
+        self.autoscaler = Autoscaler(
+            queue="default",
+            min_workers=1,
+            max_workers=5,
+            backlog_per_worker=10,
+            max_wait=30,
+            scale_down_samples=3,
+        )
+
+    def test_scales_up_to_backlog(self):
+        """Test that a backlog scales up to one worker per backlog_per_worker tasks."""
+        self.assertEqual(self.autoscaler.decide(1, load(depth=35)), 4)
+
+    def test_scale_up_is_capped_at_max_workers(self):
+        """Test that scaling never exceeds max_workers."""
+        self.assertEqual(self.autoscaler.decide(2, load(depth=1000)), 5)
+        self.assertEqual(self.autoscaler.decide(5, load(depth=1000)), 5)
+
+    def test_old_tasks_trigger_scale_up(self):
+        """Test that a small but stale backlog adds a worker."""
+        self.assertEqual(self.autoscaler.decide(2, load(depth=3, oldest_wait=60)), 3)
+
+    def test_scale_down_needs_consecutive_idle_samples(self):
+        """Test hysteresis: workers are retired only after repeated idle samples."""
+        self.assertEqual(self.autoscaler.decide(3, load()), 3)
+        self.assertEqual(self.autoscaler.decide(3, load()), 3)
+        self.assertEqual(self.autoscaler.decide(3, load()), 2)
+
+    def test_busy_sample_resets_scale_down_streak(self):
+        """Test that a non-idle sample in between restarts the idle streak."""
+        self.autoscaler.decide(3, load())
+        self.autoscaler.decide(3, load())
+        self.autoscaler.decide(3, load(depth=5))
+        self.assertEqual(self.autoscaler.decide(3, load()), 3)
+
+    def test_never_scales_below_min_workers(self):
+        """Test that idle queues keep min_workers running."""
+        for _ in range(5):
+            self.assertEqual(self.autoscaler.decide(1, load()), 1)
+
+    def test_high_cpu_vetoes_scale_up(self):
+        """Test that a saturated host does not get more workers."""
+        self.assertEqual(self.autoscaler.decide(2, load(depth=100, cpu=95)), 2)
+
+    def test_memory_pressure_forces_scale_down(self):
+        """Test that memory pressure retires a worker immediately."""
+        self.assertEqual(self.autoscaler.decide(3, load(depth=100, memory=95)), 2)
+
+    def test_invalid_range(self):
+        """Test that max_workers below min_workers is rejected."""
+        with self.assertRaises(ValueError):
+            Autoscaler(queue="default", min_workers=3, max_workers=2)
+
+    def test_sample_measures_ready_queue(self):
+        """Test that only ready pending tasks of the queue are sampled."""
+        TaskFactory.create(
+            status="pending",
+            queue="scaled",
+            scheduled_at=None,
+            created_at=now() - timedelta(minutes=2),
+        )
+        TaskFactory.create(status="pending", queue="scaled", scheduled_at=None)
+        TaskFactory.create(status="pending", queue="scaled")  # Scheduled in the future
+        TaskFactory.create(status="completed", queue="scaled", scheduled_at=None)
+        TaskFactory.create(status="pending", queue="other", scheduled_at=None)
+
+        sample = Autoscaler(queue="scaled", min_workers=1, max_workers=2).sample()
+
+        self.assertEqual(sample.queue_depth, 2)
+        self.assertGreaterEqual(sample.oldest_wait, 119)
+
+    def test_sample_measures_wait_from_scheduled_time(self):
+        """Test that a retried task waits from its scheduled_at, not created_at."""
+        TaskFactory.create(
+            status="pending",
+            queue="scaled",
+            created_at=now() - timedelta(minutes=10),
+            scheduled_at=now() - timedelta(seconds=5),
+        )
+
+        sample = Autoscaler(queue="scaled", min_workers=1, max_workers=2).sample()
+
+        self.assertEqual(sample.queue_depth, 1)
+        self.assertLess(sample.oldest_wait, 30)
+
+
+class FakeRunner:
+    def __init__(self, target, name, daemon=True):
+        self.name = name
+        self.alive = False
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self):
+        self.alive = False
+
+
+@patch("django_async_manager.worker.threading.Thread", FakeRunner)
+class TestWorkerManagerAutoscaling(TestCase):
+    def _manager(self):
+        manager = WorkerManager(
+            num_workers=1, queue="scaled", min_workers=1, max_workers=4
+        )
+        self.addCleanup(manager.stop)
+        return manager
+
+    def test_autoscale_starts_workers_for_backlog(self):
+        """Test that an autoscaling step starts workers up to the decided target."""
+        manager = self._manager()
+        manager.start_workers()
+
+        with patch.object(manager.autoscaler, "sample", return_value=load(depth=30)):
+            manager.autoscale()
+
+        self.assertEqual(len(manager.active_workers), 3)
+        self.assertEqual(
+            [runner.name for runner in manager.workers],
+            ["worker-scaled-1", "worker-scaled-2", "worker-scaled-3"],
+        )
+
+    def test_autoscale_retires_newest_worker(self):
+        """Test that scaling down signals the newest worker to stop."""
+        manager = self._manager()
+        manager.num_workers = 3
+        manager.start_workers()
+        manager.autoscaler.scale_down_samples = 1
+
+        with patch.object(manager.autoscaler, "sample", return_value=load()):
+            manager.autoscale()
+
+        self.assertEqual(len(manager.active_workers), 2)
+        self.assertTrue(manager._stop_events["worker-scaled-3"].is_set())
+        self.assertFalse(manager._stop_events["worker-scaled-1"].is_set())
+
+    def test_autoscale_replaces_exited_workers(self):
+        """Test that workers which exited on their own are reaped and replaced."""
+        manager = self._manager()
+        manager.num_workers = 2
+        manager.start_workers()
+        manager.workers[1].alive = False
+
+        with patch.object(manager.autoscaler, "sample", return_value=load(depth=5)):
+            manager.autoscale()
+
+        self.assertEqual(len(manager.workers), 2)
+        self.assertEqual(len(manager.active_workers), 2)
+        self.assertEqual(
+            [runner.name for runner in manager.workers],
+            ["worker-scaled-1", "worker-scaled-3"],
+        )
+
+    def test_autoscale_replaces_exited_workers_up_to_target(self):
+        """Test that exited workers are only replaced up to the decided target."""
+        manager = self._manager()
+        manager.num_workers = 3
+        manager.start_workers()
+        manager.autoscaler.scale_down_samples = 1
+        manager.workers[1].alive = False
+        manager.workers[2].alive = False
+
+        with patch.object(manager.autoscaler, "sample", return_value=load()):
+            manager.autoscale()
+
+        self.assertEqual(len(manager.active_workers), 2)
+        self.assertEqual(
+            [runner.name for runner in manager.workers],
+            ["worker-scaled-1", "worker-scaled-4"],
+        )
+
+    def test_autoscale_does_not_replace_retired_workers(self):
+        """Test that workers asked to stop are not counted as lost."""
+        manager = self._manager()
+        manager.num_workers = 2
+        manager.start_workers()
+        manager._stop_events["worker-scaled-2"].set()
+        manager.workers[1].alive = False
+
+        with patch.object(manager.autoscaler, "sample", return_value=load(depth=5)):
+            manager.autoscale()
+
+        self.assertEqual(len(manager.workers), 1)
+        self.assertEqual(len(manager.active_workers), 1)
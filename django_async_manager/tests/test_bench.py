@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.timezone import now
+
+from django_async_manager.benchmark import BENCH_QUEUE, bench_tick, compare
+from django_async_manager.models import PeriodicTask, Task
+from django_async_manager.scheduler import BeatScheduler
+from django_async_manager.tests.factories import (
+    CrontabScheduleFactory,
+    PeriodicTaskFactory,
+)
+
+
+class BenchCommandTests(TestCase):
+    """Tests for the bench management command."""
+
+    def run_bench(self, *args):
+        out = io.StringIO()
+        call_command(
+            "bench",
+            "--enqueue-count",
+            "5",
+            "--queue-sizes",
+            "10",
+            "--claim-samples",
+            "3",
+            "--periodic-tasks",
+            "5",
+            "--e2e-count",
+            "3",
+            "--modes",
+            "threads",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_results_are_written_as_json(self):
+        """Test that every benchmark reports throughput and cleans up after itself."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.json")
+            output = self.run_bench("--output", path)
+            with open(path) as f:
+                report = json.load(f)
+
+        self.assertEqual(report["environment"]["database"], "sqlite")
+        benchmarks = [result["benchmark"] for result in report["results"]]
+        self.assertEqual(
+            benchmarks, ["enqueue", "claim", "claim", "tick", "end_to_end"]
+        )
+        for result in report["results"]:
+            self.assertGreater(result["ops_per_sec"], 0)
+        self.assertEqual(report["results"][-1]["completed"], 3)
+        self.assertIn("enqueue(count=5)", output)
+        self.assertFalse(Task.objects.filter(queue=BENCH_QUEUE).exists())
+        self.assertFalse(PeriodicTask.objects.exists())
+
+    def test_tick_leaves_real_periodic_tasks_alone(self):
+        """Test that the tick benchmark neither runs nor schedules user tasks."""
+        real = PeriodicTaskFactory(
+            name="nightly-report",
+            task_name="django_async_manager.tests.test_bench.real_job",
+            crontab=CrontabScheduleFactory(minute="*"),
+            last_run_at=now() - timedelta(days=1),
+        )
+
+        with patch.object(
+            BeatScheduler, "tick", autospec=True, side_effect=BeatScheduler.tick
+        ) as tick:
+            result = bench_tick(periodic_tasks=5, rounds=2)
+
+        scheduler = tick.call_args.args[0]
+        self.assertEqual(len(scheduler._schedule), 5)
+        self.assertNotIn(real.id, scheduler._schedule)
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertFalse(Task.objects.exists())
+        unchanged = PeriodicTask.objects.get(pk=real.pk)
+        self.assertEqual(unchanged.last_run_at, real.last_run_at)
+        self.assertEqual(unchanged.total_run_count, 0)
+
+    def test_compare_flags_regressions(self):
+        """Test that throughput drops beyond max_regression are reported."""
+        baseline = {
+            "results": [
+                {"benchmark": "enqueue", "params": {"count": 5}, "ops_per_sec": 100.0}
+            ]
+        }
+        current = {
+            "results": [
+                {"benchmark": "enqueue", "params": {"count": 5}, "ops_per_sec": 80.0}
+            ]
+        }
+
+        (change,) = compare(baseline, current, max_regression=0.1)
+
+        self.assertAlmostEqual(change["change"], -0.2)
+        self.assertTrue(change["regression"])
+        self.assertFalse(
+            compare(baseline, current, max_regression=0.3)[0]["regression"]
+        )
+
+    def test_unknown_benchmark(self):
+        """Test that unknown benchmark names are rejected."""
+        with self.assertRaises(CommandError):
+            call_command("bench", "--benchmarks", "enqueue,nope")
+
+
+def real_job():
+    pass
@@ -1,4 +1,8 @@
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.test import TestCase
+from django.utils.timezone import now
 from django_async_manager.decorators import background_task
 from django_async_manager.models import Task
 
@@ -113,3 +117,197 @@ class BackgroundTaskDecoratorTests(TestCase):
 
         task = task_with_critical_priority.run_async(100)
         self.assertEqual(task.priority, Task.PRIORITY_MAPPING["critical"])
+
+    def test_run_async_idempotency_key_returns_existing_task(self):
+        """Test that enqueuing with an active idempotency key returns the existing task."""
+
+        @background_task()
+        def charge(order_id):
+            return order_id
+
+        first = charge.run_async(1, idempotency_key="order-1")
+        second = charge.run_async(1, idempotency_key="order-1")
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(first.idempotency_key, "order-1")
+        self.assertNotIn("idempotency_key", first.arguments["kwargs"])
+        self.assertEqual(Task.objects.filter(idempotency_key="order-1").count(), 1)
+
+    def test_idempotency_key_parameter_is_passed_to_the_task(self):
+        """Test that a task's own idempotency_key parameter is not taken as its key."""
+
+        @background_task()
+        def forward_payment(order_id, idempotency_key):
+            return idempotency_key
+
+        task = forward_payment.run_async(1, idempotency_key="psp-1")
+
+        self.assertIsNone(task.idempotency_key)
+        self.assertEqual(task.arguments["kwargs"], {"idempotency_key": "psp-1"})
+        self.assertIsNotNone(forward_payment.build_task(1, idempotency_key="psp-1"))
+
+    def test_idempotency_key_released_when_task_finishes(self):
+        """Test that a finished task no longer blocks enqueuing with the same key."""
+
+        @background_task()
+        def charge(order_id):
+            return order_id
+
+        first = charge.run_async(1, idempotency_key="order-1")
+        first.mark_as_completed()
+        second = charge.run_async(1, idempotency_key="order-1")
+
+        self.assertNotEqual(first.id, second.id)
+
+    def test_decorator_derives_idempotency_key_from_arguments(self):
+        """Test that idempotency_key=True deduplicates calls with equal arguments."""
+
+        @background_task(idempotency_key=True)
+        def rebuild(tenant, full=False):
+            return tenant
+
+        first = rebuild.run_async("acme", full=True)
+        duplicate = rebuild.run_async("acme", full=True)
+        other = rebuild.run_async("acme", full=False)
+
+        self.assertEqual(first.id, duplicate.id)
+        self.assertNotEqual(first.id, other.id)
+
+    def test_decorator_idempotency_key_callable(self):
+        """Test that a callable idempotency key is computed from the arguments."""
+
+        @background_task(idempotency_key=lambda user_id, **kwargs: f"welcome-{user_id}")
+        def send_welcome(user_id, locale="en"):
+            return user_id
+
+        first = send_welcome.run_async(7, locale="en")
+        duplicate = send_welcome.run_async(7, locale="pl")
+
+        self.assertEqual(first.id, duplicate.id)
+        self.assertEqual(first.idempotency_key, "welcome-7")
+
+    def test_idempotency_key_enforced_by_database(self):
+        """Test that a concurrent duplicate insert falls back to the existing task."""
+
+        @background_task()
+        def charge(order_id):
+            return order_id
+
+        existing = charge.run_async(1, idempotency_key="order-1")
+        empty_qs = Task.objects.none()
+
+        with patch.object(
+            Task.objects,
+            "filter",
+            side_effect=[empty_qs, Task.objects.filter(id=existing.id)],
+        ):
+            duplicate = charge.run_async(1, idempotency_key="order-1")
+
+        self.assertEqual(duplicate.id, existing.id)
+        self.assertEqual(Task.objects.filter(idempotency_key="order-1").count(), 1)
+
+    def test_debounce_folds_repeated_enqueues(self):
+        """Test that repeated enqueues within the window update one pending task."""
+
+        @background_task(debounce=30)
+        def rebuild_cache(key):
+            return key
+
+        first = rebuild_cache.run_async("home")
+        first_run_at = first.scheduled_at
+        second = rebuild_cache.run_async("home")
+        other = rebuild_cache.run_async("about")
+
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, other.id)
+        self.assertGreater(first_run_at, now())
+        self.assertGreaterEqual(second.scheduled_at, first_run_at)
+        self.assertEqual(Task.objects.filter(name="rebuild_cache").count(), 2)
+
+    def test_debounce_starts_new_task_once_claimed(self):
+        """Test that an enqueue after the pending task was claimed creates a new one."""
+
+        @background_task(debounce=30)
+        def rebuild_cache(key):
+            return key
+
+        first = rebuild_cache.run_async("home")
+        Task.objects.filter(id=first.id).update(status="in_progress")
+        second = rebuild_cache.run_async("home")
+
+        self.assertNotEqual(first.id, second.id)
+
+    def test_debounce_merge_coalesces_arguments(self):
+        """Test that a merge function combines arguments into the pending task."""
+
+        def union_ids(old, new):
+            ids = sorted(set(old["kwargs"]["ids"]) | set(new["kwargs"]["ids"]))
+            return {"args": [], "kwargs": {"ids": ids}}
+
+        @background_task(debounce=30, debounce_merge=union_ids)
+        def reindex(ids):
+            return ids
+
+        first = reindex.run_async(ids=[1, 2])
+        reindex.run_async(ids=[2, 3])
+        reindex.run_async(ids=[5])
+
+        first.refresh_from_db()
+        self.assertEqual(first.arguments["kwargs"]["ids"], [1, 2, 3, 5])
+        self.assertEqual(Task.objects.filter(name="reindex").count(), 1)
+
+    def test_debounce_max_wait_bounds_postponement(self):
+        """Test that scheduled_at never moves past created_at + debounce_max_wait."""
+
+        @background_task(debounce=60, debounce_max_wait=10)
+        def rebuild_cache(key):
+            return key
+
+        first = rebuild_cache.run_async("home")
+        rebuild_cache.run_async("home")
+
+        first.refresh_from_db()
+        self.assertLessEqual(
+            first.scheduled_at, first.created_at + timedelta(seconds=10)
+        )
+
+    def test_debounce_options_require_debounce(self):
+        """Test that merge and max wait options are rejected without debounce."""
+        with self.assertRaises(ValueError):
+            background_task(debounce_max_wait=10)
+
+    def test_build_task_returns_unsaved_task(self):
+        """Test that build_task builds the Task run_async would insert."""
+
+        @background_task(priority="high", queue="reports", timeout=30)
+        def send_report(day, fmt="pdf"):
+            return day
+
+        task = send_report.build_task("monday", fmt="csv")
+
+        self.assertTrue(task._state.adding)
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(task.name, "send_report")
+        self.assertEqual(task.queue, "reports")
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["high"])
+        self.assertEqual(task.timeout, 30)
+        self.assertEqual(task.arguments, {"args": ["monday"], "kwargs": {"fmt": "csv"}})
+
+    def test_build_task_defers_keyed_enqueues_to_run_async(self):
+        """Test that build_task returns None when the enqueue needs lookups."""
+
+        @background_task(idempotency_key=True)
+        def sync_account(account_id):
+            return account_id
+
+        @background_task(debounce=30)
+        def refresh(key):
+            return key
+
+        @background_task()
+        def plain(key):
+            return key
+
+        self.assertIsNone(sync_account.build_task(1))
+        self.assertIsNone(refresh.build_task("home"))
+        self.assertIsNone(plain.build_task("home", idempotency_key="k"))
@@ -0,0 +1,131 @@
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from django_async_manager.lease import Lease, LeaseLost
+from django_async_manager.models import PeriodicTask, SchedulerLease, Task
+from django_async_manager.scheduler import (
+    BeatScheduler,
+    enqueue_due_tasks,
+    run_scheduler_loop,
+)
+from django_async_manager.tests.factories import (
+    CrontabScheduleFactory,
+    PeriodicTaskFactory,
+)
+
+
+def _expire(name="scheduler"):
+    SchedulerLease.objects.filter(name=name).update(
+        expires_at=now() - timedelta(seconds=1)
+    )
+
+
+class TestLease(TestCase):
+    """Tests for leader election through the SchedulerLease row."""
+
+    def setUp(self):
+        self.leader = Lease(duration=30, holder="leader")
+        self.standby = Lease(duration=30, holder="standby")
+
+    def test_only_one_holder(self):
+        """Test that a held lease is renewed by its holder and refused to others."""
+        self.assertTrue(self.leader.acquire())
+        self.assertFalse(self.standby.acquire())
+        self.assertTrue(self.leader.acquire())
+
+        self.assertEqual(self.leader.token, 1)
+        self.assertTrue(self.leader.held)
+        self.assertFalse(self.standby.held)
+
+    def test_takeover_increments_token_and_fences_old_leader(self):
+        """Test that an expired lease is taken over and the old token is fenced."""
+        self.leader.acquire()
+        _expire()
+
+        self.assertTrue(self.standby.acquire())
+        self.assertEqual(self.standby.token, 2)
+        with self.assertRaises(LeaseLost):
+            self.leader.fence()
+        self.assertFalse(self.leader.acquire())
+        self.standby.fence()
+
+    def test_release_hands_over_immediately(self):
+        """Test that a released lease can be taken over before it expires."""
+        self.leader.acquire()
+        self.leader.release()
+
+        self.assertTrue(self.standby.acquire())
+        self.assertIsNone(self.leader.token)
+
+    def test_duration_must_be_positive(self):
+        """Test that a lease needs a positive duration."""
+        with self.assertRaises(ValueError):
+            Lease(duration=0)
+
+
+class TestFencedScheduling(TestCase):
+    """Tests for schedulers running behind a lease."""
+
+    def setUp(self):
+        self.periodic_task = PeriodicTaskFactory(
+            task_name="django_async_manager.tests.test_lease.periodic_job",
+            crontab=CrontabScheduleFactory(minute="*"),
+            last_run_at=now() - timedelta(minutes=10),
+        )
+
+    def test_stale_leader_cannot_enqueue(self):
+        """Test that an enqueue fenced by a lost lease leaves no trace."""
+        leader = Lease(holder="leader")
+        leader.acquire()
+        _expire()
+        Lease(holder="standby").acquire()
+
+        with self.assertRaises(LeaseLost):
+            enqueue_due_tasks(
+                [{"task": self.periodic_task, "run_time": now()}], lease=leader
+            )
+
+        self.assertFalse(Task.objects.exists())
+        self.periodic_task.refresh_from_db()
+        self.assertEqual(self.periodic_task.total_run_count, 0)
+
+    def test_standby_follows_runs_of_the_leader(self):
+        """Test that a standby's schedule picks up runs recorded by the leader."""
+        with patch.object(BeatScheduler, "check_missed_tasks"):
+            standby = BeatScheduler()
+        run_time = now().replace(second=0, microsecond=0)
+
+        enqueue_due_tasks([{"task": self.periodic_task, "run_time": run_time}])
+        standby.sync_changes()
+
+        self.assertEqual(
+            standby._schedule[self.periodic_task.id]["next_run"],
+            run_time + timedelta(minutes=1),
+        )
+
+    def test_standby_loop_does_not_enqueue(self):
+        """Test that the loop enqueues nothing while another scheduler leads."""
+        SchedulerLease.objects.create(
+            name="scheduler",
+            holder="other",
+            token=1,
+            expires_at=now() + timedelta(minutes=5),
+        )
+        stop_event = threading.Event()
+
+        with patch.object(
+            stop_event, "wait", side_effect=lambda timeout=None: stop_event.set()
+        ):
+            run_scheduler_loop(stop_event=stop_event, lease_time=30)
+
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(SchedulerLease.objects.get().holder, "other")
+        self.assertEqual(PeriodicTask.objects.get().total_run_count, 0)
+
+
+def periodic_job():
+    pass
@@ -0,0 +1,202 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from django_async_manager.decorators import background_task
+from django_async_manager.limits import (
+    DatabaseRateLimiter,
+    has_free_concurrency_slot,
+    parse_rate,
+)
+from django_async_manager.models import RateLimitBucket, Task
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.worker import TaskWorker
+
+
+class TestParseRate(TestCase):
+    def test_valid_rates(self):
+        """Test that supported rate formats are parsed to (calls, seconds)."""
+        self.assertEqual(parse_rate("50/s"), (50.0, 1))
+        self.assertEqual(parse_rate("100/m"), (100.0, 60))
+        self.assertEqual(parse_rate("10/30s"), (10.0, 30))
+        self.assertEqual(parse_rate("2/h"), (2.0, 3600))
+
+    def test_invalid_rates(self):
+        """Test that malformed or non-positive rates raise ValueError."""
+        for rate in ["", "fast", "50", "50/x", "0/s"]:
+            with self.assertRaises(ValueError):
+                parse_rate(rate)
+
+    def test_decorator_validates_rate_limit(self):
+        """Test that the decorator rejects an invalid rate limit up front."""
+        with self.assertRaises(ValueError):
+
+            @background_task(rate_limit="lots")
+            def task_with_bad_rate():
+                pass
+
+    def test_decorator_stores_rate_limit(self):
+        """Test that the rate limit is stored on the created task."""
+
+        @background_task(rate_limit="5/m")
+        def rate_limited_task():
+            return "ok"
+
+        task = rate_limited_task.run_async()
+        self.assertEqual(task.rate_limit, "5/m")
+
+
+class TestDatabaseRateLimiter(TestCase):
+    def setUp(self):
+        self.limiter = DatabaseRateLimiter()
+
+    def test_bucket_allows_burst_up_to_capacity(self):
+        """Test that a fresh bucket admits `calls` starts and then refuses."""
+        results = [self.limiter.acquire("task:send_sms", "3/m") for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_bucket_refills_over_time(self):
+        """Test that tokens are refilled in proportion to elapsed time."""
+        self.limiter.acquire("task:send_sms", "1/s")
+        self.assertFalse(self.limiter.acquire("task:send_sms", "1/s"))
+
+        RateLimitBucket.objects.filter(key="task:send_sms").update(
+            updated_at=now() - timedelta(seconds=2)
+        )
+        self.assertTrue(self.limiter.acquire("task:send_sms", "1/s"))
+
+    def test_buckets_are_per_key(self):
+        """Test that separate keys do not share quota."""
+        self.assertTrue(self.limiter.acquire("task:a", "1/h"))
+        self.assertTrue(self.limiter.acquire("task:b", "1/h"))
+        self.assertFalse(self.limiter.acquire("task:a", "1/h"))
+
+
+class TestWorkerRateLimit(TestCase):
+    def setUp(self):
+        self.worker = TaskWorker(worker_id="rate-worker", queue="rate")
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _pending(self, name, priority, rate_limit=None):
+        return TaskFactory.from_string_priority(
+            name=name,
+            priority=priority,
+            status="pending",
+            queue="rate",
+            scheduled_at=None,
+            rate_limit=rate_limit,
+        )
+
+    @patch("django_async_manager.worker.execute_task")
+    def test_rate_limited_task_is_skipped_not_claimed(self, mock_execute):
+        """Test that a task over its rate limit stays pending and other work is claimed."""
+        limited = self._pending("send_sms", "critical", rate_limit="1/h")
+        other = self._pending("other_task", "low")
+        RateLimitBucket.objects.create(key="task:send_sms", tokens=0, updated_at=now())
+
+        with patch.dict(
+            "django_async_manager.worker.TASK_REGISTRY",
+            {"send_sms": "m.send_sms", "other_task": "m.other_task"},
+        ):
+            self.worker.process_task()
+
+        limited.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(limited.status, "pending")
+        self.assertEqual(limited.attempts, 0)
+        self.assertEqual(other.status, "completed")
+        mock_execute.assert_called_once()
+
+    @patch("django_async_manager.worker.execute_task")
+    def test_rate_limited_task_runs_when_tokens_available(self, mock_execute):
+        """Test that a rate-limited task is claimed while its bucket has tokens."""
+        limited = self._pending("send_sms", "medium", rate_limit="1/h")
+
+        with patch.dict(
+            "django_async_manager.worker.TASK_REGISTRY", {"send_sms": "m.send_sms"}
+        ):
+            self.worker.process_task()
+
+        limited.refresh_from_db()
+        self.assertEqual(limited.status, "completed")
+        self.assertLess(RateLimitBucket.objects.get(key="task:send_sms").tokens, 1)
+
+
+class TestConcurrencyLimit(TestCase):
+    def setUp(self):
+        self.worker = TaskWorker(worker_id="concurrency-worker", queue="locks")
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _task(self, status, key=None, limit=1, name="lock_account"):
+        return TaskFactory.create(
+            name=name,
+            status=status,
+            priority=Task.PRIORITY_MAPPING["medium"],
+            queue="locks",
+            scheduled_at=None,
+            concurrency_limit=limit,
+            concurrency_key=key,
+        )
+
+    def test_decorator_stores_limit_and_key(self):
+        """Test that the concurrency key is derived from the call arguments."""
+
+        @background_task(
+            concurrency_limit=2, concurrency_key=lambda account_id: account_id
+        )
+        def sync_account(account_id):
+            return account_id
+
+        task = sync_account.run_async(42)
+        self.assertEqual(task.concurrency_limit, 2)
+        self.assertEqual(task.concurrency_key, "42")
+
+    def test_decorator_validates_concurrency_options(self):
+        """Test that invalid concurrency options are rejected up front."""
+        with self.assertRaises(ValueError):
+            background_task(concurrency_limit=0)
+        with self.assertRaises(ValueError):
+            background_task(concurrency_key=lambda: "key")
+
+    def test_free_slot_counts_running_tasks_per_key(self):
+        """Test that only in-progress tasks with the same name and key use slots."""
+        self._task("in_progress", key="tenant-1")
+        self._task("completed", key="tenant-2")
+        self._task("in_progress", key="tenant-2", name="other_task")
+
+        self.assertFalse(
+            has_free_concurrency_slot(self._task("pending", key="tenant-1"))
+        )
+        self.assertTrue(
+            has_free_concurrency_slot(self._task("pending", key="tenant-2"))
+        )
+        self.assertTrue(
+            has_free_concurrency_slot(self._task("pending", key="tenant-1", limit=2))
+        )
+
+    @patch("django_async_manager.worker.execute_task")
+    def test_tasks_over_limit_stay_unclaimed(self, mock_execute):
+        """Test that the worker skips a saturated key and claims a task for another key."""
+        self._task("in_progress", key="tenant-1")
+        blocked = self._task("pending", key="tenant-1")
+        blocked.created_at = now() - timedelta(minutes=5)
+        blocked.save()
+        free = self._task("pending", key="tenant-2")
+
+        with patch.dict(
+            "django_async_manager.worker.TASK_REGISTRY",
+            {"lock_account": "m.lock_account"},
+        ):
+            self.worker.process_task()
+
+        blocked.refresh_from_db()
+        free.refresh_from_db()
+        self.assertEqual(blocked.status, "pending")
+        self.assertEqual(free.status, "completed")
+        mock_execute.assert_called_once()
@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.timezone import now
+
+from django_async_manager.loadtest import (
+    LOADTEST_JOB_NAME,
+    LOADTEST_QUEUE,
+    PROFILES,
+    LoadTest,
+    LoadTestFailure,
+    Workload,
+    loadtest_job,
+)
+from django_async_manager.models import Task
+
+
+def workload(**overrides):
+    data = {
+        "name": "test",
+        "duration": 1,
+        "rate": 10,
+        "sample_interval": 1,
+        "mix": [
+            {"name": "quick", "weight": 3, "duration": [0, 0.01]},
+            {"name": "pipeline", "dag_width": 2, "dag_depth": 3},
+        ],
+    }
+    data.update(overrides)
+    return Workload.from_dict(data)
+
+
+class TestWorkload(TestCase):
+    """Tests for workload profiles."""
+
+    def test_builtin_profiles_are_valid(self):
+        """Test that every built-in profile loads."""
+        for name in PROFILES:
+            self.assertEqual(Workload.load(name).name, name)
+
+    def test_invalid_profiles_are_rejected(self):
+        """Test that unknown keys and invalid values raise ValueError."""
+        with self.assertRaises(ValueError):
+            workload(threads=3)
+        with self.assertRaises(ValueError):
+            workload(mix=[{"name": "bad", "failure_rate": 2}])
+        with self.assertRaises(ValueError):
+            workload(mix=[{"name": "bad", "priority": "urgent"}])
+        with self.assertRaises(ValueError):
+            workload(mix=[{"name": "bad", "dag_width": 2}])
+
+    def test_job_injects_failures(self):
+        """Test that the load test job raises when asked to fail."""
+        self.assertEqual(loadtest_job.__wrapped__(memory_mb=1), 1024 * 1024)
+        with self.assertRaises(LoadTestFailure):
+            loadtest_job.__wrapped__(fail=True)
+
+
+class TestLoadTest(TestCase):
+    """Tests for enqueueing and sampling load."""
+
+    def test_dag_groups_depend_on_previous_layer(self):
+        """Test that DAG mixes create layers depending on the previous layer."""
+        load_test = LoadTest(
+            workload(mix=[{"name": "dag", "dag_width": 2, "dag_depth": 3}])
+        )
+
+        self.assertEqual(load_test.enqueue(), 6)
+
+        tasks = Task.objects.filter(queue=LOADTEST_QUEUE)
+        self.assertEqual(tasks.count(), 6)
+        dependency_counts = sorted(task.dependencies.count() for task in tasks)
+        self.assertEqual(dependency_counts, [0, 0, 2, 2, 2, 2])
+
+    def test_seed_makes_runs_reproducible(self):
+        """Test that the same seed produces the same tasks."""
+        runs = []
+        for _ in range(2):
+            load_test = LoadTest(workload(), seed=7)
+            for _ in range(5):
+                load_test.enqueue()
+            runs.append(
+                list(
+                    Task.objects.filter(queue=LOADTEST_QUEUE)
+                    .order_by("created_at")
+                    .values_list("arguments", flat=True)
+                )
+            )
+            load_test.purge()
+        self.assertEqual(runs[0], runs[1])
+
+    def test_purge_leaves_other_tasks_in_the_queue(self):
+        """Test that a profile using a shared queue only deletes its own tasks."""
+        real = Task.objects.create(
+            name="billing.tasks.charge",
+            arguments={"args": [], "kwargs": {}},
+            queue="default",
+        )
+        load_test = LoadTest(workload(queue="default"))
+        load_test.enqueue()
+
+        load_test.purge()
+
+        self.assertEqual(list(Task.objects.values_list("id", flat=True)), [real.id])
+        self.assertTrue(load_test._drained())
+
+    def test_sample_and_report(self):
+        """Test that samples count tasks by status and the report flags leaks."""
+        load_test = LoadTest(workload(stuck_after=60))
+        load_test._started_at = now() - timedelta(seconds=10)
+        created = now() - timedelta(seconds=5)
+        Task.objects.create(
+            name=LOADTEST_JOB_NAME,
+            arguments={"args": [], "kwargs": {}},
+            queue=LOADTEST_QUEUE,
+            status="completed",
+            created_at=created,
+            completed_at=created + timedelta(seconds=2),
+            exec_ms=1500.0,
+        )
+        Task.objects.create(
+            name=LOADTEST_JOB_NAME,
+            arguments={"args": [], "kwargs": {}},
+            queue=LOADTEST_QUEUE,
+            status="in_progress",
+            started_at=now() - timedelta(minutes=5),
+        )
+
+        sample = load_test.sample()
+        report = load_test.report(load_time=10)
+
+        self.assertEqual(sample["completed"], 1)
+        self.assertEqual(sample["in_progress"], 1)
+        self.assertEqual(sample["stuck"], 1)
+        self.assertAlmostEqual(sample["latency"]["p50_ms"], 2000, delta=1)
+        self.assertEqual(sample["exec_p95_ms"], 1500.0)
+        self.assertGreater(sample["rss_mb"], 0)
+        self.assertEqual(report["leaked"], 1)
+        self.assertEqual(report["max_stuck"], 1)
+
+
+class LoadTestCommandTests(TestCase):
+    """Tests for the loadtest management command."""
+
+    def fake_report(self, leaked=0):
+        return {
+            "workload": "smoke",
+            "load_time_s": 1.0,
+            "enqueued": 2,
+            "completed": 2,
+            "failed": 0,
+            "injected_failures": 0,
+            "throughput": 2.0,
+            "latency": None,
+            "max_stuck": 0,
+            "leaked": leaked,
+            "rss_start_mb": None,
+            "rss_peak_mb": None,
+            "rss_end_mb": None,
+            "rss_slope_mb_per_hour": None,
+            "worker_exit_code": 0,
+            "samples": [],
+        }
+
+    @patch("django_async_manager.management.commands.loadtest.LoadTest")
+    def test_overrides_and_output(self, mock_load_test):
+        """Test that command options override the profile and the report is written."""
+        mock_load_test.return_value.run.return_value = self.fake_report()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            call_command(
+                "loadtest",
+                "--duration",
+                "5",
+                "--workers",
+                "3",
+                "--processes",
+                "--output",
+                path,
+                stdout=io.StringIO(),
+            )
+            with open(path) as f:
+                self.assertEqual(json.load(f)["enqueued"], 2)
+
+        workload = mock_load_test.call_args[0][0]
+        self.assertEqual(workload.name, "smoke")
+        self.assertEqual(workload.duration, 5)
+        self.assertEqual(workload.workers, 3)
+        self.assertTrue(workload.use_processes)
+        mock_load_test.return_value.run.assert_called_once_with(cleanup=True)
+
+    @patch("django_async_manager.management.commands.loadtest.LoadTest")
+    def test_leaked_tasks_fail_the_run(self, mock_load_test):
+        """Test that the command exits with status 1 when tasks never finished."""
+        mock_load_test.return_value.run.return_value = self.fake_report(leaked=3)
+        with self.assertRaises(SystemExit) as cm:
+            call_command("loadtest", stdout=io.StringIO())
+        self.assertEqual(cm.exception.code, 1)
+
+    def test_unknown_profile(self):
+        """Test that a missing profile file is reported as a command error."""
+        with self.assertRaises(CommandError):
+            call_command("loadtest", "--profile", "/does/not/exist.json")
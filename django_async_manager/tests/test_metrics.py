@@ -0,0 +1,145 @@
+import os
+import tempfile
+import urllib.request
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase
+
+from django_async_manager import metrics
+from django_async_manager.metrics import MetricsRegistry, start_http_server
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.utils import with_database_lock_handling
+from django_async_manager.worker import TaskWorker
+
+
+class TestMetricsRegistry(TestCase):
+    """Tests for counters, histograms and the Prometheus text format."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.counter = self.registry.counter(
+            "jobs_total", "Jobs processed.", ("queue",)
+        )
+        self.histogram = self.registry.histogram(
+            "job_seconds", "Job duration.", buckets=(0.1, 1.0)
+        )
+
+    def test_counter_rendering(self):
+        """Test that counters are rendered with HELP, TYPE and escaped labels."""
+        self.counter.inc(queue="default")
+        self.counter.inc(2, queue='say "hi"')
+
+        output = self.registry.render()
+
+        self.assertIn("# HELP jobs_total Jobs processed.", output)
+        self.assertIn("# TYPE jobs_total counter", output)
+        self.assertIn('jobs_total{queue="default"} 1.0', output)
+        self.assertIn('jobs_total{queue="say \\"hi\\""} 2.0', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets count observations at or below their bound."""
+        for value in (0.05, 0.1, 0.5, 3.0):
+            self.histogram.observe(value)
+
+        output = self.registry.render()
+
+        self.assertIn('job_seconds_bucket{le="0.1"} 2', output)
+        self.assertIn('job_seconds_bucket{le="1.0"} 3', output)
+        self.assertIn('job_seconds_bucket{le="+Inf"} 4', output)
+        self.assertIn("job_seconds_sum 3.65", output)
+        self.assertIn("job_seconds_count 4", output)
+
+    def test_wrong_labels_are_rejected(self):
+        """Test that metrics require exactly their declared labels."""
+        with self.assertRaises(ValueError):
+            self.counter.inc(name="x")
+
+    def test_deltas_move_values_between_registries(self):
+        """Test that take_deltas() resets values and merge_deltas() adds them."""
+        parent = MetricsRegistry()
+        parent_counter = parent.counter("jobs_total", "Jobs processed.", ("queue",))
+        parent_histogram = parent.histogram(
+            "job_seconds", "Job duration.", buckets=(0.1, 1.0)
+        )
+        parent_counter.inc(queue="default")
+        self.counter.inc(3, queue="default")
+        self.histogram.observe(0.5)
+
+        parent.merge_deltas(self.registry.take_deltas())
+
+        self.assertEqual(parent_counter.get(queue="default"), 4)
+        self.assertEqual(parent_histogram.get(), (1, 0.5))
+        self.assertEqual(self.counter.get(queue="default"), 0)
+        self.assertEqual(self.registry.take_deltas(), {})
+
+    def test_textfile_is_written(self):
+        """Test that write_textfile() replaces the target file with the metrics."""
+        self.counter.inc(queue="default")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "async.prom")
+            metrics.write_textfile(path, self.registry)
+
+            with open(path) as f:
+                self.assertEqual(f.read(), self.registry.render())
+            self.assertEqual(os.listdir(directory), ["async.prom"])
+
+    def test_http_endpoint(self):
+        """Test that the HTTP server exposes the registry on /metrics."""
+        self.counter.inc(queue="default")
+        server = start_http_server(0, registry=self.registry)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+
+        self.assertEqual(response.status, 200)
+        self.assertIn('jobs_total{queue="default"} 1.0', body)
+
+
+class TestInstrumentation(TestCase):
+    """Tests for the metrics recorded by workers and helpers."""
+
+    def test_worker_records_task_metrics(self):
+        """Test that claiming and completing a task is counted."""
+        task = TaskFactory(
+            name="django_async_manager.tests.test_worker.dummy_task_function",
+            queue="metrics",
+            status="pending",
+            scheduled_at=None,
+        )
+        labels = {"queue": "metrics", "name": task.name}
+        claimed = metrics.TASKS_CLAIMED.get(**labels)
+        completed = metrics.TASKS_COMPLETED.get(**labels)
+        executions, _ = metrics.EXECUTION_TIME.get(**labels)
+        worker = TaskWorker(worker_id="metrics-worker", queue="metrics")
+        self.addCleanup(worker.shutdown)
+
+        with patch("django_async_manager.worker.execute_task", return_value="ok"):
+            worker.process_task()
+
+        self.assertEqual(metrics.TASKS_CLAIMED.get(**labels), claimed + 1)
+        self.assertEqual(metrics.TASKS_COMPLETED.get(**labels), completed + 1)
+        self.assertEqual(metrics.EXECUTION_TIME.get(**labels)[0], executions + 1)
+        self.assertGreaterEqual(metrics.ACQUISITION_TIME.get(queue="metrics")[0], 1)
+
+    def test_database_lock_retries_are_counted(self):
+        """Test that with_database_lock_handling counts its retries."""
+        calls = []
+
+        @with_database_lock_handling(max_retries=3)
+        def locked_operation():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError("database is locked")
+            return "done"
+
+        retries = metrics.DB_LOCK_RETRIES.get(function="locked_operation")
+        with patch("django_async_manager.utils.time.sleep"):
+            self.assertEqual(locked_operation(), "done")
+
+        self.assertEqual(
+            metrics.DB_LOCK_RETRIES.get(function="locked_operation"), retries + 2
+        )
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from django_async_manager import signals
+from django_async_manager.decorators import background_task
+from django_async_manager.middleware import TaskMiddleware, get_handlers, run_hook
+from django_async_manager.models import Task
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.worker import TaskWorker, execute_task
+
+CALLS = []
+
+
+class RecordingMiddleware(TaskMiddleware):
+    def before_enqueue(self, task):
+        CALLS.append(("before_enqueue", task.name))
+        task.priority = Task.PRIORITY_MAPPING["critical"]
+
+    def after_claim(self, task, worker_id):
+        CALLS.append(("after_claim", worker_id))
+
+    def pre_execute(self, task_info, args, kwargs):
+        CALLS.append(("pre_execute", task_info["name"], args))
+
+    def post_execute(self, task_info, args, kwargs, result, exception, duration):
+        CALLS.append(("post_execute", result, exception))
+
+
+class OuterMiddleware(TaskMiddleware):
+    def post_execute(self, task_info, args, kwargs, result, exception, duration):
+        CALLS.append(("outer_post_execute", result))
+
+
+class VetoMiddleware(TaskMiddleware):
+    def before_enqueue(self, task):
+        raise PermissionError("enqueue not allowed")
+
+
+class BrokenMiddleware(TaskMiddleware):
+    def after_claim(self, task, worker_id):
+        raise RuntimeError("broken")
+
+
+@background_task()
+def middleware_task(value):
+    return value * 2
+
+
+MIDDLEWARE = "django_async_manager.tests.test_middleware"
+
+
+class TestTaskMiddleware(TestCase):
+    """Tests for task middleware and lifecycle signals."""
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_only_overridden_hooks_are_registered(self):
+        """Test that hooks a middleware does not override are skipped."""
+        with override_settings(
+            ASYNC_MANAGER_MIDDLEWARE=[f"{MIDDLEWARE}.OuterMiddleware"]
+        ):
+            self.assertEqual(len(get_handlers("post_execute")), 1)
+            self.assertEqual(get_handlers("pre_execute"), ())
+
+    def test_no_middleware_and_no_receivers_is_a_no_op(self):
+        """Test that run_hook returns early when nothing is registered."""
+        with patch.object(signals.pre_execute, "send") as mock_send:
+            run_hook("pre_execute", task_info={}, args=[], kwargs={})
+        mock_send.assert_not_called()
+
+    @override_settings(ASYNC_MANAGER_MIDDLEWARE=[f"{MIDDLEWARE}.RecordingMiddleware"])
+    def test_before_enqueue_can_modify_task(self):
+        """Test that before_enqueue sees and can change the task before it is saved."""
+        task = middleware_task.run_async(1)
+
+        task.refresh_from_db()
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["critical"])
+        self.assertEqual(CALLS, [("before_enqueue", "middleware_task")])
+
+    @override_settings(ASYNC_MANAGER_MIDDLEWARE=[f"{MIDDLEWARE}.VetoMiddleware"])
+    def test_before_enqueue_can_veto(self):
+        """Test that an exception in before_enqueue prevents the enqueue."""
+        with self.assertRaises(PermissionError):
+            middleware_task.run_async(1)
+
+        self.assertFalse(Task.objects.filter(name="middleware_task").exists())
+
+    @override_settings(
+        ASYNC_MANAGER_MIDDLEWARE=[
+            f"{MIDDLEWARE}.OuterMiddleware",
+            f"{MIDDLEWARE}.RecordingMiddleware",
+        ]
+    )
+    def test_execute_hooks_wrap_the_function(self):
+        """Test that pre/post_execute run around the function, post hooks in reverse."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = execute_task(
+                f"{MIDDLEWARE}.middleware_task",
+                [21],
+                {},
+                timeout=10,
+                use_threads=True,
+                executor=executor,
+                task_info={"id": "1", "name": "middleware_task", "queue": "default"},
+            )
+
+        self.assertEqual(result, 42)
+        self.assertEqual(
+            CALLS,
+            [
+                ("pre_execute", "middleware_task", [21]),
+                ("post_execute", 42, None),
+                ("outer_post_execute", 42),
+            ],
+        )
+
+    @override_settings(
+        ASYNC_MANAGER_MIDDLEWARE=[
+            f"{MIDDLEWARE}.BrokenMiddleware",
+            f"{MIDDLEWARE}.RecordingMiddleware",
+        ]
+    )
+    def test_errors_in_observing_hooks_are_ignored(self):
+        """Test that a failing after_claim hook neither stops the task nor other hooks."""
+        task = TaskFactory(
+            name=f"{MIDDLEWARE}.middleware_task",
+            arguments={"args": [2], "kwargs": {}},
+            queue="middleware",
+            status="pending",
+            scheduled_at=None,
+        )
+        worker = TaskWorker(worker_id="middleware-worker", queue="middleware")
+        self.addCleanup(worker.shutdown)
+
+        worker.process_task()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "completed")
+        self.assertIn(("after_claim", "middleware-worker"), CALLS)
+        self.assertIn(("post_execute", 4, None), CALLS)
+
+    def test_on_failure_signal(self):
+        """Test that on_failure is sent once a task runs out of retries."""
+        received = []
+
+        def receiver(sender, task, error, **kwargs):
+            received.append((sender, task.id, error))
+
+        signals.on_failure.connect(receiver)
+        self.addCleanup(signals.on_failure.disconnect, receiver)
+        task = TaskFactory(
+            name="not_registered_anywhere",
+            queue="middleware",
+            status="pending",
+            scheduled_at=None,
+        )
+        worker = TaskWorker(worker_id="middleware-worker", queue="middleware")
+        self.addCleanup(worker.shutdown)
+
+        worker.process_task()
+
+        self.assertEqual(len(received), 1)
+        sender, task_id, error = received[0]
+        self.assertIs(sender, Task)
+        self.assertEqual(task_id, task.id)
+        self.assertIn("has not been registered", error)
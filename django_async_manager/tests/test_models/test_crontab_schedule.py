@@ -1,7 +1,11 @@
 import datetime
+import zoneinfo
+
+from croniter import croniter
 from django.test import TestCase
 from django.utils.timezone import utc
 
+from django_async_manager import cron
 from django_async_manager.tests.factories import CrontabScheduleFactory
 
 
@@ -37,3 +41,35 @@ class TestCrontabSchedule(TestCase):
         next_run = self.schedule.get_next_run_time(base_time)
         self.assertIsInstance(next_run, datetime.datetime)
         self.assertGreater(next_run, base_time)
+
+    def test_parsed_expressions_are_cached(self):
+        """Test that schedules sharing an expression reuse one parsed croniter."""
+        cron.clear_cache()
+        other = CrontabScheduleFactory(
+            minute="0", hour="12", day_of_week="mon-fri", day_of_month="*"
+        )
+        base_time = datetime.datetime(2025, 4, 4, 10, 15, 0, tzinfo=utc)
+
+        first = self.schedule.get_next_run_time(base_time)
+        second = other.get_next_run_time(base_time + datetime.timedelta(days=1))
+
+        self.assertEqual(cron._compiled.cache_info().misses, 1)
+        self.assertEqual(cron._compiled.cache_info().hits, 1)
+        self.assertEqual(first, datetime.datetime(2025, 4, 4, 12, 0, tzinfo=utc))
+        self.assertEqual(second, datetime.datetime(2025, 4, 7, 12, 0, tzinfo=utc))
+
+    def test_cached_results_match_croniter(self):
+        """Test that reusing a parsed expression gives croniter's results."""
+        tz = zoneinfo.ZoneInfo("Europe/Warsaw")
+        expressions = ["*/7 * * * *", "30 2 * * *", "0 0 1 * *", "15 9 * * sun"]
+        bases = [
+            datetime.datetime(2025, 3, 29, 23, 50, tzinfo=tz),
+            datetime.datetime(2025, 10, 26, 1, 59, tzinfo=tz),
+            datetime.datetime(2025, 4, 4, 10, 15, tzinfo=utc),
+        ]
+        for expression in expressions:
+            for base_time in bases:
+                self.assertEqual(
+                    cron.next_fire_time(expression, base_time),
+                    croniter(expression, base_time).get_next(datetime.datetime),
+                )
@@ -0,0 +1,93 @@
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils.timezone import utc
+
+from django_async_manager.models import PeriodicTask
+from django_async_manager.tests.factories import (
+    CrontabScheduleFactory,
+    IntervalScheduleFactory,
+    PeriodicTaskFactory,
+)
+
+
+class TestIntervalSchedule(TestCase):
+    def setUp(self):
+        self.anchor = datetime.datetime(2025, 4, 4, 10, 0, 2, tzinfo=utc)
+        self.schedule = IntervalScheduleFactory(
+            every=5, period="seconds", anchor=self.anchor
+        )
+
+    def test_str_representation(self):
+        """Test that __str__ describes the interval and its anchor."""
+        self.assertEqual(
+            str(IntervalScheduleFactory(every=250, period="milliseconds")),
+            "every 250 milliseconds",
+        )
+        self.assertEqual(
+            str(self.schedule), "every 5 seconds from 2025-04-04T10:00:02+00:00"
+        )
+
+    def test_next_run_is_aligned_to_the_anchor(self):
+        """Test that runs fall on anchor + n * interval whatever the base time."""
+        late = self.anchor + datetime.timedelta(seconds=13, milliseconds=300)
+
+        self.assertEqual(
+            self.schedule.get_next_run_time(late),
+            self.anchor + datetime.timedelta(seconds=15),
+        )
+        self.assertEqual(
+            self.schedule.get_next_run_time(self.anchor),
+            self.anchor + datetime.timedelta(seconds=5),
+        )
+        self.assertEqual(
+            self.schedule.get_next_run_time(
+                self.anchor - datetime.timedelta(seconds=7)
+            ),
+            self.anchor - datetime.timedelta(seconds=5),
+        )
+
+    def test_default_anchor_is_the_epoch(self):
+        """Test that schedules without an anchor are aligned to the Unix epoch."""
+        schedule = IntervalScheduleFactory(every=250, period="milliseconds")
+        base = datetime.datetime(2025, 4, 4, 10, 0, 0, 100000, tzinfo=utc)
+
+        self.assertEqual(
+            schedule.get_next_run_time(base), base.replace(microsecond=250000)
+        )
+
+    def test_get_run_times_between(self):
+        """Test that the latest run times within a range are listed oldest first."""
+        after = self.anchor
+        until = self.anchor + datetime.timedelta(seconds=21)
+
+        self.assertEqual(
+            self.schedule.get_run_times_between(after, until, 100),
+            [self.anchor + datetime.timedelta(seconds=s) for s in (5, 10, 15, 20)],
+        )
+        self.assertEqual(
+            self.schedule.get_run_times_between(after, until, 2),
+            [self.anchor + datetime.timedelta(seconds=s) for s in (15, 20)],
+        )
+
+    def test_interval_below_scheduler_minimum_is_invalid(self):
+        """Test that validation rejects intervals shorter than 100 milliseconds."""
+        IntervalScheduleFactory.build(every=100, period="milliseconds").full_clean()
+
+        with self.assertRaises(ValidationError):
+            IntervalScheduleFactory.build(every=99, period="milliseconds").full_clean()
+
+    def test_periodic_task_needs_exactly_one_schedule(self):
+        """Test that a periodic task has either a crontab or an interval."""
+        task = PeriodicTaskFactory(crontab=None, interval=self.schedule)
+        self.assertEqual(task.schedule, self.schedule)
+
+        with self.assertRaises(IntegrityError):
+            PeriodicTask.objects.create(
+                name="both",
+                task_name="tasks.poll",
+                crontab=CrontabScheduleFactory(),
+                interval=self.schedule,
+            )
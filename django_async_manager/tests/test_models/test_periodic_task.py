@@ -63,3 +63,23 @@ class TestPeriodicTask(TestCase):
     def test_str_representation(self):
         """Test that __str__ returns the unique name of the periodic task."""
         self.assertEqual(str(self.pt), "Test Periodic Task")
+
+    def test_jitter_offset(self):
+        """
+        Test that the jitter offset is zero without a window, stays within it
+        otherwise and only depends on the task's name.
+        """
+        self.assertEqual(self.pt.jitter_offset(), datetime.timedelta(0))
+
+        self.pt.jitter = 60
+        offset = self.pt.jitter_offset()
+        self.assertGreaterEqual(offset, datetime.timedelta(0))
+        self.assertLess(offset, datetime.timedelta(seconds=60))
+
+        same_name = PeriodicTaskFactory.build(name=self.pt.name, jitter=60)
+        self.assertEqual(same_name.jitter_offset(), offset)
+        offsets = {
+            PeriodicTaskFactory.build(name=f"hourly-{i}", jitter=60).jitter_offset()
+            for i in range(20)
+        }
+        self.assertGreater(len(offsets), 1)
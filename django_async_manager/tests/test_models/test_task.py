@@ -99,3 +99,32 @@ class TestTask(TestCase):
             str(self.task),
             f"{self.task.name} ({self.task.status}) - Priority: {self.task.priority}",
         )
+
+    def test_failure_records_end_time_and_timings(self):
+        """Test that failed and retried attempts record when they ended."""
+        self.task.mark_as_failed("Boom", timings={"exec_ms": 12.5, "cpu_time_ms": 3})
+        self.task.refresh_from_db()
+
+        self.assertIsNotNone(self.task.completed_at)
+        self.assertEqual(self.task.exec_ms, 12.5)
+        self.assertEqual(self.task.cpu_time_ms, 3)
+        self.assertIsNone(self.task.overhead_ms)
+
+    def test_timing_rollup(self):
+        """Test that timing_rollup aggregates timings per task name."""
+        for exec_ms in (10, 30):
+            TaskFactory(
+                name="rollup_task",
+                status="completed",
+                exec_ms=exec_ms,
+                queue_wait_ms=exec_ms * 2,
+            )
+        TaskFactory(name="rollup_task", status="pending")
+
+        rows = list(Task.objects.filter(name="rollup_task").timing_rollup())
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["timed_tasks"], 2)
+        self.assertEqual(rows[0]["avg_exec_ms"], 20)
+        self.assertEqual(rows[0]["max_exec_ms"], 30)
+        self.assertEqual(rows[0]["avg_queue_wait_ms"], 40)
@@ -0,0 +1,210 @@
+import io
+import marshal
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from django_async_manager.decorators import background_task
+from django_async_manager.models import ProfilingRule, TaskProfile
+from django_async_manager.profiling import (
+    TaskProfiler,
+    clear_rules_cache,
+    load_allocations,
+    load_stats,
+    parse_modes,
+    profile_modes_for,
+)
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.worker import TaskWorker
+
+
+def allocating_function():
+    return len([str(i) for i in range(10000)])
+
+
+class TestTaskProfiler(TestCase):
+    """Tests for collecting and loading profiles."""
+
+    def test_payload_round_trip(self):
+        """Test that pstats and allocations survive compression."""
+        profiler = TaskProfiler(("cprofile", "tracemalloc"))
+        profiler.start()
+        allocating_function()
+        payload = profiler.stop()
+
+        self.assertEqual(payload["modes"], "cprofile,tracemalloc")
+        stats = load_stats(payload["pstats"])
+        functions = {name for _, _, name in stats.stats}
+        self.assertIn("allocating_function", functions)
+        allocations = load_allocations(payload["allocations"])
+        self.assertTrue(allocations)
+        self.assertEqual(set(allocations[0]), {"file", "line", "size_kb", "count"})
+
+    def test_parse_modes(self):
+        """Test that modes are parsed from strings and validated."""
+        self.assertEqual(
+            parse_modes("cprofile, tracemalloc"), ("cprofile", "tracemalloc")
+        )
+        with self.assertRaises(ValueError):
+            parse_modes("perf")
+        with self.assertRaises(ValueError):
+            parse_modes("")
+
+
+class TestSampling(TestCase):
+    """Tests for deciding which executions are profiled."""
+
+    def setUp(self):
+        clear_rules_cache()
+        self.addCleanup(clear_rules_cache)
+
+    def test_task_sample_rate(self):
+        """Test that the task's own sample rate is used without a rule."""
+        self.assertIsNone(profile_modes_for(TaskFactory(profile_sample_rate=None)))
+        self.assertEqual(
+            profile_modes_for(TaskFactory(profile_sample_rate=1.0)), ("cprofile",)
+        )
+
+    def test_rule_overrides_task_sample_rate(self):
+        """Test that a ProfilingRule takes precedence over profile_sample_rate."""
+        task = TaskFactory(name="reports", profile_sample_rate=None)
+        ProfilingRule.objects.create(
+            task_name="reports", sample_rate=1.0, modes="tracemalloc"
+        )
+
+        self.assertEqual(profile_modes_for(task), ("tracemalloc",))
+
+    def test_wildcard_rule(self):
+        """Test that a '*' rule applies to every task."""
+        ProfilingRule.objects.create(task_name="*", sample_rate=1.0)
+
+        self.assertEqual(
+            profile_modes_for(TaskFactory(profile_sample_rate=None)), ("cprofile",)
+        )
+
+    def test_decorator_validates_sample_rate(self):
+        """Test that profile_sample_rate must be between 0 and 1."""
+        with self.assertRaises(ValueError):
+            background_task(profile_sample_rate=1.5)
+
+        @background_task(profile_sample_rate=0.25)
+        def sampled_task():
+            pass
+
+        self.assertEqual(sampled_task.run_async().profile_sample_rate, 0.25)
+
+
+class TestWorkerProfiling(TestCase):
+    """Tests for profiles recorded by workers."""
+
+    def setUp(self):
+        clear_rules_cache()
+        self.addCleanup(clear_rules_cache)
+
+    def test_sampled_execution_is_stored(self):
+        """Test that a sampled execution produces a TaskProfile."""
+        task = TaskFactory(
+            name="django_async_manager.tests.test_profiling.allocating_function",
+            queue="profiling",
+            status="pending",
+            scheduled_at=None,
+            profile_sample_rate=1.0,
+        )
+        worker = TaskWorker(worker_id="profiling-worker", queue="profiling")
+        self.addCleanup(worker.shutdown)
+
+        worker.process_task()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "completed")
+        profile = task.profiles.get()
+        self.assertEqual(profile.status, "completed")
+        self.assertEqual(profile.modes, "cprofile")
+        self.assertIsNotNone(profile.get_stats())
+
+    def test_unsampled_execution_is_not_stored(self):
+        """Test that no profile is stored when profiling is off."""
+        TaskFactory(
+            name="django_async_manager.tests.test_profiling.allocating_function",
+            queue="profiling",
+            status="pending",
+            scheduled_at=None,
+            profile_sample_rate=None,
+        )
+        worker = TaskWorker(worker_id="profiling-worker", queue="profiling")
+        self.addCleanup(worker.shutdown)
+
+        worker.process_task()
+
+        self.assertFalse(TaskProfile.objects.exists())
+
+
+class TestTaskProfilesCommand(TestCase):
+    """Tests for the task_profiles management command."""
+
+    def setUp(self):
+        profiler = TaskProfiler(("cprofile", "tracemalloc"))
+        profiler.start()
+        allocating_function()
+        payload = profiler.stop()
+        self.profile = TaskProfile.objects.create(
+            task_name="reports",
+            status="completed",
+            duration_ms=12.5,
+            modes=payload["modes"],
+            pstats=payload["pstats"],
+            allocations=payload["allocations"],
+        )
+
+    def test_list_and_show(self):
+        """Test that profiles are listed and their hot spots printed."""
+        out = io.StringIO()
+        call_command("task_profiles", "list", stdout=out)
+        self.assertIn("reports", out.getvalue())
+
+        out = io.StringIO()
+        call_command("task_profiles", "show", str(self.profile.id), stdout=out)
+        self.assertIn("allocating_function", out.getvalue())
+        self.assertIn("Top allocations:", out.getvalue())
+
+    def test_dump(self):
+        """Test that dump writes a file readable by pstats."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "task.prof")
+            call_command(
+                "task_profiles",
+                "dump",
+                str(self.profile.id),
+                path,
+                stdout=io.StringIO(),
+            )
+            with open(path, "rb") as f:
+                self.assertEqual(marshal.load(f), self.profile.get_stats().stats)
+
+    def test_enable_and_disable(self):
+        """Test that enable and disable manage ProfilingRule rows."""
+        call_command(
+            "task_profiles",
+            "enable",
+            "reports",
+            "--rate",
+            "0.5",
+            "--modes",
+            "cprofile,tracemalloc",
+            "--minutes",
+            "10",
+            stdout=io.StringIO(),
+        )
+        rule = ProfilingRule.objects.get(task_name="reports")
+        self.assertEqual(rule.sample_rate, 0.5)
+        self.assertEqual(rule.modes, "cprofile,tracemalloc")
+        self.assertIsNotNone(rule.expires_at)
+
+        call_command("task_profiles", "disable", "reports", stdout=io.StringIO())
+        self.assertFalse(ProfilingRule.objects.exists())
+
+        with self.assertRaises(CommandError):
+            call_command("task_profiles", "enable", "reports", "--modes", "perf")
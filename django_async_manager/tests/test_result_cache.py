@@ -0,0 +1,179 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from django_async_manager.decorators import background_task
+from django_async_manager.metrics import RESULT_CACHE_HITS, RESULT_CACHE_MISSES
+from django_async_manager.models import Task, TaskResult
+from django_async_manager.result_cache import (
+    DatabaseResultCache,
+    DjangoCacheResultCache,
+    LocMemResultCache,
+)
+from django_async_manager.tests.factories import TaskFactory
+from django_async_manager.utils import make_task_key
+from django_async_manager.worker import TaskWorker
+
+
+class TestLocMemResultCache(TestCase):
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = LocMemResultCache()
+        cache.set("a", 1, ttl=60)
+
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_lookups_are_recorded_in_metrics(self):
+        """Test that hits and misses of every instance reach the shared counters."""
+        labels = {"backend": "LocMemResultCache"}
+        hits = RESULT_CACHE_HITS.get(**labels)
+        misses = RESULT_CACHE_MISSES.get(**labels)
+        first, second = LocMemResultCache(), LocMemResultCache()
+        first.set("a", 1, ttl=60)
+
+        first.get("a")
+        first.get("b")
+        second.get("a")
+
+        self.assertEqual(RESULT_CACHE_HITS.get(**labels), hits + 1)
+        self.assertEqual(RESULT_CACHE_MISSES.get(**labels), misses + 2)
+        self.assertEqual(second.stats(), {"hits": 0, "misses": 1})
+
+    def test_none_result_is_a_hit(self):
+        """Test that a cached None is distinguished from a miss."""
+        cache = LocMemResultCache()
+        cache.set("a", None, ttl=60)
+
+        self.assertEqual(cache.get("a"), (True, None))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted past max_entries."""
+        cache = LocMemResultCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        self.assertTrue(cache.get("a")[0])
+        self.assertFalse(cache.get("b")[0])
+        self.assertTrue(cache.get("c")[0])
+
+    @patch("django_async_manager.result_cache.time.monotonic")
+    def test_entries_expire(self, mock_monotonic):
+        """Test that entries are not returned after their TTL."""
+        mock_monotonic.return_value = 100.0
+        cache = LocMemResultCache()
+        cache.set("a", 1, ttl=10)
+
+        mock_monotonic.return_value = 111.0
+        self.assertEqual(cache.get("a"), (False, None))
+
+
+class TestDjangoCacheResultCache(TestCase):
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_round_trip(self):
+        """Test that results are stored in and read from the Django cache."""
+        cache = DjangoCacheResultCache()
+        cache.set("a", {"rows": 3}, ttl=60)
+
+        self.assertEqual(cache.get("a"), (True, {"rows": 3}))
+        self.assertEqual(cache.get("missing"), (False, None))
+
+
+class TestDatabaseResultCache(TestCase):
+    def test_round_trip_and_expiry(self):
+        """Test that results are read back until they expire."""
+        cache = DatabaseResultCache()
+        cache.set("a", [1, 2], ttl=60)
+        self.assertEqual(cache.get("a"), (True, [1, 2]))
+
+        TaskResult.objects.filter(key="a").update(
+            expires_at=now() - timedelta(seconds=1)
+        )
+        self.assertEqual(cache.get("a"), (False, None))
+
+    def test_rejects_non_serializable_results(self):
+        """Test that results which cannot be stored as JSON raise TypeError."""
+        with self.assertRaises(TypeError):
+            DatabaseResultCache().set("a", object(), ttl=60)
+
+    def test_eviction_keeps_newest_entries(self):
+        """Test that eviction removes expired rows and the oldest rows past max_entries."""
+        cache = DatabaseResultCache(max_entries=2, cleanup_every=1000)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.set(key, i, ttl=60)
+            TaskResult.objects.filter(key=key).update(
+                created_at=now() - timedelta(minutes=10 - i)
+            )
+        cache.set("expired", 0, ttl=60)
+        TaskResult.objects.filter(key="expired").update(expires_at=now())
+
+        cache.evict()
+
+        self.assertEqual(
+            sorted(TaskResult.objects.values_list("key", flat=True)), ["b", "c"]
+        )
+
+
+@override_settings(
+    ASYNC_MANAGER_RESULT_CACHE={
+        "BACKEND": "django_async_manager.result_cache.LocMemResultCache",
+        "OPTIONS": {"max_entries": 16},
+    }
+)
+class TestWorkerResultCache(TestCase):
+    def setUp(self):
+        self.worker = TaskWorker(worker_id="cache-worker", queue="cached")
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _pending(self):
+        return TaskFactory.create(
+            name="render_report",
+            status="pending",
+            queue="cached",
+            scheduled_at=None,
+            arguments={"args": [2025], "kwargs": {}},
+            cache_ttl=60,
+        )
+
+    def test_decorator_stores_cache_ttl(self):
+        """Test that cache_ttl from the decorator is stored on the task."""
+
+        @background_task(cache_ttl=120)
+        def thumbnail(path):
+            return path
+
+        self.assertEqual(thumbnail.run_async("a.png").cache_ttl, 120)
+
+    @patch("django_async_manager.worker.execute_task", return_value={"pages": 3})
+    def test_cache_hit_completes_without_executing(self, mock_execute):
+        """Test that a second identical invocation is served from the cache."""
+        first = self._pending()
+        with patch.dict(
+            "django_async_manager.worker.TASK_REGISTRY",
+            {"render_report": "m.render_report"},
+        ):
+            self.worker.process_task()
+            second = self._pending()
+            self.worker.process_task()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, "completed")
+        self.assertEqual(second.status, "completed")
+        mock_execute.assert_called_once()
+
+        from django_async_manager.result_cache import get_result_cache
+
+        cache = get_result_cache()
+        self.assertTrue(cache.get(make_task_key("render_report", [2025], {}))[0])
+        self.assertGreaterEqual(cache.stats()["hits"], 1)
+        self.assertEqual(Task.objects.filter(name="render_report").count(), 2)
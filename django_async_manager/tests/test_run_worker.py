@@ -1,3 +1,5 @@
+import os
+import signal
 from unittest.mock import patch, MagicMock
 from django.core.management import call_command
 from django.test import TestCase
@@ -8,12 +10,13 @@ class RunWorkerCommandTests(TestCase):
     def test_run_worker_single_worker(self, mock_worker_manager):
         """Test if run_worker starts a single worker by default"""
         mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
         mock_worker_manager.return_value = mock_instance
 
         call_command("run_worker")
 
         mock_worker_manager.assert_called_once_with(
-            num_workers=1, queue="default", use_processes=False
+            num_workers=1, queue="default", use_processes=False, shutdown_grace=30.0
         )
         mock_instance.start_workers.assert_called_once()
         mock_instance.join_workers.assert_called_once()
@@ -22,12 +25,13 @@ class RunWorkerCommandTests(TestCase):
     def test_run_worker_multiple_workers(self, mock_worker_manager):
         """Test if run_worker starts multiple workers when specified"""
         mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
         mock_worker_manager.return_value = mock_instance
 
         call_command("run_worker", "--num-workers", "3")
 
         mock_worker_manager.assert_called_once_with(
-            num_workers=3, queue="default", use_processes=False
+            num_workers=3, queue="default", use_processes=False, shutdown_grace=30.0
         )
         mock_instance.start_workers.assert_called_once()
         mock_instance.join_workers.assert_called_once()
@@ -36,12 +40,13 @@ class RunWorkerCommandTests(TestCase):
     def test_run_worker_process_management(self, mock_worker_manager):
         """Test if run_worker properly manages multiple workers with processes"""
         mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
         mock_worker_manager.return_value = mock_instance
 
         call_command("run_worker", "--num-workers", "2", "--processes")
 
         mock_worker_manager.assert_called_once_with(
-            num_workers=2, queue="default", use_processes=True
+            num_workers=2, queue="default", use_processes=True, shutdown_grace=30.0
         )
         mock_instance.start_workers.assert_called_once()
         mock_instance.join_workers.assert_called_once()
@@ -50,12 +55,110 @@ class RunWorkerCommandTests(TestCase):
     def test_run_worker_custom_queue(self, mock_worker_manager):
         """Test if run_worker passes the custom queue parameter to WorkerManager"""
         mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
         mock_worker_manager.return_value = mock_instance
 
         call_command("run_worker", "--queue", "critical")
 
         mock_worker_manager.assert_called_once_with(
-            num_workers=1, queue="critical", use_processes=False
+            num_workers=1, queue="critical", use_processes=False, shutdown_grace=30.0
         )
         mock_instance.start_workers.assert_called_once()
         mock_instance.join_workers.assert_called_once()
+
+    @patch("django_async_manager.management.commands.run_worker.WorkerManager")
+    def test_run_worker_autoscale(self, mock_worker_manager):
+        """Test if run_worker passes autoscaling bounds to WorkerManager"""
+        mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
+        mock_worker_manager.return_value = mock_instance
+
+        call_command(
+            "run_worker",
+            "--min-workers",
+            "2",
+            "--max-workers",
+            "8",
+            "--autoscale-interval",
+            "5",
+        )
+
+        mock_worker_manager.assert_called_once_with(
+            num_workers=1,
+            queue="default",
+            use_processes=False,
+            shutdown_grace=30.0,
+            min_workers=2,
+            max_workers=8,
+            autoscale_interval=5.0,
+        )
+        mock_instance.start_workers.assert_called_once()
+        mock_instance.join_workers.assert_called_once()
+
+    @patch("django_async_manager.management.commands.run_worker.WorkerManager")
+    def test_run_worker_shutdown_grace(self, mock_worker_manager):
+        """Test if run_worker passes the shutdown grace period to WorkerManager"""
+        mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
+        mock_worker_manager.return_value = mock_instance
+
+        call_command("run_worker", "--shutdown-grace", "120")
+
+        mock_worker_manager.assert_called_once_with(
+            num_workers=1, queue="default", use_processes=False, shutdown_grace=120.0
+        )
+
+    @patch("django_async_manager.management.commands.run_worker.WorkerManager")
+    def test_run_worker_exit_code(self, mock_worker_manager):
+        """Test if run_worker exits with the status returned by the drain"""
+        mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 1
+        mock_worker_manager.return_value = mock_instance
+
+        with self.assertRaises(SystemExit) as cm:
+            call_command("run_worker")
+
+        self.assertEqual(cm.exception.code, 1)
+
+    @patch("django_async_manager.management.commands.run_worker.WorkerManager")
+    def test_run_worker_sigterm_stops_manager(self, mock_worker_manager):
+        """Test if SIGTERM received while running asks the manager to stop"""
+        mock_instance = MagicMock()
+        mock_worker_manager.return_value = mock_instance
+
+        def join_workers():
+            os.kill(os.getpid(), signal.SIGTERM)
+            return 0
+
+        mock_instance.join_workers.side_effect = join_workers
+        previous_handler = signal.getsignal(signal.SIGTERM)
+
+        call_command("run_worker")
+
+        mock_instance.stop.assert_called_once()
+        self.assertIs(signal.getsignal(signal.SIGTERM), previous_handler)
+
+    @patch("django_async_manager.management.commands.run_worker.WorkerManager")
+    def test_run_worker_recycling(self, mock_worker_manager):
+        """Test if run_worker passes the recycling limits to WorkerManager"""
+        mock_instance = MagicMock()
+        mock_instance.join_workers.return_value = 0
+        mock_worker_manager.return_value = mock_instance
+
+        call_command(
+            "run_worker",
+            "--processes",
+            "--max-tasks-per-child",
+            "500",
+            "--max-memory-per-child",
+            "1024",
+        )
+
+        mock_worker_manager.assert_called_once_with(
+            num_workers=1,
+            queue="default",
+            use_processes=True,
+            shutdown_grace=30.0,
+            max_tasks_per_child=500,
+            max_memory_per_child=1024,
+        )
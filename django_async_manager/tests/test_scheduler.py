@@ -1,13 +1,30 @@
 import datetime
 from datetime import timedelta
+import threading
 import types
+from django.db import IntegrityError, OperationalError, transaction
 from django.test import TestCase
 from django.utils.timezone import now, utc
 from unittest.mock import patch, MagicMock
 
-from django_async_manager.models import Task
-from django_async_manager.scheduler import BeatScheduler, run_scheduler_loop
-from django_async_manager.tests.factories import PeriodicTaskFactory
+from django_async_manager import scheduler as scheduler_module
+from django_async_manager.decorators import background_task
+from django_async_manager.models import (
+    CrontabSchedule,
+    PeriodicTask,
+    PeriodicTaskRun,
+    Task,
+)
+from django_async_manager.scheduler import (
+    BeatScheduler,
+    enqueue_due_tasks,
+    run_scheduler_loop,
+)
+from django_async_manager.tests.factories import (
+    CrontabScheduleFactory,
+    IntervalScheduleFactory,
+    PeriodicTaskFactory,
+)
 
 
 class TestBeatScheduler(TestCase):
@@ -66,39 +83,24 @@ class TestBeatScheduler(TestCase):
 
     def test_check_missed_tasks(self):
         """
-        Test that check_missed_tasks identifies and processes tasks that were missed.
+        Test that check_missed_tasks enqueues a missed run without executing
+        the task function in the scheduler.
         """
         past_time = now() - timedelta(hours=3)
         missed_task = PeriodicTaskFactory(
             name="Missed Task",
-            task_name="dummy_module.dummy_function",
+            task_name=f"{__name__}.plain_job",
             enabled=True,
             last_run_at=past_time,
         )
 
-        next_run = past_time + timedelta(minutes=30)
+        with patch(f"{__name__}.plain_job", spec=plain_job) as mock_function:
+            self.scheduler.check_missed_tasks()
 
-        with patch.object(
-            missed_task.crontab, "get_next_run_time", return_value=next_run
-        ):
-            with patch("importlib.import_module") as mock_import:
-                mock_module = MagicMock()
-                mock_function = MagicMock()
-                mock_function.run_async = None
-                mock_module.dummy_function = mock_function
-                mock_import.return_value = mock_module
-
-                with patch(
-                    "django_async_manager.utils.with_database_lock_handling",
-                    lambda *args, **kwargs: lambda func: func,
-                ):
-                    self.scheduler.check_missed_tasks()
-
-                    mock_import.assert_called_with("dummy_module")
-                    mock_function.assert_called_once()
-
-                    missed_task.refresh_from_db()
-                    self.assertGreater(missed_task.last_run_at, past_time)
+        mock_function.assert_not_called()
+        self.assertTrue(Task.objects.filter(name=f"{__name__}.plain_job").exists())
+        missed_task.refresh_from_db()
+        self.assertGreater(missed_task.last_run_at, past_time)
 
     def test_tick(self):
         """
@@ -109,8 +111,8 @@ class TestBeatScheduler(TestCase):
         """
         fixed_now = datetime.datetime(2025, 4, 6, 16, 3, 0, tzinfo=utc)
         with patch("django_async_manager.scheduler.now", return_value=fixed_now):
-            self.scheduler._schedule[self.periodic_task.id]["next_run"] = (
-                fixed_now - timedelta(minutes=1)
+            self.scheduler.set_next_run(
+                self.periodic_task.id, fixed_now - timedelta(minutes=1)
             )
             before_total = self.periodic_task.total_run_count
 
@@ -129,6 +131,634 @@ class TestBeatScheduler(TestCase):
             )
             self.assertGreaterEqual(next_due, fixed_now)
 
+    def test_late_tick_keeps_interval_aligned(self):
+        """
+        Test that an interval task ticked late is rescheduled from its due
+        time, so its runs stay on the anchored grid instead of drifting.
+        """
+        anchor = datetime.datetime(2025, 4, 6, 16, 0, 0, tzinfo=utc)
+        interval_task = PeriodicTaskFactory(
+            task_name=f"{__name__}.plain_job",
+            crontab=None,
+            interval=IntervalScheduleFactory(every=5, anchor=anchor),
+        )
+        due = anchor + timedelta(seconds=5)
+        late = due + timedelta(milliseconds=800)
+        self.scheduler.set_next_run(interval_task.id, due, interval_task)
+
+        with patch("django_async_manager.scheduler.now", return_value=late):
+            _, due_tasks_info = self.scheduler.tick()
+
+        self.assertIn(interval_task, [info["task"] for info in due_tasks_info])
+        self.assertEqual(
+            self.scheduler._schedule[interval_task.id]["next_run"],
+            due + timedelta(seconds=5),
+        )
+
+    def test_schedule_is_loaded_with_constant_queries(self):
+        """
+        Test that syncing the schedule, checking for missed tasks and ticking
+        do not query the database once per periodic task.
+        """
+        past = now() - timedelta(minutes=5)
+        for i in range(20):
+            PeriodicTaskFactory(name=f"Bulk {i}", last_run_at=past)
+
+        with self.assertNumQueries(1):
+            self.scheduler.update_schedule()
+        self.assertEqual(len(self.scheduler._schedule), 21)
+
+        with self.assertNumQueries(0):
+            _, due_tasks_info = self.scheduler.tick()
+            for info in due_tasks_info:
+                pt = info["task"]
+                (pt.task_name, pt.arguments, pt.kwargs, pt.name, pt.last_run_at)
+
+        # One batch for the missed run of the setUp task, however many
+        # tasks are checked
+        with patch("django_async_manager.scheduler.now", return_value=past):
+            with self.assertNumQueries(4):
+                self.scheduler.check_missed_tasks()
+
+
+class TestCatchUpPolicies(TestCase):
+    """Tests for the catch_up policies applied to missed runs."""
+
+    def setUp(self):
+        self.now = now().replace(minute=30, second=0, microsecond=0)
+        patcher = patch("django_async_manager.scheduler.now", return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _missed(self, catch_up, max_catch_up_runs=100):
+        # Hourly task whose last run was five hours ago
+        return PeriodicTaskFactory(
+            task_name=f"{__name__}.bulk_job",
+            crontab=CrontabScheduleFactory(minute="0"),
+            last_run_at=self.now - timedelta(hours=5, minutes=30),
+            catch_up=catch_up,
+            max_catch_up_runs=max_catch_up_runs,
+        )
+
+    def _scheduled_for(self, pt):
+        return list(
+            PeriodicTaskRun.objects.filter(periodic_task=pt)
+            .order_by("scheduled_for")
+            .values_list("scheduled_for", flat=True)
+        )
+
+    def test_skip(self):
+        """Test that skip enqueues nothing and moves past the missed runs."""
+        pt = self._missed("skip")
+
+        scheduler = BeatScheduler()
+
+        self.assertFalse(Task.objects.exists())
+        pt.refresh_from_db()
+        self.assertEqual(pt.last_run_at, self.now)
+        self.assertEqual(pt.total_run_count, 0)
+        self.assertEqual(
+            scheduler._schedule[pt.id]["next_run"], self.now + timedelta(minutes=30)
+        )
+
+    def test_run_once(self):
+        """Test that run_once enqueues one run for the latest missed time."""
+        pt = self._missed("run_once")
+
+        BeatScheduler()
+
+        self.assertEqual(self._scheduled_for(pt), [self.now - timedelta(minutes=30)])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_run_all_with_cap(self):
+        """Test that run_all enqueues the most recent missed runs up to its cap."""
+        everything = self._missed("run_all")
+        capped = self._missed("run_all", max_catch_up_runs=2)
+
+        BeatScheduler()
+
+        top_of_hour = self.now - timedelta(minutes=30)
+        self.assertEqual(
+            self._scheduled_for(everything),
+            [top_of_hour - timedelta(hours=h) for h in range(4, -1, -1)],
+        )
+        self.assertEqual(
+            self._scheduled_for(capped),
+            [top_of_hour - timedelta(hours=1), top_of_hour],
+        )
+        self.assertEqual(Task.objects.count(), 7)
+        everything.refresh_from_db()
+        self.assertEqual(everything.total_run_count, 5)
+
+
+class TestIncrementalSync(TestCase):
+    """Tests for applying schedule edits without reloading the schedule."""
+
+    def setUp(self):
+        self.tasks = [
+            PeriodicTaskFactory(crontab=CrontabScheduleFactory(minute="0"))
+            for _ in range(5)
+        ]
+        with patch.object(BeatScheduler, "check_missed_tasks"):
+            self.scheduler = BeatScheduler()
+
+    def test_no_changes_costs_two_queries(self):
+        """Test that polling an unchanged schedule runs two cheap queries."""
+        with self.assertNumQueries(2):
+            self.scheduler.sync_changes()
+        self.assertEqual(len(self.scheduler._schedule), 5)
+
+    def test_edits_are_applied(self):
+        """Test that new, edited, disabled and deleted tasks are synced."""
+        edited, disabled, deleted = self.tasks[:3]
+        edited.crontab.minute = "30"
+        edited.crontab.save()
+        disabled.enabled = False
+        disabled.save()
+        deleted.delete()
+        added = PeriodicTaskFactory(crontab=CrontabScheduleFactory(minute="15"))
+
+        self.scheduler.sync_changes()
+
+        schedule = self.scheduler._schedule
+        self.assertEqual(
+            set(schedule), {edited.id, added.id, *[t.id for t in self.tasks[3:]]}
+        )
+        self.assertEqual(schedule[edited.id]["next_run"].minute, 30)
+        self.assertEqual(schedule[added.id]["next_run"].minute, 15)
+        next_due, _ = self.scheduler.tick()
+        self.assertEqual(
+            next_due, min(entry["next_run"] for entry in schedule.values())
+        )
+
+    def test_changes_are_applied_once(self):
+        """
+        Test that rows fetched again because of the sync overlap are not
+        re-applied, so a never-run task due in between is not pushed back.
+        """
+        added = PeriodicTaskFactory(crontab=CrontabScheduleFactory(minute="*"))
+        self.assertEqual(self.scheduler.sync_changes(), 1)
+        due = self.scheduler._schedule[added.id]["next_run"]
+
+        with patch(
+            "django_async_manager.scheduler.now",
+            return_value=due + timedelta(seconds=1),
+        ):
+            self.assertEqual(self.scheduler.sync_changes(), 0)
+
+        self.assertEqual(self.scheduler._schedule[added.id]["next_run"], due)
+
+    def test_saving_wakes_the_scheduler(self):
+        """Test that saving a periodic task sets the schedule_changed event."""
+        scheduler_module.schedule_changed.clear()
+
+        self.tasks[0].save()
+
+        self.assertTrue(scheduler_module.schedule_changed.is_set())
+
+
+@background_task(queue="periodic")
+def bulk_job(n=0):
+    pass
+
+
+@background_task(idempotency_key=True)
+def idempotent_job():
+    pass
+
+
+def plain_job():
+    pass
+
+
+class TestEnqueueDueTasks(TestCase):
+    """Tests for enqueuing all periodic tasks due in a tick at once."""
+
+    def _due(self, count, task_name="bulk_job"):
+        run_time = now()
+        crontab = CrontabScheduleFactory()
+        return [
+            {
+                "task": PeriodicTaskFactory(
+                    task_name=f"{__name__}.{task_name}",
+                    arguments=[i],
+                    kwargs={},
+                    crontab=crontab,
+                ),
+                "run_time": run_time,
+            }
+            for i in range(count)
+        ]
+
+    def test_query_count_does_not_grow_with_due_tasks(self):
+        """Test that enqueuing 5 or 25 due tasks issues the same statements."""
+        # SQLite splits bulk inserts by its variable limit, so stay below it
+        small, large = self._due(5), self._due(25)
+
+        with self.assertNumQueries(6) as small_queries:
+            enqueue_due_tasks(small)
+        with self.assertNumQueries(len(small_queries)):
+            enqueue_due_tasks(large)
+
+        tasks = Task.objects.filter(name="bulk_job")
+        self.assertEqual(tasks.count(), 30)
+        self.assertEqual(set(tasks.values_list("queue", flat=True)), {"periodic"})
+        self.assertEqual(
+            set(PeriodicTask.objects.values_list("total_run_count", flat=True)), {1}
+        )
+
+    def test_mixed_and_failing_tasks(self):
+        """Test that run_async-only, plain and unresolvable tasks are handled."""
+        due = (
+            self._due(1)
+            + self._due(1, "idempotent_job")
+            + self._due(1, "plain_job")
+            + self._due(1, "missing_job")
+        )
+
+        enqueued = enqueue_due_tasks(due)
+
+        self.assertEqual(len(enqueued), 3)
+        self.assertEqual(
+            set(Task.objects.values_list("name", flat=True)),
+            {"bulk_job", "idempotent_job", f"{__name__}.plain_job"},
+        )
+        missing = due[-1]["task"]
+        missing.refresh_from_db()
+        self.assertIsNone(missing.last_run_at)
+        self.assertEqual(missing.total_run_count, 0)
+
+    def test_run_is_enqueued_once_per_due_time(self):
+        """Test that a run already recorded for its due time is skipped."""
+        due = self._due(2)
+        for task_info in due:
+            task_info["due_at"] = task_info["run_time"].replace(second=0, microsecond=0)
+
+        self.assertEqual(len(enqueue_due_tasks(due)), 2)
+        self.assertEqual(enqueue_due_tasks(due), [])
+
+        self.assertEqual(Task.objects.count(), 2)
+        run = PeriodicTaskRun.objects.get(periodic_task=due[0]["task"])
+        self.assertEqual(run.scheduled_for, due[0]["due_at"])
+        self.assertEqual(run.task.arguments["args"], [0])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PeriodicTaskRun.objects.create(
+                periodic_task=due[0]["task"], scheduled_for=due[0]["due_at"]
+            )
+
+    def _locked(self):
+        """Patch the run lookup to fail as on a database that stays locked."""
+        for patcher in (
+            patch("django_async_manager.utils.time.sleep"),
+            patch.object(
+                PeriodicTaskRun.objects,
+                "filter",
+                side_effect=OperationalError("database is locked"),
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_locked_database_raises(self):
+        """Test that giving up on a locked database raises instead of returning None."""
+        due = self._due(2)
+        self._locked()
+
+        with self.assertRaises(OperationalError):
+            enqueue_due_tasks(due)
+
+        self.assertFalse(Task.objects.exists())
+
+    def test_locked_database_during_catch_up(self):
+        """Test that a scheduler still starts when enqueuing missed runs fails."""
+        pt = PeriodicTaskFactory(
+            task_name=f"{__name__}.bulk_job",
+            crontab=CrontabScheduleFactory(minute="0", hour="3"),
+            last_run_at=now() - timedelta(days=2),
+        )
+        self._locked()
+
+        scheduler = BeatScheduler()
+
+        self.assertIn(pt.id, scheduler._schedule)
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_enqueue_is_retried(self):
+        """Test that runs the loop failed to enqueue are returned by the next tick."""
+        pt = PeriodicTaskFactory(
+            task_name=f"{__name__}.bulk_job",
+            crontab=None,
+            interval=IntervalScheduleFactory(every=1),
+            last_run_at=now() - timedelta(seconds=5),
+        )
+        stop_event = threading.Event()
+        attempts = []
+
+        def enqueue(due_tasks_info, lease=None):
+            if not due_tasks_info:
+                return []
+            attempts.append([info["due_at"] for info in due_tasks_info])
+            if len(attempts) == 1:
+                raise OperationalError("database is locked")
+            stop_event.set()
+            return enqueue_due_tasks(due_tasks_info, lease=lease)
+
+        with (
+            patch("django_async_manager.scheduler._sleep"),
+            patch(
+                "django_async_manager.scheduler.enqueue_due_tasks", side_effect=enqueue
+            ),
+        ):
+            run_scheduler_loop(stop_event=stop_event, lease_time=0)
+
+        self.assertEqual(attempts[1], attempts[0])
+        self.assertEqual(
+            list(
+                PeriodicTaskRun.objects.filter(periodic_task=pt).values_list(
+                    "scheduled_for", flat=True
+                )
+            ),
+            attempts[0],
+        )
+
+    def test_missed_run_is_not_repeated_by_the_first_tick(self):
+        """Test that a run enqueued by check_missed_tasks is not enqueued again."""
+        PeriodicTaskFactory(
+            task_name=f"{__name__}.bulk_job",
+            crontab=CrontabScheduleFactory(minute="0", hour="3"),
+            last_run_at=now() - timedelta(days=2),
+        )
+
+        scheduler = BeatScheduler()
+        _, due_tasks_info = scheduler.tick()
+        enqueue_due_tasks(due_tasks_info)
+
+        self.assertEqual(due_tasks_info, [])
+        self.assertEqual(Task.objects.filter(name="bulk_job").count(), 1)
+        self.assertEqual(PeriodicTaskRun.objects.count(), 1)
+
+
+class TestJitter(TestCase):
+    """Tests for jittered and spread run times."""
+
+    def setUp(self):
+        self.now = datetime.datetime(2025, 4, 6, 16, 0, 0, tzinfo=utc)
+        patcher = patch("django_async_manager.scheduler.now", return_value=self.now)
+        self.mock_now = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.crontab = CrontabScheduleFactory(minute="0")
+
+    def _hourly(self, name, **kwargs):
+        return PeriodicTaskFactory(
+            name=name,
+            task_name=f"{__name__}.plain_job",
+            crontab=self.crontab,
+            last_run_at=self.now - timedelta(minutes=1),
+            **kwargs,
+        )
+
+    def _run_loop(self, minutes, step=5):
+        """
+        Sync, tick and enqueue every `step` seconds for `minutes`, as
+        run_scheduler_loop() does with the default sync interval. Returns the
+        scheduled times of the recorded runs.
+        """
+        # Rows saved with the real clock would hide the scheduler's own
+        # updated_at bumps from the mocked one.
+        PeriodicTask.objects.update(updated_at=self.now - timedelta(minutes=1))
+        CrontabSchedule.objects.update(updated_at=self.now - timedelta(minutes=1))
+        with patch.object(BeatScheduler, "check_missed_tasks"):
+            scheduler = BeatScheduler()
+        for second in range(0, minutes * 60, step):
+            self.mock_now.return_value = self.now + timedelta(seconds=second)
+            scheduler.sync_changes()
+            _, due = scheduler.tick()
+            enqueue_due_tasks(due)
+        return list(
+            PeriodicTaskRun.objects.order_by("scheduled_for").values_list(
+                "scheduled_for", flat=True
+            )
+        )
+
+    def _expected_runs(self, offset, minutes, step=5):
+        """Every minute whose jittered time falls within the loop's ticks."""
+        last_tick = timedelta(seconds=(minutes * 60 - 1) // step * step)
+        return [
+            self.now + timedelta(minutes=m)
+            for m in range(-10, minutes)
+            if timedelta(0)
+            <= timedelta(minutes=m) + offset
+            <= last_tick + scheduler_module.DUE_GRACE
+        ]
+
+    def test_never_run_task_is_not_pushed_back_by_syncs(self):
+        """
+        Test that a task that never ran fires every minute although its
+        jittered time falls between schedule syncs.
+        """
+        pt = PeriodicTaskFactory(
+            task_name=f"{__name__}.plain_job",
+            crontab=CrontabScheduleFactory(minute="*"),
+            jitter=30,
+        )
+
+        runs = self._run_loop(minutes=10)
+
+        self.assertEqual(runs, self._expected_runs(pt.jitter_offset(), 10))
+        self.assertGreaterEqual(len(runs), 9)
+
+    def test_edit_before_the_jittered_time_keeps_the_run(self):
+        """
+        Test that re-applying a task that never ran, between its scheduled
+        and its jittered time, does not move it to the next slot.
+        """
+        pt = PeriodicTaskFactory(
+            name="every-minute",
+            task_name=f"{__name__}.plain_job",
+            crontab=CrontabScheduleFactory(minute="*"),
+            jitter=30,
+        )
+        offset = pt.jitter_offset()
+        self.assertGreater(offset, timedelta(seconds=1))
+        with patch.object(BeatScheduler, "check_missed_tasks"):
+            scheduler = BeatScheduler()
+        due = scheduler._schedule[pt.id]["next_run"]
+
+        self.mock_now.return_value = due + offset / 2
+        PeriodicTask.objects.filter(pk=pt.pk).update(
+            updated_at=now() + timedelta(seconds=1)
+        )
+        self.assertEqual(scheduler.sync_changes(), 1)
+
+        self.assertEqual(scheduler._schedule[pt.id]["next_run"], due)
+        self.mock_now.return_value = due + offset
+        _, due_tasks_info = scheduler.tick()
+        self.assertEqual([info["due_at"] for info in due_tasks_info], [due])
+
+    def test_jitter_longer_than_the_period(self):
+        """
+        Test that a window longer than the schedule's period delays the runs
+        without dropping any, also after the sync re-reads last_run_at.
+        """
+        pt = PeriodicTaskFactory(
+            task_name=f"{__name__}.plain_job",
+            crontab=CrontabScheduleFactory(minute="*"),
+            jitter=300,
+        )
+
+        runs = self._run_loop(minutes=20)
+
+        self.assertEqual(runs, self._expected_runs(pt.jitter_offset(), 20))
+        self.assertGreaterEqual(len(runs), 15)
+        pt.refresh_from_db()
+        self.assertEqual(pt.total_run_count, len(runs))
+
+    def test_jittered_task_fires_after_its_offset(self):
+        """
+        Test that a jittered task is not due at the scheduled time but at the
+        scheduled time plus its offset, and that the run is recorded for the
+        scheduled time.
+        """
+        pt = self._hourly("hourly-export", jitter=600)
+        offset = pt.jitter_offset()
+        scheduler = BeatScheduler()
+        hour = self.now
+
+        next_due, due = scheduler.tick()
+        self.assertEqual(due, [])
+        self.assertEqual(next_due, hour + offset)
+
+        self.mock_now.return_value = hour + offset
+        _, due = scheduler.tick()
+        self.assertEqual([info["task"].id for info in due], [pt.id])
+        self.assertEqual(due[0]["due_at"], hour)
+        self.assertEqual(
+            scheduler._schedule[pt.id]["next_run"], hour + timedelta(hours=1)
+        )
+
+    def test_spread_tasks_are_spaced_evenly(self):
+        """Test that spread tasks of one schedule share their window evenly."""
+        for name in ("c", "a", "b", "d"):
+            self._hourly(name, jitter=60, spread=True)
+        other = self._hourly("other", jitter=60)
+
+        scheduler = BeatScheduler()
+        offsets = {
+            scheduler._schedule[pk]["task"].name: offset
+            for pk, offset in scheduler._offsets.items()
+        }
+
+        self.assertEqual(
+            [offsets[name] for name in ("a", "b", "c", "d")],
+            [timedelta(seconds=s) for s in (0, 15, 30, 45)],
+        )
+        self.assertEqual(offsets["other"], other.jitter_offset())
+
+    def test_missed_run_waits_for_its_offset(self):
+        """
+        Test that after a restart only runs whose jittered time has passed are
+        caught up on; the others are left to the next tick.
+        """
+        export = self._hourly("hourly-export", jitter=3600, spread=True)
+        later = self._hourly("hourly-import", jitter=3600, spread=True)
+        PeriodicTask.objects.update(
+            last_run_at=self.now - timedelta(hours=1, minutes=1)
+        )
+        # 15:10: the 15:00 export was due at 15:00, the import only at 15:30
+        self.mock_now.return_value = self.now - timedelta(minutes=50)
+
+        scheduler = BeatScheduler()
+
+        self.assertEqual(
+            list(Task.objects.values_list("name", flat=True)), [f"{__name__}.plain_job"]
+        )
+        self.assertEqual(PeriodicTaskRun.objects.get().periodic_task_id, export.id)
+        self.assertEqual(
+            scheduler._schedule[later.id]["next_run"], self.now - timedelta(hours=1)
+        )
+
+
+class TestScheduleHeap(TestCase):
+    """Tests for the heap-based due-time index of BeatScheduler."""
+
+    def setUp(self):
+        self.now = datetime.datetime(2025, 4, 6, 16, 0, 0, tzinfo=utc)
+        patcher = patch("django_async_manager.scheduler.now", return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = BeatScheduler()
+
+    def entry(self, pk, minutes, interval=10):
+        task = MagicMock(id=pk)
+        task.name = f"task-{pk}"
+        task.schedule.get_next_run_time.side_effect = lambda base_time: (
+            base_time + timedelta(minutes=interval)
+        )
+        self.scheduler.set_next_run(pk, self.now + timedelta(minutes=minutes), task)
+        return task
+
+    def test_only_due_entries_are_returned(self):
+        """Test that a tick pops due entries and reports the earliest next run."""
+        self.entry(1, -2)
+        self.entry(2, -1)
+        self.entry(3, 5)
+
+        next_due, due = self.scheduler.tick()
+
+        self.assertEqual([info["task"].id for info in due], [1, 2])
+        self.assertEqual(next_due, self.now + timedelta(minutes=5))
+        self.assertEqual(
+            self.scheduler._schedule[1]["next_run"], self.now + timedelta(minutes=10)
+        )
+
+    def test_removed_and_rescheduled_entries_are_skipped(self):
+        """Test that stale heap items are discarded lazily."""
+        self.entry(1, -1)
+        task = self.entry(2, -1)
+        self.scheduler.remove(1)
+        self.scheduler.set_next_run(2, self.now + timedelta(minutes=3), task)
+
+        next_due, due = self.scheduler.tick()
+
+        self.assertEqual(due, [])
+        self.assertEqual(next_due, self.now + timedelta(minutes=3))
+
+    def test_entry_due_again_within_grace_runs_once_per_tick(self):
+        """Test that an entry rescheduled into the grace period is not repeated."""
+        self.entry(1, -1, interval=0)
+
+        _, due = self.scheduler.tick()
+
+        self.assertEqual(len(due), 1)
+
+    def test_shared_crontab_is_computed_once_per_tick(self):
+        """Test that due entries sharing a crontab share one next-run computation."""
+        crontab = CrontabScheduleFactory(minute="*/5")
+        tasks = [PeriodicTaskFactory(crontab=crontab) for _ in range(3)]
+        for task in tasks:
+            self.scheduler.set_next_run(task.id, self.now - timedelta(minutes=1), task)
+
+        with patch.object(
+            CrontabSchedule,
+            "get_next_run_time",
+            autospec=True,
+            return_value=self.now + timedelta(minutes=5),
+        ) as get_next_run_time:
+            _, due = self.scheduler.tick()
+
+        self.assertEqual(len(due), 3)
+        get_next_run_time.assert_called_once()
+
+    def test_heap_is_compacted(self):
+        """Test that repeated rescheduling does not grow the heap without bound."""
+        task = self.entry(1, 5)
+        for minutes in range(500):
+            self.scheduler.set_next_run(1, self.now + timedelta(minutes=minutes), task)
+
+        self.assertLess(len(self.scheduler._heap), 100)
+        next_due, _ = self.scheduler.tick()
+        self.assertEqual(next_due, self.now + timedelta(minutes=499))
+
 
 class TestRunSchedulerLoop(TestCase):
     def setUp(self):
@@ -149,17 +779,10 @@ class TestRunSchedulerLoop(TestCase):
 
     def test_run_scheduler_loop_single_iteration(self):
         """
-        Test run_scheduler_loop by patching time.sleep so that after one iteration
-        the scheduler raises KeyboardInterrupt. Then, verify that a Task entry was created.
+        Test run_scheduler_loop by setting the stop event while the scheduler
+        sleeps after its first iteration. Then, verify that a Task entry was created.
         """
-        call_count = 0
-
-        def fake_sleep(seconds):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 1:
-                raise KeyboardInterrupt("Break loop after one iteration")
-
+        stop_event = threading.Event()
         dummy_module = types.SimpleNamespace()
 
         def stub_run_async(*args, **kwargs):
@@ -172,10 +795,12 @@ class TestRunSchedulerLoop(TestCase):
         stub_run_async.run_async = stub_run_async
         dummy_module.dummy_task = stub_run_async
 
-        with patch("time.sleep", side_effect=fake_sleep):
+        with patch.object(
+            stop_event, "wait", side_effect=lambda timeout=None: stop_event.set()
+        ) as mock_wait:
             with patch("importlib.import_module", return_value=dummy_module):
-                with self.assertRaises(KeyboardInterrupt):
-                    run_scheduler_loop()
+                run_scheduler_loop(stop_event=stop_event)
 
+        mock_wait.assert_called_once()
         tasks_created = Task.objects.filter(name=self.periodic_task.task_name)
         self.assertGreaterEqual(tasks_created.count(), 1)
@@ -1,6 +1,7 @@
 from io import StringIO
 from django.test import TestCase, override_settings
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django_async_manager.models import PeriodicTask
 
 
@@ -100,3 +101,90 @@ class UpdateBeatScheduleCommandTests(TestCase):
             cs = pt_updated.crontab
             self.assertEqual(cs.minute, "0")
             self.assertEqual(cs.hour, "10")
+
+    @override_settings(
+        BEAT_SCHEDULE={
+            "nightly-billing": {
+                "task": "billing.tasks.charge",
+                "schedule": {"minute": "0", "hour": "2"},
+                "catch_up": "run_all",
+                "max_catch_up_runs": 7,
+            }
+        }
+    )
+    def test_catch_up_policy(self):
+        """Test that catch_up and max_catch_up_runs are applied."""
+        call_command("update_beat_schedule", stdout=StringIO())
+
+        pt = PeriodicTask.objects.get(name="nightly-billing")
+        self.assertEqual(pt.catch_up, "run_all")
+        self.assertEqual(pt.max_catch_up_runs, 7)
+
+    @override_settings(
+        BEAT_SCHEDULE={
+            "nightly-billing": {
+                "task": "billing.tasks.charge",
+                "schedule": {"minute": "0", "hour": "2"},
+                "catch_up": "always",
+            }
+        }
+    )
+    def test_invalid_catch_up_policy(self):
+        """Test that an unknown catch_up policy is rejected."""
+        with self.assertRaises(CommandError):
+            call_command("update_beat_schedule", stdout=StringIO())
+
+    @override_settings(
+        BEAT_SCHEDULE={
+            "heartbeat": {
+                "task": "monitoring.tasks.heartbeat",
+                "schedule": {
+                    "every": 500,
+                    "period": "milliseconds",
+                    "anchor": "2025-01-01T00:00:00+00:00",
+                },
+            }
+        }
+    )
+    def test_interval_schedule(self):
+        """Test that a schedule with 'every' creates an anchored interval."""
+        call_command("update_beat_schedule", stdout=StringIO())
+
+        pt = PeriodicTask.objects.get(name="heartbeat")
+        self.assertIsNone(pt.crontab)
+        self.assertEqual(pt.interval.every, 500)
+        self.assertEqual(pt.interval.period, "milliseconds")
+        self.assertEqual(pt.interval.anchor.isoformat(), "2025-01-01T00:00:00+00:00")
+
+    @override_settings(
+        BEAT_SCHEDULE={
+            "tight-loop": {
+                "task": "monitoring.tasks.heartbeat",
+                "schedule": {"every": 50, "period": "milliseconds"},
+            }
+        }
+    )
+    def test_interval_below_minimum_is_rejected(self):
+        """Test that intervals shorter than the scheduler can keep are rejected."""
+        with self.assertRaisesMessage(CommandError, "minimum of 100 milliseconds"):
+            call_command("update_beat_schedule", stdout=StringIO())
+
+        self.assertFalse(PeriodicTask.objects.filter(name="tight-loop").exists())
+
+    @override_settings(
+        BEAT_SCHEDULE={
+            "hourly-export": {
+                "task": "reports.tasks.export",
+                "schedule": {"minute": "0"},
+                "jitter": 300,
+                "spread": True,
+            }
+        }
+    )
+    def test_jitter_and_spread(self):
+        """Test that jitter and spread are applied."""
+        call_command("update_beat_schedule", stdout=StringIO())
+
+        pt = PeriodicTask.objects.get(name="hourly-export")
+        self.assertEqual(pt.jitter, 300)
+        self.assertTrue(pt.spread)
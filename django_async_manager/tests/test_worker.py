@@ -1,11 +1,21 @@
-from django.test import TestCase
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.test import TestCase, override_settings
 from django.utils.timezone import now, timedelta
 from unittest.mock import patch, MagicMock
 
 from django_async_manager.decorators import background_task
 from django_async_manager.models import Task
 from django_async_manager.tests.factories import TaskFactory
-from django_async_manager.worker import execute_task, TimeoutException
+from django_async_manager.worker import (
+    execute_task,
+    TimeoutException,
+    TaskWorker,
+    WorkerManager,
+    WorkerShutdown,
+    age_pending_tasks,
+)
 
 
 def dummy_task_function():
@@ -16,6 +26,18 @@ def sample_function_for_execution(a, b):
     return a + b
 
 
+def failing_function():
+    raise ValueError("boom")
+
+
+release_blocking_function = threading.Event()
+
+
+def blocking_function():
+    release_blocking_function.wait(5)
+    return "released"
+
+
 class TestExecuteTask(TestCase):
     """Tests for the execute_task function."""
 
@@ -211,3 +233,408 @@ class TestTask(TestCase):
 
         task = dummy_custom.run_async()
         self.assertEqual(task.queue, "config")
+
+
+class TestPriorityAging(TestCase):
+    """Tests for priority aging of waiting tasks."""
+
+    def _create_waiting_task(self, priority="low", waited=timedelta(minutes=10)):
+        return TaskFactory.from_string_priority(
+            priority=priority,
+            status="pending",
+            created_at=now() - waited,
+            scheduled_at=None,
+        )
+
+    def test_waiting_task_is_bumped_one_level(self):
+        """Test that a task waiting longer than the interval gains one priority level."""
+        task = self._create_waiting_task()
+
+        aged = age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"])
+
+        task.refresh_from_db()
+        self.assertEqual(aged, 1)
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["medium"])
+        self.assertIsNotNone(task.aged_at)
+
+    def test_task_is_bumped_once_per_interval(self):
+        """Test that a freshly aged task is not bumped again within the interval."""
+        task = self._create_waiting_task()
+
+        age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"])
+        aged = age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"])
+
+        task.refresh_from_db()
+        self.assertEqual(aged, 0)
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["medium"])
+
+    def test_aging_respects_max_priority(self):
+        """Test that aging never raises a task above the configured cap."""
+        task = self._create_waiting_task(priority="high")
+
+        aged = age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["high"])
+
+        task.refresh_from_db()
+        self.assertEqual(aged, 0)
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["high"])
+
+    def test_fresh_and_future_tasks_do_not_age(self):
+        """Test that recently created and not yet ready tasks keep their priority."""
+        fresh = self._create_waiting_task(waited=timedelta(seconds=5))
+        future = self._create_waiting_task()
+        future.scheduled_at = now() + timedelta(minutes=5)
+        future.save()
+
+        age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"])
+
+        fresh.refresh_from_db()
+        future.refresh_from_db()
+        self.assertEqual(fresh.priority, Task.PRIORITY_MAPPING["low"])
+        self.assertEqual(future.priority, Task.PRIORITY_MAPPING["low"])
+
+    def test_tasks_waiting_on_dependencies_do_not_age(self):
+        """
+        Test that a task ages only once its dependencies have been complete
+        for an interval, not while it is blocked on them.
+        """
+        dependency = TaskFactory(status="in_progress", scheduled_at=None)
+        blocked = self._create_waiting_task()
+        blocked.dependencies.add(dependency)
+
+        self.assertEqual(
+            age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"]), 0
+        )
+
+        dependency.status = "completed"
+        dependency.completed_at = now()
+        dependency.save()
+        self.assertEqual(
+            age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"]), 0
+        )
+
+        Task.objects.filter(pk=dependency.pk).update(
+            completed_at=now() - timedelta(minutes=2)
+        )
+        self.assertEqual(
+            age_pending_tasks("default", 60, Task.PRIORITY_MAPPING["critical"]), 1
+        )
+
+    def test_retry_after_aging_uses_declared_priority(self):
+        """Test that a claim restores the priority the task had before aging."""
+        task = self._create_waiting_task()
+        task.queue = "aging"
+        task.name = "django_async_manager.tests.test_worker.failing_function"
+        task.max_retries = 3
+        task.save()
+        age_pending_tasks("aging", 60, Task.PRIORITY_MAPPING["critical"])
+        worker = TaskWorker(worker_id="aging-worker", queue="aging")
+
+        try:
+            worker.process_task()
+        finally:
+            worker.shutdown()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "pending")
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["low"])
+        self.assertIsNone(task.base_priority)
+        self.assertIsNone(task.aged_at)
+
+    @override_settings(ASYNC_MANAGER_PRIORITY_AGING_INTERVAL=60)
+    def test_worker_ages_priorities_before_acquiring(self):
+        """Test that the worker applies aging when it is enabled in settings."""
+        task = self._create_waiting_task()
+        task.queue = "aging"
+        task.save()
+        worker = TaskWorker(worker_id="aging-worker", queue="aging")
+
+        try:
+            worker.age_priorities()
+        finally:
+            worker.shutdown()
+
+        task.refresh_from_db()
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["medium"])
+
+    def test_worker_aging_disabled_by_default(self):
+        """Test that aging is a no-op unless configured."""
+        task = self._create_waiting_task()
+        worker = TaskWorker(worker_id="plain-worker")
+
+        try:
+            worker.age_priorities()
+        finally:
+            worker.shutdown()
+
+        task.refresh_from_db()
+        self.assertEqual(task.priority, Task.PRIORITY_MAPPING["low"])
+
+
+class TestGracefulShutdown(TestCase):
+    """Tests for draining a worker on shutdown."""
+
+    def setUp(self):
+        self.worker = TaskWorker(worker_id="draining-worker", queue="draining")
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _create_task(self):
+        return TaskFactory(
+            name="django_async_manager.tests.test_worker.dummy_task_function",
+            queue="draining",
+            status="pending",
+            scheduled_at=None,
+            worker_id=None,
+        )
+
+    def test_interrupt_abandons_running_task(self):
+        """Test that execute_task stops waiting once interrupt() returns True."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(release_blocking_function.clear)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release_blocking_function.set)
+
+        with self.assertRaises(WorkerShutdown):
+            execute_task(
+                "django_async_manager.tests.test_worker.blocking_function",
+                [],
+                {},
+                timeout=10,
+                use_threads=True,
+                executor=executor,
+                interrupt=lambda: True,
+            )
+
+    def test_stopped_worker_does_not_claim(self):
+        """Test that a stopped worker leaves pending tasks alone."""
+        task = self._create_task()
+        self.worker.stop()
+
+        self.worker.process_task()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "pending")
+        self.assertEqual(task.attempts, 0)
+
+    def test_task_claimed_while_stopping_is_returned(self):
+        """Test that a task claimed after the stop signal is not started."""
+        task = self._create_task()
+
+        with patch.object(self.worker, "age_priorities", side_effect=self.worker.stop):
+            with patch("django_async_manager.worker.execute_task") as mock_execute:
+                self.worker.process_task()
+
+        mock_execute.assert_not_called()
+        task.refresh_from_db()
+        self.assertEqual(task.worker_id, "draining-worker")
+        self.assertEqual(task.status, "pending")
+        self.assertIsNone(task.started_at)
+        self.assertEqual(task.attempts, 0)
+        self.assertEqual(self.worker.exit_code, 0)
+
+    def test_abandoned_task_is_returned_to_queue(self):
+        """Test that a task abandoned after the grace period goes back to pending."""
+        task = self._create_task()
+
+        with patch(
+            "django_async_manager.worker.execute_task", side_effect=WorkerShutdown()
+        ):
+            self.worker.process_task()
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "pending")
+        self.assertEqual(task.attempts, 0)
+        self.assertEqual(task.last_errors, [])
+        self.assertEqual(self.worker.exit_code, 1)
+
+
+class TestDebouncedTasks(TestCase):
+    """Tests for claimed debounced tasks going back to pending."""
+
+    def setUp(self):
+        self.worker = TaskWorker(worker_id="debounce-worker", queue="debounced")
+        self.task = self._create_task()
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def _create_task(self):
+        return TaskFactory(
+            name="django_async_manager.tests.test_worker.failing_function",
+            queue="debounced",
+            status="pending",
+            scheduled_at=None,
+            worker_id=None,
+            max_retries=3,
+            debounce_key="rebuild:home",
+        )
+
+    def _run_while_enqueued_again(self, error):
+        """Run the task while an identical enqueue creates a new pending task."""
+
+        def execute(*args, **kwargs):
+            self.twin = self._create_task()
+            raise error
+
+        with patch("django_async_manager.worker.execute_task", side_effect=execute):
+            self.worker.process_task()
+        self.task.refresh_from_db()
+
+    def test_retry_does_not_clash_with_new_enqueue(self):
+        """Test that a failed debounced task is retried next to a newer enqueue."""
+        self._run_while_enqueued_again(ValueError("boom"))
+
+        self.assertEqual(self.task.status, "pending")
+        self.assertIn("boom", self.task.last_errors[-1])
+        self.assertIsNone(self.task.debounce_key)
+        self.twin.refresh_from_db()
+        self.assertEqual(self.twin.status, "pending")
+        self.assertEqual(self.twin.debounce_key, "rebuild:home")
+
+    def test_return_to_queue_does_not_clash_with_new_enqueue(self):
+        """Test that a debounced task abandoned on shutdown goes back to pending."""
+        self._run_while_enqueued_again(WorkerShutdown())
+
+        self.assertEqual(self.task.status, "pending")
+        self.assertEqual(self.task.attempts, 0)
+
+
+class TestRecycling(TestCase):
+    """Tests for replacing long-running child processes."""
+
+    def test_pool_is_replaced_after_max_tasks(self):
+        """Test that the process pool is recreated after max_tasks_per_child tasks."""
+        worker = TaskWorker(
+            worker_id="recycling-worker", use_threads=False, max_tasks_per_child=2
+        )
+        self.addCleanup(worker.shutdown)
+        original_executor = worker.executor
+
+        worker.tasks_since_recycle = 1
+        worker.recycle_if_needed()
+        self.assertIs(worker.executor, original_executor)
+
+        worker.tasks_since_recycle = 2
+        worker.recycle_if_needed()
+        self.assertIsNot(worker.executor, original_executor)
+        self.assertEqual(worker.tasks_since_recycle, 0)
+
+    def test_pool_is_replaced_above_memory_limit(self):
+        """Test that the process pool is recreated when a child grows too large."""
+        worker = TaskWorker(
+            worker_id="recycling-worker", use_threads=False, max_memory_per_child=512
+        )
+        self.addCleanup(worker.shutdown)
+        original_executor = worker.executor
+
+        with patch.object(worker, "_child_rss_mb", return_value=256.0):
+            worker.recycle_if_needed()
+        self.assertIs(worker.executor, original_executor)
+
+        with patch.object(worker, "_child_rss_mb", return_value=600.0):
+            worker.recycle_if_needed()
+        self.assertIsNot(worker.executor, original_executor)
+
+    def test_worker_process_exits_when_recycled(self):
+        """Test that a worker running in its own process leaves run() to be replaced."""
+        worker = TaskWorker(
+            worker_id="recycling-worker", max_tasks_per_child=1, recycle_process=True
+        )
+
+        def process_task():
+            worker.tasks_since_recycle += 1
+
+        with patch.object(worker, "process_task", side_effect=process_task):
+            worker.run()
+
+        self.assertFalse(worker.stop_event.is_set())
+        self.assertEqual(worker.exit_code, 0)
+
+    def test_manager_replaces_workers_that_exited_on_their_own(self):
+        """Test that recycled workers are replaced but retired ones are not."""
+        manager = WorkerManager(num_workers=2)
+        recycled = MagicMock(is_alive=MagicMock(return_value=False))
+        recycled.name = "worker-default-1"
+        retired = MagicMock(is_alive=MagicMock(return_value=False))
+        retired.name = "worker-default-2"
+        manager.workers = [recycled, retired]
+        manager._stop_events = {
+            recycled.name: threading.Event(),
+            retired.name: threading.Event(),
+        }
+        manager._stop_events[retired.name].set()
+
+        with patch.object(manager, "_start_worker") as mock_start_worker:
+            manager.replace_exited_workers()
+
+        mock_start_worker.assert_called_once()
+        self.assertEqual(manager.workers, [])
+
+
+class TestTimingBreakdown(TestCase):
+    """Tests for the timing breakdown recorded on finished tasks."""
+
+    def _run_task(self, func_name, **task_options):
+        task = TaskFactory(
+            name=f"django_async_manager.tests.test_worker.{func_name}",
+            arguments={"args": [], "kwargs": {}},
+            queue="timing",
+            status="pending",
+            scheduled_at=None,
+            created_at=now() - timedelta(seconds=2),
+            **task_options,
+        )
+        worker = TaskWorker(worker_id="timing-worker", queue="timing")
+        try:
+            worker.process_task()
+        finally:
+            worker.shutdown()
+        task.refresh_from_db()
+        return task
+
+    def test_completed_task_records_timings(self):
+        """Test that a completed task stores every timing field."""
+        task = self._run_task("dummy_task_function")
+
+        self.assertEqual(task.status, "completed")
+        self.assertGreaterEqual(task.queue_wait_ms, 2000)
+        for field in ("exec_ms", "overhead_ms", "cpu_time_ms", "peak_rss_mb"):
+            self.assertIsNotNone(getattr(task, field), field)
+        self.assertGreater(task.peak_rss_mb, 0)
+
+    def test_failed_attempt_records_timings(self):
+        """Test that a failed attempt stores its end time and timings."""
+        task = self._run_task("failing_function", max_retries=1)
+
+        self.assertEqual(task.status, "failed")
+        self.assertIsNotNone(task.completed_at)
+        self.assertIsNotNone(task.exec_ms)
+        self.assertIsNotNone(task.overhead_ms)
+
+    def test_process_pool_returns_stats(self):
+        """Test that stats measured in a pool process reach the parent, also on errors."""
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            stats = {}
+            result = execute_task(
+                "django_async_manager.tests.test_worker.sample_function_for_execution",
+                [2, 3],
+                {},
+                timeout=10,
+                executor=executor,
+                stats=stats,
+            )
+            self.assertEqual(result, 5)
+            self.assertEqual(set(stats), {"exec_ms", "cpu_time_ms", "peak_rss_mb"})
+
+            stats = {}
+            with self.assertRaises(ValueError):
+                execute_task(
+                    "django_async_manager.tests.test_worker.failing_function",
+                    [],
+                    {},
+                    timeout=10,
+                    executor=executor,
+                    stats=stats,
+                )
+            self.assertIn("exec_ms", stats)
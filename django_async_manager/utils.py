@@ -1,11 +1,19 @@
+import hashlib
+import json
 import logging
+import os
 import random
+import signal
+import threading
 import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, TypeVar, Any
+from typing import Callable, TypeVar, Any, Dict, Iterator, Sequence
 
 from django.db import OperationalError
 
+from django_async_manager.metrics import DB_LOCK_RETRIES
+
 T = TypeVar("T")
 
 logger = logging.getLogger("django_async_manager.utils")
@@ -41,6 +49,9 @@ def with_database_lock_handling(
                     if "database is locked" in str(e):
                         retry_count += 1
                         if retry_count < max_retries:
+                            DB_LOCK_RETRIES.inc(
+                                function=getattr(func, "__name__", "function")
+                            )
                             sleep_time = min(
                                 (2**retry_count) * 0.1 + (random.random() * 0.1),
                                 max_sleep_time,
@@ -83,3 +94,54 @@ def with_database_lock_handling(
         return wrapper
 
     return decorator
+
+
+def make_task_key(name: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> str:
+    """
+    Build a stable key identifying a task invocation from its name and arguments.
+    Arguments are serialized as canonical JSON, so equal arguments always map to
+    the same key regardless of keyword order or process.
+    """
+    payload = json.dumps(
+        [name, list(args), kwargs], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@contextmanager
+def handle_shutdown_signals(
+    on_shutdown: Callable[[], None],
+    logger_name: str = "django_async_manager.utils",
+) -> Iterator[None]:
+    """
+    Call on_shutdown on the first SIGTERM or SIGINT and exit immediately on the
+    second one. The previous handlers are restored on exit. Does nothing when
+    not running in the main thread, where signal handlers cannot be installed.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    log = logging.getLogger(logger_name)
+    received = []
+
+    def _handler(signum, frame):
+        received.append(signum)
+        if len(received) > 1:
+            log.warning("Received a second shutdown signal, exiting immediately.")
+            os._exit(128 + signum)
+        log.info(
+            f"Received {signal.Signals(signum).name}, shutting down gracefully "
+            "(send again to exit immediately)."
+        )
+        on_shutdown()
+
+    previous = {
+        signum: signal.signal(signum, _handler)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
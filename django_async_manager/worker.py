@@ -1,16 +1,38 @@
 import logging
 import importlib
 import multiprocessing
+import os
+import queue as queue_module
+import signal
 import threading
 import time
 import traceback
 import psutil
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
-
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError,
+    wait,
+)
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Q, Count, F
+from django.db.models import Q, Count, Exists, F, OuterRef
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
+from django_async_manager.autoscale import Autoscaler
+from django_async_manager import metrics
+from django_async_manager.limits import get_rate_limiter, has_free_concurrency_slot
+from django_async_manager.middleware import run_hook
 from django_async_manager.models import Task, TASK_REGISTRY
+from django_async_manager.profiling import (
+    TaskProfiler,
+    profile_modes_for,
+    save_profile,
+)
+from django_async_manager.result_cache import get_result_cache
+from django_async_manager.utils import make_task_key
 
 logger = logging.getLogger("django_async_manager.worker")
 
@@ -27,12 +49,46 @@ class MemoryLimitExceeded(Exception):
     pass
 
 
-def _execute_task_in_process(func_path, args, kwargs, memory_limit=None):
+class WorkerShutdown(Exception):
+    """Raised when a task is abandoned because its worker's shutdown grace period ran out."""
+
+    pass
+
+
+def _ignore_shutdown_signals():
+    """
+    Initializer for executor and worker child processes. SIGINT and SIGTERM
+    sent to the whole process group are left to the parent, which drains
+    its children and kills the ones still busy when the grace period ends.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def _execute_task_in_process(
+    func_path,
+    args,
+    kwargs,
+    memory_limit=None,
+    task_info=None,
+    collect_stats=False,
+    profile=None,
+):
     """
     Helper function executed IN THE CHILD PROCESS.
     Imports the module, finds the original function, and executes it.
-    Also monitors memory usage if a limit is set.
+    Also monitors memory usage if a limit is set, and runs the pre_execute and
+    post_execute middleware hooks when task_info is given.
+
+    With collect_stats, returns (result, stats) where stats holds exec_ms,
+    cpu_time_ms and peak_rss_mb of the call; exceptions carry the same dict
+    in their task_stats attribute.
+
+    With profile (a tuple of PROFILE_MODES), the call runs under the given
+    profilers and the compressed result is added to stats as "profile".
     """
+    collect_stats = collect_stats or bool(profile)
+    child_stats = None
     try:
         from django import db
 
@@ -40,6 +96,7 @@ def _execute_task_in_process(func_path, args, kwargs, memory_limit=None):
 
         memory_exceeded = False
         memory_usage = 0.0
+        memory_peak = 0.0
 
         if memory_limit is not None:
             process = psutil.Process()
@@ -47,10 +104,11 @@ def _execute_task_in_process(func_path, args, kwargs, memory_limit=None):
             stop_monitoring = threading.Event()
 
             def monitor_memory():
-                nonlocal memory_exceeded, memory_usage
+                nonlocal memory_exceeded, memory_usage, memory_peak
                 while not stop_monitoring.is_set():
                     current_memory = process.memory_info().rss / (1024 * 1024)
                     memory_usage = current_memory
+                    memory_peak = max(memory_peak, current_memory)
 
                     if current_memory > memory_limit:
                         logger.warning(
@@ -83,7 +141,43 @@ def _execute_task_in_process(func_path, args, kwargs, memory_limit=None):
             logger.error(error_msg)
             raise TypeError(error_msg)
 
-        result = func_to_run(*args, **kwargs)
+        if task_info is not None:
+            run_hook("pre_execute", task_info=task_info, args=args, kwargs=kwargs)
+        if collect_stats:
+            rss_before = psutil.Process().memory_info().rss / (1024 * 1024)
+        cpu_started = time.thread_time()
+        started = time.monotonic()
+        result = exception = None
+        profiler = TaskProfiler(profile) if profile else None
+        try:
+            if profiler is not None:
+                profiler.start()
+            result = func_to_run(*args, **kwargs)
+        except Exception as e:
+            exception = e
+            raise
+        finally:
+            duration = time.monotonic() - started
+            profile_payload = profiler.stop() if profiler is not None else None
+            if collect_stats:
+                rss_after = psutil.Process().memory_info().rss / (1024 * 1024)
+                child_stats = {
+                    "exec_ms": duration * 1000,
+                    "cpu_time_ms": (time.thread_time() - cpu_started) * 1000,
+                    "peak_rss_mb": max(rss_before, rss_after, memory_peak),
+                }
+                if profile_payload is not None:
+                    child_stats["profile"] = profile_payload
+            if task_info is not None:
+                run_hook(
+                    "post_execute",
+                    task_info=task_info,
+                    args=args,
+                    kwargs=kwargs,
+                    result=result,
+                    exception=exception,
+                    duration=duration,
+                )
 
         if memory_limit is not None:
             stop_monitoring.set()
@@ -95,9 +189,13 @@ def _execute_task_in_process(func_path, args, kwargs, memory_limit=None):
                     f"Task {func_path} exceeded memory limit of {memory_limit} MB (used {memory_usage:.2f} MB)"
                 )
 
+        if collect_stats:
+            return result, child_stats
         return result
     except Exception as e:
         logger.debug(f"Exception in child process for {func_path}: {e}", exc_info=True)
+        if child_stats is not None:
+            e.task_stats = child_stats
         raise e
 
 
@@ -109,6 +207,10 @@ def execute_task(
     use_threads=False,
     memory_limit=None,
     executor=None,
+    interrupt=None,
+    task_info=None,
+    stats=None,
+    profile=None,
 ):
     """
     Submits the task execution (defined by func_path) to either a ThreadPoolExecutor or ProcessPoolExecutor.
@@ -122,7 +224,17 @@ def execute_task(
         use_threads: If True, use ThreadPoolExecutor, otherwise use ProcessPoolExecutor
         memory_limit: Maximum memory usage in MB (None for no limit)
         executor: An existing executor to use (if None, a new one will be created)
+        interrupt: Optional callable polled while waiting for the result; once it
+            returns True the task is abandoned and WorkerShutdown is raised
+        task_info: Optional dict with the task's "id", "name" and "queue", passed
+            to the pre_execute/post_execute middleware hooks in the child
+        stats: Optional dict filled with exec_ms, cpu_time_ms and peak_rss_mb
+            measured in the child, also when the task raises
+        profile: Optional tuple of profilers ("cprofile", "tracemalloc") to run
+            the task under; the payload is stored in stats["profile"]
     """
+    if profile and stats is None:
+        stats = {}
     try:
         module_name, func_name = func_path.rsplit(".", 1)
         module = importlib.import_module(module_name)
@@ -162,15 +274,36 @@ def execute_task(
                     f"Memory limit of {memory_limit} MB specified for task {func_path} but memory limits are not supported with threads. "
                     f"The limit will be ignored. Use processes (use_threads=False) for memory limiting."
                 )
-            future = executor.submit(_execute_task_in_process, func_path, args, kwargs)
+            future = executor.submit(
+                _execute_task_in_process,
+                func_path,
+                args,
+                kwargs,
+                task_info=task_info,
+                collect_stats=stats is not None,
+                profile=profile,
+            )
         else:
             future = executor.submit(
-                _execute_task_in_process, func_path, args, kwargs, memory_limit
+                _execute_task_in_process,
+                func_path,
+                args,
+                kwargs,
+                memory_limit,
+                task_info=task_info,
+                collect_stats=stats is not None,
+                profile=profile,
             )
 
         try:
             start_time = time.time()
-            result = future.result(timeout=timeout)
+            if interrupt is None:
+                result = future.result(timeout=timeout)
+            else:
+                result = _wait_for_result(future, timeout, interrupt)
+            if stats is not None:
+                result, child_stats = result
+                stats.update(child_stats)
 
             execution_time = time.time() - start_time
             logger.debug(f"Task {func_path} completed in {execution_time:.2f} seconds")
@@ -183,35 +316,261 @@ def execute_task(
             raise TimeoutException(
                 f"Task {func_path} exceeded timeout of {timeout} seconds (ran for {execution_time:.2f} seconds)"
             )
-        except MemoryLimitExceeded as e:
+        except (MemoryLimitExceeded, WorkerShutdown) as e:
+            if stats is not None:
+                stats.update(getattr(e, "task_stats", None) or {})
             raise e
         except Exception as e:
             logger.error(f"Task {func_path} failed with exception: {e}")
+            if stats is not None:
+                stats.update(getattr(e, "task_stats", None) or {})
             raise e
     finally:
         if should_exit_context and executor_context is not None:
             executor_context.__exit__(None, None, None)
 
 
+def _wait_for_result(future, timeout, interrupt, poll_interval=0.5):
+    """Wait for a future like future.result(timeout), polling interrupt() meanwhile."""
+    deadline = time.monotonic() + timeout
+    while not future.done():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError()
+        wait([future], timeout=min(remaining, poll_interval))
+        if not future.done() and interrupt():
+            future.cancel()
+            raise WorkerShutdown(
+                "Task abandoned at the end of the shutdown grace period."
+            )
+    return future.result()
+
+
+def age_pending_tasks(queue: str, aging_interval: int, max_priority: int) -> int:
+    """
+    Raise the priority of pending tasks that have been waiting for a worker
+    longer than aging_interval seconds by one level, up to max_priority.
+
+    A task is bumped at most once per interval, so its effective priority grows
+    with its wait time. Tasks scheduled for the future or waiting on
+    dependencies do not age until they become ready. The priority a task had
+    before aging is kept in base_priority and restored when a worker claims
+    it, so a retry starts over from its declared priority. Returns the number
+    of tasks that were bumped.
+    """
+    current_time = now()
+    cutoff = current_time - timedelta(seconds=aging_interval)
+    ready_before_cutoff = Q(scheduled_at__isnull=True, created_at__lte=cutoff) | Q(
+        scheduled_at__lte=cutoff
+    )
+    not_recently_aged = Q(aged_at__isnull=True) | Q(aged_at__lte=cutoff)
+    # Dependencies that are unfinished or finished within the last interval
+    waiting_on_dependency = Task.dependencies.through.objects.filter(
+        from_task=OuterRef("pk")
+    ).exclude(
+        Q(to_task__status="completed")
+        & (Q(to_task__completed_at__isnull=True) | Q(to_task__completed_at__lte=cutoff))
+    )
+    return (
+        Task.objects.filter(status="pending", queue=queue, priority__lt=max_priority)
+        .filter(ready_before_cutoff & not_recently_aged)
+        .filter(~Exists(waiting_on_dependency))
+        .update(
+            priority=F("priority") + 1,
+            base_priority=Coalesce("base_priority", "priority"),
+            aged_at=current_time,
+        )
+    )
+
+
 class TaskWorker:
     """Worker for fetching and executing tasks"""
 
+    # Candidates examined per acquisition before giving up on admission checks
+    max_admission_checks = 10
+
     def __init__(
-        self, worker_id: str, queue: str = "default", use_threads=True, max_workers=1
+        self,
+        worker_id: str,
+        queue: str = "default",
+        use_threads=True,
+        max_workers=1,
+        stop_event=None,
+        abort_event=None,
+        max_tasks_per_child=None,
+        max_memory_per_child=None,
+        recycle_process=False,
     ):
         self.worker_id = worker_id
         self.queue = queue
         self.use_threads = use_threads
         self.max_workers = max_workers
+        # threading.Event or multiprocessing.Event; once set, run() exits after
+        # the current task instead of claiming another one.
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        # Set when the shutdown grace period is over: the task in flight is
+        # abandoned and returned to pending instead of being waited for.
+        self.abort_event = abort_event if abort_event is not None else threading.Event()
+        # 0 after a clean drain, 1 if an in-flight task had to be abandoned
+        self.exit_code = 0
+
+        # Recycling: after max_tasks_per_child tasks, or once a child grows past
+        # max_memory_per_child MB of RSS, the process pool is replaced between
+        # tasks. With recycle_process (worker running in its own process under
+        # WorkerManager) the worker process itself exits and is replaced instead.
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_memory_per_child = max_memory_per_child
+        self.recycle_process = recycle_process
+        self.tasks_since_recycle = 0
+        self._recycle_requested = False
+        if (
+            (max_tasks_per_child or max_memory_per_child)
+            and use_threads
+            and not recycle_process
+        ):
+            logger.warning(
+                f"Worker {worker_id} runs tasks in threads of the current process; "
+                "max_tasks_per_child and max_memory_per_child have no effect."
+            )
+
+        self.priority_aging_interval = getattr(
+            settings, "ASYNC_MANAGER_PRIORITY_AGING_INTERVAL", None
+        )
+        max_priority = getattr(settings, "ASYNC_MANAGER_PRIORITY_AGING_MAX", "critical")
+        self.priority_aging_max = Task.PRIORITY_MAPPING.get(max_priority, max_priority)
+        self._last_aging_run = None
+
+        self.executor = self._create_executor()
+
+    def _create_executor(self):
+        if self.use_threads:
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_ignore_shutdown_signals
+        )
+
+    def _child_rss_mb(self):
+        """RSS in MB of the process that would be recycled (the largest pool child)."""
+        if self.recycle_process:
+            return psutil.Process().memory_info().rss / (1024 * 1024)
+        if self.use_threads or self.executor is None:
+            return None
+        largest = 0
+        for process in (getattr(self.executor, "_processes", None) or {}).values():
+            try:
+                largest = max(largest, psutil.Process(process.pid).memory_info().rss)
+            except psutil.Error:
+                continue
+        return largest / (1024 * 1024)
+
+    def recycle_if_needed(self) -> None:
+        """
+        Replace the child process(es) once they have run max_tasks_per_child
+        tasks or grown past max_memory_per_child MB. Called between tasks, so
+        nothing in flight is interrupted.
+        """
+        if not (self.max_tasks_per_child or self.max_memory_per_child):
+            return
+
+        reason = None
+        if (
+            self.max_tasks_per_child
+            and self.tasks_since_recycle >= self.max_tasks_per_child
+        ):
+            reason = f"after {self.tasks_since_recycle} tasks"
+        elif self.max_memory_per_child:
+            rss = self._child_rss_mb()
+            if rss is not None and rss > self.max_memory_per_child:
+                reason = f"at {rss:.1f} MB RSS (limit {self.max_memory_per_child} MB)"
+        if reason is None:
+            return
+
+        if self.recycle_process:
+            logger.info(f"Recycling worker process {self.worker_id} {reason}.")
+            self._recycle_requested = True
+        elif not self.use_threads:
+            logger.info(f"Recycling task executor of worker {self.worker_id} {reason}.")
+            self.executor.shutdown(wait=True)
+            self.executor = self._create_executor()
+        self.tasks_since_recycle = 0
+
+    def age_priorities(self) -> None:
+        """
+        Apply priority aging to this worker's queue if it is enabled.
+        The bump is a single UPDATE and runs at most once every 30 seconds
+        (or every aging interval, if shorter) per worker.
+        """
+        if not self.priority_aging_interval:
+            return
+
+        from django_async_manager.utils import with_database_lock_handling
+
+        check_every = min(self.priority_aging_interval, 30)
+        current = time.monotonic()
+        if (
+            self._last_aging_run is not None
+            and current - self._last_aging_run < check_every
+        ):
+            return
+        self._last_aging_run = current
+
+        @with_database_lock_handling(
+            max_retries=3, logger_name="django_async_manager.worker"
+        )
+        def _age_inner():
+            return age_pending_tasks(
+                self.queue, self.priority_aging_interval, self.priority_aging_max
+            )
+
+        aged = _age_inner()
+        if aged:
+            logger.debug(f"Raised priority of {aged} waiting tasks in '{self.queue}'.")
+
+    def check_admission(self, task: Task):
+        """
+        Decide inside the acquisition transaction whether a candidate task may
+        start now. Returns None if it may, otherwise a filter matching the tasks
+        that should be skipped for the rest of this acquisition. Rejected tasks
+        stay pending so the worker picks other work instead of claiming them
+        and waiting on an external limit.
+        """
+        if task.concurrency_limit is not None and not has_free_concurrency_slot(task):
+            logger.debug(
+                f"Task {task.id} ({task.name}) deferred: concurrency limit "
+                f"{task.concurrency_limit} reached for key {task.concurrency_key!r}."
+            )
+            return Q(name=task.name, concurrency_key=task.concurrency_key)
 
-        executor_class = ThreadPoolExecutor if self.use_threads else ProcessPoolExecutor
-        self.executor = executor_class(max_workers=self.max_workers)
+        if task.rate_limit:
+            try:
+                allowed = get_rate_limiter().acquire(
+                    f"task:{task.name}", task.rate_limit
+                )
+            except ValueError as e:
+                logger.error(
+                    f"Ignoring rate limit of task {task.id} ({task.name}): {e}"
+                )
+                return None
+            if not allowed:
+                logger.debug(
+                    f"Task {task.id} ({task.name}) deferred by rate limit {task.rate_limit}."
+                )
+                return Q(name=task.name)
+        return None
 
     def process_task(self) -> None:
         from django_async_manager.utils import with_database_lock_handling
 
         task = None
 
+        if self.stop_event.is_set():
+            return
+
+        try:
+            self.age_priorities()
+        except Exception:
+            logger.exception(f"Priority aging failed for queue '{self.queue}'.")
+
         @with_database_lock_handling(
             max_retries=3, logger_name="django_async_manager.worker"
         )
@@ -235,7 +594,17 @@ class TaskWorker:
                     .order_by("-priority", "created_at")
                 )
 
-                task = task_qs.select_for_update(skip_locked=True).first()
+                task = None
+                for _ in range(self.max_admission_checks):
+                    candidate = task_qs.select_for_update(skip_locked=True).first()
+                    if not candidate:
+                        break
+                    skip = self.check_admission(candidate)
+                    if skip is None:
+                        task = candidate
+                        break
+                    task_qs = task_qs.exclude(skip)
+
                 if not task:
                     return False
 
@@ -245,12 +614,34 @@ class TaskWorker:
                 task.status = "in_progress"
                 task.started_at = now()
                 task.attempts = F("attempts") + 1
+                # Aging only applies to the wait for this claim
+                task.priority = Coalesce("base_priority", "priority")
+                task.base_priority = None
+                task.aged_at = None
+                # Enqueues from now on start a new debounced task. Keeping the
+                # key would make this one clash with it when it goes back to
+                # pending for a retry or on shutdown.
+                task.debounce_key = None
                 task.save(
-                    update_fields=["status", "started_at", "worker_id", "attempts"]
+                    update_fields=[
+                        "status",
+                        "started_at",
+                        "worker_id",
+                        "attempts",
+                        "debounce_key",
+                        "priority",
+                        "base_priority",
+                        "aged_at",
+                    ]
                 )
                 return True
 
-        if not _acquire_task():
+        acquisition_start = time.monotonic()
+        acquired = _acquire_task()
+        metrics.ACQUISITION_TIME.observe(
+            time.monotonic() - acquisition_start, queue=self.queue
+        )
+        if not acquired:
             return
 
         if not task:
@@ -263,6 +654,37 @@ class TaskWorker:
             logger.warning(f"Task {task.id} disappeared before execution could start.")
             return
 
+        labels = {"queue": task.queue, "name": task.name}
+        metrics.TASKS_CLAIMED.inc(**labels)
+        ready_at = max(filter(None, (task.created_at, task.scheduled_at)))
+        queue_wait = max(0.0, (task.started_at - ready_at).total_seconds())
+        metrics.QUEUE_WAIT.observe(queue_wait, **labels)
+
+        # Timing breakdown of this attempt, stored on the task when it finishes.
+        # exec_ms, cpu_time_ms and peak_rss_mb are measured around the function
+        # call in the executor; overhead_ms is the rest of the time the worker
+        # spent on the task since it started looking for it.
+        stats = {"queue_wait_ms": queue_wait * 1000}
+        execution_start = None
+
+        def timings():
+            if execution_start is not None:
+                current = time.monotonic()
+                stats.setdefault("exec_ms", (current - execution_start) * 1000)
+                stats["overhead_ms"] = max(
+                    0.0, (current - acquisition_start) * 1000 - stats["exec_ms"]
+                )
+            return stats
+
+        if self.stop_event.is_set():
+            task.return_to_queue()
+            logger.info(
+                f"Worker {self.worker_id} is stopping; returned unstarted task {task.id} to the queue."
+            )
+            return
+
+        run_hook("after_claim", task=task, worker_id=self.worker_id)
+
         try:
             if "." in task.name:
                 func_path = task.name
@@ -272,19 +694,41 @@ class TaskWorker:
             if not func_path:
                 error_msg = f"Task function '{task.name}' has not been registered."
                 logger.error(error_msg)
-                task.mark_as_failed(error_msg)
+                task.mark_as_failed(error_msg, timings=timings())
+                self._record_failure(task, error_msg)
                 return
 
             if "." not in func_path:
                 error_msg = f"Invalid function path format: {func_path}"
                 logger.error(error_msg)
-                task.mark_as_failed(error_msg)
+                task.mark_as_failed(error_msg, timings=timings())
+                self._record_failure(task, error_msg)
                 return
 
             args = task.arguments.get("args", [])
             kwargs = task.arguments.get("kwargs", {})
 
-            execute_task(
+            cache_key = None
+            if task.cache_ttl:
+                cache_key = make_task_key(task.name, args, kwargs)
+                hit, _ = get_result_cache().get(cache_key)
+                if hit:
+                    task.mark_as_completed(timings=timings())
+                    metrics.TASKS_COMPLETED.inc(**labels)
+                    logger.info(
+                        f"Task {task.id} ({task.name}) completed from cached result."
+                    )
+                    return
+
+            try:
+                profile = profile_modes_for(task)
+            except Exception as e:
+                logger.error(f"Could not decide whether to profile task {task.id}: {e}")
+                profile = None
+
+            self.tasks_since_recycle += 1
+            execution_start = time.monotonic()
+            result = execute_task(
                 func_path,
                 args,
                 kwargs,
@@ -292,11 +736,32 @@ class TaskWorker:
                 use_threads=self.use_threads,
                 memory_limit=task.memory_limit,
                 executor=self.executor,
+                interrupt=self.abort_event.is_set,
+                task_info={"id": str(task.id), "name": task.name, "queue": task.queue},
+                stats=stats,
+                profile=profile,
             )
+            metrics.EXECUTION_TIME.observe(time.monotonic() - execution_start, **labels)
 
-            task.mark_as_completed()
+            task.mark_as_completed(timings=timings())
+            metrics.TASKS_COMPLETED.inc(**labels)
             logger.info(f"Task {task.id} ({task.name}) completed successfully.")
 
+            if cache_key is not None:
+                try:
+                    get_result_cache().set(cache_key, result, task.cache_ttl)
+                except Exception as e:
+                    logger.warning(
+                        f"Could not cache result of task {task.id} ({task.name}): {e}"
+                    )
+
+        except WorkerShutdown:
+            self.exit_code = 1
+            logger.warning(
+                f"Worker {self.worker_id} abandoned task {task.id} ({task.name}) "
+                f"at the end of the shutdown grace period; returning it to the queue."
+            )
+            task.return_to_queue()
         except (TimeoutException, MemoryLimitExceeded) as e:
             error_type = (
                 "TimeoutException"
@@ -315,7 +780,8 @@ class TaskWorker:
                 logger.error(
                     f"Scheduling retry for task {task.id}. Error:\n{error_details}"
                 )
-                task.schedule_retry(error_details)
+                task.schedule_retry(error_details, timings=timings())
+                self._record_failure(task, error_details)
             else:
                 logger.error(
                     f"Marking task {task.id} as failed (no retries left or autoretry=False)."
@@ -324,7 +790,8 @@ class TaskWorker:
                 logger.error(
                     f"Marking task {task.id} as failed. Error:\n{error_details}"
                 )
-                task.mark_as_failed(error_details)
+                task.mark_as_failed(error_details, timings=timings())
+                self._record_failure(task, error_details)
         except Exception as e:
             logger.exception(
                 f"Exception during task execution {task.id} ({task.name}): {e}"
@@ -337,13 +804,15 @@ class TaskWorker:
                     logger.error(
                         f"Scheduling retry for failed task {task.id}. Error:\n{error_details}"
                     )
-                    task.schedule_retry(error_details)
+                    task.schedule_retry(error_details, timings=timings())
+                    self._record_failure(task, error_details)
                 else:
                     error_details = traceback.format_exc()
                     logger.error(
                         f"Marking task {task.id} as failed (no retries left or autoretry=False). Error:\n{error_details}"
                     )
-                    task.mark_as_failed(error_details)
+                    task.mark_as_failed(error_details, timings=timings())
+                    self._record_failure(task, error_details)
             except Task.DoesNotExist:
                 logger.error(
                     f"Task {task.id} disappeared after failing, cannot update status."
@@ -353,28 +822,102 @@ class TaskWorker:
                     f"Failed to update status for failed task {task.id}. Error: {update_err}",
                     exc_info=True,
                 )
+        finally:
+            profile_payload = stats.pop("profile", None)
+            if profile_payload is not None:
+                save_profile(task, profile_payload, stats.get("exec_ms"))
+
+    @staticmethod
+    def _record_failure(task: Task, error: str) -> None:
+        """Count a failed attempt and run the on_retry or on_failure hooks."""
+        labels = {"queue": task.queue, "name": task.name}
+        if task.status == "pending":
+            metrics.TASKS_RETRIED.inc(**labels)
+            run_hook("on_retry", task=task, error=error)
+        else:
+            metrics.TASKS_FAILED.inc(**labels)
+            run_hook("on_failure", task=task, error=error)
 
     def shutdown(self) -> None:
         """Shutdown the worker and clean up resources."""
         logger.info(f"Shutting down worker {self.worker_id}")
         if hasattr(self, "executor") and self.executor is not None:
-            self.executor.shutdown(wait=True)
+            if self.exit_code:
+                # Abandoned tasks may still be running; don't wait for them.
+                processes = list(
+                    (getattr(self.executor, "_processes", None) or {}).values()
+                )
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                for process in processes:
+                    process.kill()
+            else:
+                self.executor.shutdown(wait=True)
             self.executor = None
 
+    def stop(self) -> None:
+        """Ask the worker to exit once its current task is finished."""
+        self.stop_event.set()
+
+    def abort(self) -> None:
+        """Stop the worker and abandon its current task, returning it to pending."""
+        self.stop_event.set()
+        self.abort_event.set()
+
     def run(self) -> None:
-        """Continuous processing of tasks."""
+        """
+        Continuous processing of tasks until the stop event is set, or until
+        the worker process is due for recycling.
+        """
+        from django import db
+
         try:
-            while True:
+            while not self.stop_event.is_set():
                 try:
                     self.process_task()
+                    self.recycle_if_needed()
                 except Exception:
                     logger.exception(
                         f"Worker {self.worker_id} encountered critical error in process_task loop. Restarting loop."
                     )
-                time.sleep(2)
+                if self._recycle_requested:
+                    break
+                self.stop_event.wait(2)
         finally:
             # Ensure executor is shut down properly
             self.shutdown()
+            # Release this thread's DB connection so retired workers do not hold it
+            db.connections.close_all()
+
+
+def _ship_metrics(metrics_queue, stop_event, interval=5.0) -> None:
+    """Send the metrics recorded in this process to the WorkerManager process."""
+    while not stop_event.wait(interval):
+        deltas = metrics.REGISTRY.take_deltas()
+        if deltas:
+            metrics_queue.put(deltas)
+
+
+def _run_worker_process(worker: TaskWorker, metrics_queue=None) -> None:
+    """Entry point of a worker process started by WorkerManager."""
+    _ignore_shutdown_signals()
+    if metrics_queue is not None:
+        # Values inherited from the parent were already counted there.
+        metrics.REGISTRY.reset()
+        threading.Thread(
+            target=_ship_metrics,
+            args=(metrics_queue, worker.stop_event),
+            name="metrics-shipper",
+            daemon=True,
+        ).start()
+    worker.run()
+    if metrics_queue is not None:
+        metrics_queue.put(metrics.REGISTRY.take_deltas())
+        metrics_queue.close()
+        metrics_queue.join_thread()
+    if worker.exit_code:
+        # Threads running abandoned tasks would keep the interpreter alive.
+        logging.shutdown()
+        os._exit(worker.exit_code)
 
 
 class WorkerManager:
@@ -389,6 +932,19 @@ class WorkerManager:
     This allows for two levels of concurrency:
     - Level 1: Multiple TaskWorkers running in parallel (controlled by num_workers)
     - Level 2: Each TaskWorker can execute tasks using its executor (controlled by max_workers_per_task)
+
+    When max_workers is given, the manager autoscales: join_workers() periodically
+    samples the queue and host load and starts or gracefully retires TaskWorkers
+    to stay between min_workers and max_workers.
+
+    stop() starts a graceful shutdown: workers stop claiming tasks, in-flight
+    tasks get shutdown_grace seconds to finish, and tasks still running after
+    that are abandoned and returned to pending. join_workers() returns the exit
+    status of the drain.
+
+    max_tasks_per_child and max_memory_per_child recycle long-running children
+    between tasks: in thread mode the processes of each TaskWorker's pool, in
+    process mode the worker processes themselves, which exit and are replaced.
     """
 
     def __init__(
@@ -397,6 +953,13 @@ class WorkerManager:
         queue="default",
         use_processes=False,
         max_workers_per_task=1,
+        min_workers=None,
+        max_workers=None,
+        autoscale_interval=10.0,
+        autoscaler_options=None,
+        shutdown_grace=30.0,
+        max_tasks_per_child=None,
+        max_memory_per_child=None,
     ):
         """
         Initialize a WorkerManager.
@@ -406,12 +969,100 @@ class WorkerManager:
             queue: Queue name to process
             use_processes: If True, create workers as separate processes; if False, use threads
             max_workers_per_task: Number of workers in each TaskWorker's executor pool
+            min_workers: Lower bound of workers when autoscaling (defaults to 1)
+            max_workers: Upper bound of workers; enables autoscaling when set
+            autoscale_interval: Seconds between autoscaling decisions
+            autoscaler_options: Extra keyword arguments for the Autoscaler
+            shutdown_grace: Seconds in-flight tasks may run after stop() is called
+            max_tasks_per_child: Recycle a child process after this many tasks
+            max_memory_per_child: Recycle a child process above this RSS in MB
         """
         self.num_workers = num_workers
         self.queue = queue
         self.use_processes = use_processes
         self.max_workers_per_task = max_workers_per_task
+        self.autoscale_interval = autoscale_interval
+        self.shutdown_grace = shutdown_grace
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_memory_per_child = max_memory_per_child
+        self.autoscaler = None
+        if max_workers is not None:
+            self.autoscaler = Autoscaler(
+                queue=queue,
+                min_workers=1 if min_workers is None else min_workers,
+                max_workers=max_workers,
+                **(autoscaler_options or {}),
+            )
+            self.num_workers = max(
+                self.autoscaler.min_workers, min(num_workers, max_workers)
+            )
         self.workers = []
+        self._stop_events = {}
+        self._abort_events = {}
+        self._task_workers = {}
+        self._started = 0
+        self._stopping = threading.Event()
+        # Worker processes send their metrics here to be merged into this
+        # process' registry, which is the one exposed by run_worker.
+        self._metrics_queue = multiprocessing.Queue() if use_processes else None
+
+    def _start_worker(self) -> None:
+        self._started += 1
+        worker_id = f"worker-{self.queue}-{self._started}"
+
+        use_threads_for_tasks = self.use_processes
+        event_class = multiprocessing.Event if self.use_processes else threading.Event
+        stop_event = event_class()
+        abort_event = event_class()
+
+        worker_instance = TaskWorker(
+            worker_id=worker_id,
+            queue=self.queue,
+            use_threads=use_threads_for_tasks,
+            max_workers=self.max_workers_per_task,
+            stop_event=stop_event,
+            abort_event=abort_event,
+            max_tasks_per_child=self.max_tasks_per_child,
+            max_memory_per_child=self.max_memory_per_child,
+            recycle_process=self.use_processes,
+        )
+
+        if not self.use_processes:
+            runner = threading.Thread(
+                target=worker_instance.run, name=worker_id, daemon=True
+            )
+            runner.start()
+            logger.info(f"Started worker {worker_id} in a new thread.")
+        else:
+            runner = multiprocessing.Process(
+                target=_run_worker_process,
+                args=(worker_instance, self._metrics_queue),
+                name=worker_id,
+            )
+            runner.start()
+            logger.info(f"Started worker {worker_id} in a new process.")
+        self.workers.append(runner)
+        self._stop_events[worker_id] = stop_event
+        self._abort_events[worker_id] = abort_event
+        self._task_workers[worker_id] = worker_instance
+
+    def _retire_worker(self) -> None:
+        """Ask the most recently started active worker to exit after its current task."""
+        active = self.active_workers
+        if not active:
+            return
+        runner = active[-1]
+        self._stop_events[runner.name].set()
+        logger.info(f"Retiring worker {runner.name}.")
+
+    @property
+    def active_workers(self):
+        """Running workers that have not been asked to stop."""
+        return [
+            runner
+            for runner in self.workers
+            if runner.is_alive() and not self._stop_events[runner.name].is_set()
+        ]
 
     def start_workers(self) -> None:
         """Start worker runners (either threads or processes)."""
@@ -419,36 +1070,138 @@ class WorkerManager:
             f"Starting {self.num_workers} worker managers (each running TaskWorker loop) using "
             f"{'processes' if self.use_processes else 'threads'} for queue '{self.queue}'."
         )
-        for i in range(self.num_workers):
-            worker_id = f"worker-{self.queue}-{i + 1}"
+        for _ in range(self.num_workers):
+            self._start_worker()
 
-            use_threads_for_tasks = self.use_processes
+    def _reap_workers(self) -> int:
+        """
+        Forget workers that have exited. Returns how many of them exited
+        without being asked to, e.g. worker processes that were recycled.
+        """
+        unexpected = 0
+        for runner in [r for r in self.workers if not r.is_alive()]:
+            self.workers.remove(runner)
+            if not self._stop_events.pop(runner.name).is_set():
+                unexpected += 1
+            self._abort_events.pop(runner.name, None)
+            self._task_workers.pop(runner.name, None)
+        return unexpected
+
+    def replace_exited_workers(self) -> None:
+        """Start a new worker for every worker that exited on its own."""
+        for _ in range(self._reap_workers()):
+            if self._stopping.is_set():
+                return
+            logger.info(f"Replacing exited worker on queue '{self.queue}'.")
+            self._start_worker()
 
-            worker_instance = TaskWorker(
-                worker_id=worker_id,
-                queue=self.queue,
-                use_threads=use_threads_for_tasks,
-                max_workers=self.max_workers_per_task,
+    def autoscale(self) -> None:
+        """
+        Run one autoscaling step: reap exited workers, sample load and resize.
+        Workers that exited on their own still count towards the pool size the
+        autoscaler decides from, so they are replaced up to the new target.
+        """
+        exited = self._reap_workers()
+
+        running = len(self.active_workers)
+        current = running + exited
+        sample = self.autoscaler.sample()
+        target = self.autoscaler.decide(current, sample)
+        if target != current:
+            logger.info(
+                f"Autoscaling queue '{self.queue}' from {current} to {target} workers "
+                f"(ready: {sample.queue_depth}, oldest wait: {sample.oldest_wait:.1f}s, "
+                f"cpu: {sample.cpu_percent:.0f}%, memory: {sample.memory_percent:.0f}%)."
+            )
+        if exited and target > running:
+            logger.info(
+                f"Replacing {min(exited, target - running)} exited worker(s) "
+                f"on queue '{self.queue}'."
             )
+        for _ in range(target - running):
+            if self._stopping.is_set():
+                return
+            self._start_worker()
+        for _ in range(running - target):
+            self._retire_worker()
 
-            if not self.use_processes:
-                thread = threading.Thread(
-                    target=worker_instance.run, name=worker_id, daemon=True
-                )
-                thread.start()
-                self.workers.append(thread)
-                logger.info(f"Started worker {worker_id} in a new thread.")
+    def collect_worker_metrics(self) -> None:
+        """Merge the metrics sent by worker processes into this process' registry."""
+        if self._metrics_queue is None:
+            return
+        while True:
+            try:
+                deltas = self._metrics_queue.get_nowait()
+            except queue_module.Empty:
+                return
+            metrics.REGISTRY.merge_deltas(deltas)
+
+    def _join_runner(self, runner, timeout=None) -> None:
+        """Join a runner while still collecting the metrics it sends."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while runner.is_alive():
+            wait_for = 1.0
+            if deadline is not None:
+                wait_for = min(wait_for, deadline - time.monotonic())
+                if wait_for <= 0:
+                    break
+            runner.join(wait_for)
+            self.collect_worker_metrics()
+
+    def stop(self) -> None:
+        """
+        Ask all workers to exit after their current task and end autoscaling.
+        Safe to call from a signal handler.
+        """
+        self._stopping.set()
+        for stop_event in self._stop_events.values():
+            stop_event.set()
+
+    def join_workers(self) -> int:
+        """
+        Run until stop() is called (or every worker has exited), then drain.
+
+        Workers get shutdown_grace seconds to finish their in-flight tasks;
+        the ones still busy after that abandon their task, which is returned
+        to pending. Returns 0 after a clean drain and 1 if tasks had to be
+        abandoned or a worker process exited with an error.
+        """
+        while not self._stopping.is_set():
+            self.replace_exited_workers()
+            if self.autoscaler is not None:
+                try:
+                    self.autoscale()
+                except Exception:
+                    logger.exception(f"Autoscaling failed for queue '{self.queue}'.")
+                self._stopping.wait(self.autoscale_interval)
+            elif self.workers:
+                self._stopping.wait(1.0)
             else:
-                process = multiprocessing.Process(
-                    target=worker_instance.run, name=worker_id
-                )
-                process.start()
-                self.workers.append(process)
-                logger.info(f"Started worker {worker_id} in a new process.")
+                break
+            self.collect_worker_metrics()
+        self.stop()
 
-    def join_workers(self) -> None:
-        """Wait for all worker runners (threads or processes) to complete."""
-        logger.info(f"Waiting for {len(self.workers)} worker managers to finish...")
+        logger.info(
+            f"Waiting up to {self.shutdown_grace}s for {len(self.workers)} worker managers to finish..."
+        )
+        deadline = time.monotonic() + self.shutdown_grace
         for worker_runner in self.workers:
-            worker_runner.join()
+            self._join_runner(worker_runner, max(0.0, deadline - time.monotonic()))
+
+        abandoned = [runner for runner in self.workers if runner.is_alive()]
+        if abandoned:
+            logger.warning(
+                f"Shutdown grace period expired; abandoning the tasks of {len(abandoned)} workers."
+            )
+            for runner in abandoned:
+                self._abort_events[runner.name].set()
+            for runner in abandoned:
+                self._join_runner(runner)
+        self.collect_worker_metrics()
+
+        if self.use_processes:
+            failed = any(runner.exitcode for runner in self.workers)
+        else:
+            failed = any(worker.exit_code for worker in self._task_workers.values())
         logger.info("All worker managers have finished.")
+        return 1 if abandoned or failed else 0